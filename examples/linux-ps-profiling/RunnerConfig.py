@@ -93,7 +93,8 @@ class RunnerConfig:
 
         # Configure the environment based on the current variation
         if pin_core:
-            subprocess.check_call(shlex.split(f'taskset -cp 0  {self.target.pid}'))
+            # pin to the first CPU this run may use (its own slot when `pin_runs_to_cpu_slots` is set)
+            subprocess.check_call(shlex.split(f'taskset -cp {min(context.cpus)} {self.target.pid}'))
         subprocess.check_call(shlex.split(f'cpulimit -b -p {self.target.pid} --limit {cpu_limit}'))
         
 
@@ -141,11 +142,7 @@ class RunnerConfig:
         You can also store the raw measurement data under `context.run_dir`
         Returns a dictionary with keys `self.run_table_model.data_columns` and their values populated"""
 
-        df = pd.DataFrame(columns=['cpu_usage'])
-        for i, l in enumerate(self.profiler.stdout.readlines()):
-            cpu_usage=float(l.decode('ascii').strip())
-            df.loc[i] = [cpu_usage]
-        
+        df = pd.DataFrame({'cpu_usage': [float(l.decode('ascii').strip()) for l in self.profiler.stdout.readlines()]})
         df.to_csv(context.run_dir / 'raw_data.csv', index=False)
 
         run_data = {
@@ -2,6 +2,7 @@ import os
 import uuid
 import inspect
 from typing import List
+from pathlib import Path
 from shutil import copyfile
 from tabulate import tabulate
 
@@ -9,6 +10,8 @@ from ConfigValidator.Config.RunnerConfig import RunnerConfig
 from ExperimentOrchestrator.Misc.BashHeaders import BashHeaders
 from ExperimentOrchestrator.Misc.PathValidation import is_path_exists_or_creatable_portable
 from ProgressManager.Output.OutputProcedure import OutputProcedure as output
+from ProgressManager.Output.SQLiteOutputManager import SQLiteOutputManager
+from ProgressManager.Output.ShardMerger import ShardMerger
 from ConfigValidator.CustomErrors.CLIErrors import *
 
 class ConfigCreate:
@@ -77,6 +80,55 @@ class Prepare:
     def execute(args=None) -> None:
         pass
 
+class ExportCSV:
+    @staticmethod
+    def description_params() -> str:
+        return "<path_to_experiment_dir>"
+
+    @staticmethod
+    def description_short() -> str:
+        return "Exports the run table of an experiment stored in SQLite to run_table.csv"
+
+    @staticmethod
+    def description_long() -> str:
+        output.console_log_bold("Export-csv writes the run table of an experiment that uses `RunTableStore.SQLITE` " +
+                                "(experiment.db) to run_table.csv in the same directory. " +
+                                "It can be used while the experiment is running.")
+
+    @staticmethod
+    def execute(args=None) -> None:
+        if args is None or len(args) != 3:
+            raise CommandNotRecognisedError
+
+        experiment_path = Path(args[2]).expanduser()
+        SQLiteOutputManager(experiment_path).export_csv()
+        output.console_log_OK(f"Successfully exported the run table to: {experiment_path / 'run_table.csv'}")
+
+class Merge:
+    @staticmethod
+    def description_params() -> str:
+        return "<path_to_merged_experiment_dir> <path_to_shard_dir>..."
+
+    @staticmethod
+    def description_short() -> str:
+        return "Merges the experiment dirs of the shards of an experiment (--shard) into one"
+
+    @staticmethod
+    def description_long() -> str:
+        output.console_log_bold("Merge combines the run tables and run directories of the shards of an experiment, " +
+                                "each executed with `--shard <index>/<count>`, into a new experiment directory. " +
+                                "All shards must have been executed with the same config (matching md5sums), " +
+                                "and must not contain the same runs.")
+
+    @staticmethod
+    def execute(args=None) -> None:
+        if args is None or len(args) < 4:
+            raise CommandNotRecognisedError
+
+        destination = Path(args[2]).expanduser()
+        run_table = ShardMerger(destination).merge([Path(shard).expanduser() for shard in args[3:]])
+        output.console_log_OK(f"Successfully merged {len(args) - 3} shards ({len(run_table)} runs) into: {destination}")
+
 class Help:
     @staticmethod
     def description_params() -> str:
@@ -106,6 +158,8 @@ class CLIRegister:
     register = {
         "config-create":    ConfigCreate,
         "prepare":          Prepare,
+        "export-csv":       ExportCSV,
+        "merge":            Merge,
         "help":             Help
     }
 
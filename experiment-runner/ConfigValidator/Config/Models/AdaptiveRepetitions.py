@@ -0,0 +1,80 @@
+import math
+import statistics
+from typing import List
+
+from ConfigValidator.CustomErrors.BaseError import BaseError
+
+
+class AdaptiveRepetitions:
+    """Sequential sampling: keep repeating a treatment until the confidence interval of `target_metric`
+    is tight enough, i.e. its half-width is at most `relative_ci_half_width` times the mean.
+
+    The `repetitions` of the `RunTableModel` become the maximum number of repetitions. Each treatment is repeated
+    at least `min_repetitions` times; the repetitions of a treatment that are no longer needed are SKIPPED, and the
+    number of repetitions actually used is recorded in the `__repetitions` column."""
+
+    def __init__(self,
+                 target_metric: str,
+                 relative_ci_half_width: float = 0.05,
+                 confidence: float = 0.95,
+                 min_repetitions: int = 3
+                 ):
+        if not 0 < relative_ci_half_width:
+            raise BaseError("The relative confidence interval half-width must be positive!")
+        if not 0 < confidence < 1:
+            raise BaseError("The confidence level must be between 0 and 1!")
+        if min_repetitions < 2:
+            raise BaseError("At least 2 repetitions are needed to estimate a confidence interval!")
+
+        self.target_metric = target_metric
+        self.relative_ci_half_width = relative_ci_half_width
+        self.confidence = confidence
+        self.min_repetitions = min_repetitions
+
+    @staticmethod
+    def __t_coverage(t: float, df: int) -> float:
+        """P(|T| <= t) for Student's t-distribution with `df` degrees of freedom (Abramowitz & Stegun 26.7.3/4)."""
+        theta = math.atan(t / math.sqrt(df))
+        cos2 = math.cos(theta) ** 2
+        if df % 2 == 0:
+            term, total = 1.0, 1.0
+            for k in range(2, df, 2):
+                term *= cos2 * (k - 1) / k
+                total += term
+            return math.sin(theta) * total
+        if df == 1:
+            return 2 * theta / math.pi
+        term, total = math.cos(theta), math.cos(theta)
+        for k in range(3, df - 1, 2):
+            term *= cos2 * (k - 1) / k
+            total += term
+        return 2 / math.pi * (theta + math.sin(theta) * total)
+
+    @staticmethod
+    def t_critical_value(confidence: float, df: int) -> float:
+        """The two-sided critical value t, such that P(|T| <= t) = `confidence`."""
+        low, high = 0.0, 1.0
+        while AdaptiveRepetitions.__t_coverage(high, df) < confidence:
+            low, high = high, 2 * high
+        for _ in range(100):
+            middle = (low + high) / 2
+            if AdaptiveRepetitions.__t_coverage(middle, df) < confidence:
+                low = middle
+            else:
+                high = middle
+        return high
+
+    def relative_half_width(self, values: List[float]) -> float:
+        """The half-width of the confidence interval of the mean of `values`, relative to that mean."""
+        if len(values) < 2:
+            return math.inf
+        mean = statistics.fmean(values)
+        half_width = AdaptiveRepetitions.t_critical_value(self.confidence, len(values) - 1) \
+                     * statistics.stdev(values) / math.sqrt(len(values))
+        if mean == 0:
+            return 0.0 if half_width == 0 else math.inf
+        return half_width / abs(mean)
+
+    def is_satisfied(self, values: List[float]) -> bool:
+        return len(values) >= self.min_repetitions and \
+            self.relative_half_width(values) <= self.relative_ci_half_width
@@ -0,0 +1,132 @@
+import re
+import time
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+import psutil
+
+from ProgressManager.Output.OutputProcedure import OutputProcedure as output
+
+
+class CooldownPolicy:
+    """Wait after each run until the machine is back to the state it was in before the experiment.
+
+    A baseline of the CPU temperature (hottest zone in `/sys/class/thermal`), the package power (RAPL, from
+    `/sys/class/powercap`) and the system load (CPU utilization) is taken once, right before the first run.
+    After every run, these readings are polled until each one is back within its tolerance of the baseline,
+    or until `max_wait_in_ms` has passed. Readings that are not available on the machine are ignored."""
+
+    THERMAL_PATH    = Path('class') / 'thermal'
+    POWERCAP_PATH   = Path('class') / 'powercap'
+
+    def __init__(self,
+                 temperature_tolerance: float = 2.0,
+                 power_tolerance: float = 0.1,
+                 load_tolerance: float = 5.0,
+                 min_wait_in_ms: int = 0,
+                 max_wait_in_ms: int = 60000,
+                 poll_interval_in_ms: int = 1000,
+                 baseline_duration_in_ms: int = 5000,
+                 sysfs_root: Path = Path('/sys')
+                 ):
+        self.temperature_tolerance = temperature_tolerance      # in degrees Celsius above the baseline
+        self.power_tolerance = power_tolerance                  # relative to the baseline, e.g. 0.1 for +10%
+        self.load_tolerance = load_tolerance                    # in percentage points of CPU utilization above the baseline
+        self.min_wait_in_ms = min_wait_in_ms
+        self.max_wait_in_ms = max_wait_in_ms
+        self.poll_interval_in_ms = poll_interval_in_ms
+        self.baseline_duration_in_ms = baseline_duration_in_ms
+        self.sysfs_root = sysfs_root
+        self.baseline: Optional[Dict[str, float]] = None
+
+    def __repr__(self) -> str:
+        return (f"CooldownPolicy(+{self.temperature_tolerance}°C, +{self.power_tolerance:.0%} power, "
+                f"+{self.load_tolerance}% load, wait {self.min_wait_in_ms}-{self.max_wait_in_ms}ms)")
+
+    def __read_temperature(self) -> Optional[float]:
+        temperatures = []
+        for zone in (self.sysfs_root / CooldownPolicy.THERMAL_PATH).glob('thermal_zone*'):
+            try:
+                temperatures.append(int((zone / 'temp').read_text()) / 1000)
+            except (OSError, ValueError):
+                continue
+        return max(temperatures, default=None)
+
+    def __package_domains(self) -> List[Tuple[Path, int]]:
+        # The top-level RAPL domains (intel-rapl:0, intel-rapl:1, ...) are the packages
+        domains = []
+        for path in (self.sysfs_root / CooldownPolicy.POWERCAP_PATH).glob('*-rapl:*'):
+            if re.fullmatch(r'.+-rapl:\d+', path.name):
+                try:
+                    domains.append((path / 'energy_uj', int((path / 'max_energy_range_uj').read_text())))
+                except (OSError, ValueError):
+                    continue
+        return domains
+
+    @staticmethod
+    def __read_energy(domains: List[Tuple[Path, int]]) -> Optional[List[int]]:
+        try:
+            return [int(energy_file.read_text()) for energy_file, _ in domains]
+        except (OSError, ValueError):
+            return None  # e.g. energy_uj is only readable by root
+
+    def measure(self, duration_in_ms: int) -> Dict[str, float]:
+        """Read the temperature, and the average package power and load over `duration_in_ms`."""
+        domains = self.__package_domains()
+        energy_before = CooldownPolicy.__read_energy(domains) if domains else None
+        psutil.cpu_percent()  # start a new measurement interval
+        start = time.monotonic()
+
+        time.sleep(duration_in_ms / 1000)
+
+        readings = {'load': psutil.cpu_percent()}
+        elapsed = time.monotonic() - start
+        energy_after = CooldownPolicy.__read_energy(domains) if energy_before is not None else None
+        if energy_after is not None and elapsed > 0:
+            energy_uj = 0
+            for (_, max_energy_range_uj), before, after in zip(domains, energy_before, energy_after):
+                energy_uj += after - before if after >= before else after + max_energy_range_uj - before
+            readings['power'] = energy_uj / 1e6 / elapsed
+        temperature = self.__read_temperature()
+        if temperature is not None:
+            readings['temperature'] = temperature
+        return readings
+
+    def is_cooled_down(self, readings: Dict[str, float]) -> bool:
+        limits = {
+            'temperature':  lambda baseline: baseline + self.temperature_tolerance,
+            'power':        lambda baseline: baseline * (1 + self.power_tolerance),
+            'load':         lambda baseline: baseline + self.load_tolerance,
+        }
+        return all(readings[name] <= limit(self.baseline[name])
+                   for name, limit in limits.items() if name in readings and name in self.baseline)
+
+    def take_baseline(self):
+        self.baseline = self.measure(self.baseline_duration_in_ms)
+        output.console_log_OK(f"Cool-down baseline: {CooldownPolicy.__format(self.baseline)}")
+
+    def cool_down(self) -> float:
+        """Block until the machine has cooled down, and return the time waited in seconds."""
+        start = time.monotonic()
+        if self.min_wait_in_ms > 0:
+            time.sleep(self.min_wait_in_ms / 1000)
+
+        while True:
+            waited_in_ms = (time.monotonic() - start) * 1000
+            remaining_in_ms = self.max_wait_in_ms - waited_in_ms
+            if remaining_in_ms <= 0:
+                output.console_log_WARNING(f"Machine did not cool down within {self.max_wait_in_ms}ms, continuing anyway")
+                break
+            readings = self.measure(min(self.poll_interval_in_ms, remaining_in_ms))
+            if self.is_cooled_down(readings):
+                break
+            output.console_log_bold(f"Cooling down: {CooldownPolicy.__format(readings)}")
+
+        waited = time.monotonic() - start
+        output.console_log_bold(f"Cool-down took {waited:.1f}s")
+        return waited
+
+    @staticmethod
+    def __format(readings: Dict[str, float]) -> str:
+        units = {'temperature': '°C', 'power': 'W', 'load': '%'}
+        return ', '.join(f"{name} {value:.1f}{units[name]}" for name, value in readings.items())
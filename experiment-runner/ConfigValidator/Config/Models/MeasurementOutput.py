@@ -0,0 +1,11 @@
+from enum import Enum, auto
+
+class MeasurementOutput(Enum):
+    """Print console output during the measurement as it is logged."""
+    PRINT = auto()
+
+    """Keep console output logged during the measurement in memory, and print it once the measurement has stopped."""
+    HOLD = auto()
+
+    """Discard console output logged during the measurement. It is still stored in the run's `runner_log.jsonl`."""
+    DROP = auto()
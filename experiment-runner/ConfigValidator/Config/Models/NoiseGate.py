@@ -0,0 +1,146 @@
+import os
+import time
+from pathlib import Path
+from typing import Dict, List, Optional, Set
+
+from ConfigValidator.Config.Models.NoiseGateAction import NoiseGateAction
+from ProgressManager.Output.OutputProcedure import OutputProcedure as output
+
+
+class NoiseGate:
+    """Check for interference before each run is started.
+
+    Over a window of `sample_duration_in_ms`, the gate looks for:
+      - other processes using more than `cpu_threshold` percent of a CPU (from `/proc/<pid>/stat`),
+        the runner itself and all of its descendants excluded
+      - CPUs whose frequency governor is not `governor` (skipped if `None`)
+      - swap activity (`pswpin`/`pswpout` in `/proc/vmstat`)
+      - thermal throttling (the `thermal_throttle` counters of each CPU)
+    What happens when a check fails is decided by `action` (see `NoiseGateAction`)."""
+
+    SUSPECT_COLUMN = '__suspect'
+
+    def __init__(self,
+                 action: NoiseGateAction = NoiseGateAction.MARK,
+                 cpu_threshold: float = 10.0,
+                 governor: Optional[str] = 'performance',
+                 check_swap: bool = True,
+                 check_throttling: bool = True,
+                 sample_duration_in_ms: int = 1000,
+                 max_retries: int = 5,
+                 retry_interval_in_ms: int = 5000,
+                 proc_root: Path = Path('/proc'),
+                 sysfs_root: Path = Path('/sys')
+                 ):
+        self.action = action
+        self.cpu_threshold = cpu_threshold
+        self.governor = governor
+        self.check_swap = check_swap
+        self.check_throttling = check_throttling
+        self.sample_duration_in_ms = sample_duration_in_ms
+        self.max_retries = max_retries
+        self.retry_interval_in_ms = retry_interval_in_ms
+        self.proc_root = proc_root
+        self.sysfs_root = sysfs_root
+
+    def __repr__(self) -> str:
+        return f"NoiseGate({self.action.name}, cpu > {self.cpu_threshold}%, governor {self.governor})"
+
+    def __read_processes(self) -> Dict[int, tuple]:
+        """pid -> (name, parent pid, user + system CPU time in clock ticks)"""
+        processes = {}
+        for stat_file in self.proc_root.glob('[0-9]*/stat'):
+            try:
+                stat = stat_file.read_text()
+            except OSError:
+                continue  # the process exited in the meantime
+            # The name is in parentheses and may itself contain spaces and parentheses
+            name = stat[stat.index('(') + 1:stat.rindex(')')]
+            fields = stat[stat.rindex(')') + 2:].split()
+            processes[int(stat_file.parent.name)] = (name, int(fields[1]), int(fields[11]) + int(fields[12]))
+        return processes
+
+    @staticmethod
+    def __descendants(processes: Dict[int, tuple], root: int) -> Set[int]:
+        children = dict()
+        for pid, (_, ppid, _) in processes.items():
+            children.setdefault(ppid, []).append(pid)
+        descendants, todo = {root}, [root]
+        while todo:
+            for child in children.get(todo.pop(), []):
+                if child not in descendants:
+                    descendants.add(child)
+                    todo.append(child)
+        return descendants
+
+    def __read_counters(self) -> Dict[str, int]:
+        counters = dict()
+        if self.check_swap:
+            try:
+                for line in (self.proc_root / 'vmstat').read_text().splitlines():
+                    key, value = line.split()
+                    if key in ('pswpin', 'pswpout'):
+                        counters[key] = int(value)
+            except (OSError, ValueError):
+                pass
+        if self.check_throttling:
+            for counter in (self.sysfs_root / 'devices' / 'system' / 'cpu').glob('cpu[0-9]*/thermal_throttle/*_throttle_count'):
+                try:
+                    counters[f'{counter.parent.parent.name} {counter.name}'] = int(counter.read_text())
+                except (OSError, ValueError):
+                    continue
+        return counters
+
+    def __check_governors(self) -> List[str]:
+        if self.governor is None:
+            return []
+        governors = set()
+        for governor_file in (self.sysfs_root / 'devices' / 'system' / 'cpu').glob('cpu[0-9]*/cpufreq/scaling_governor'):
+            try:
+                governors.add(governor_file.read_text().strip())
+            except OSError:
+                continue
+        return [f"CPU frequency governor {governor}" for governor in sorted(governors) if governor != self.governor]
+
+    def check(self, runner_pid: Optional[int] = None) -> List[str]:
+        """Return the reasons why the system is noisy right now, or an empty list if it is quiet."""
+        runner_pid = os.getpid() if runner_pid is None else runner_pid
+        processes_before = self.__read_processes()
+        counters_before = self.__read_counters()
+        start = time.monotonic()
+
+        time.sleep(self.sample_duration_in_ms / 1000)
+
+        processes_after = self.__read_processes()
+        counters_after = self.__read_counters()
+        elapsed_ticks = (time.monotonic() - start) * os.sysconf('SC_CLK_TCK')
+
+        reasons = []
+        own_processes = NoiseGate.__descendants(processes_after, runner_pid)
+        for pid, (name, _, cpu_ticks) in processes_after.items():
+            if pid in own_processes or pid not in processes_before:
+                continue
+            cpu_percent = (cpu_ticks - processes_before[pid][2]) / elapsed_ticks * 100 if elapsed_ticks > 0 else 0
+            if cpu_percent > self.cpu_threshold:
+                reasons.append(f"{name} ({pid}) at {cpu_percent:.0f}% CPU")
+        reasons += self.__check_governors()
+        for counter, value in counters_after.items():
+            if value > counters_before.get(counter, value):
+                reasons.append("swapping" if counter.startswith('pswp') else f"thermal throttling ({counter})")
+        return list(dict.fromkeys(reasons))  # e.g. swapping in and out is reported once
+
+    def wait_until_quiet(self) -> List[str]:
+        """Apply `action`, and return the reasons the system is still noisy (empty if it is quiet)."""
+        reasons = self.check()
+        attempt = 0
+        while reasons and self.action is not NoiseGateAction.MARK:
+            if self.action is NoiseGateAction.RETRY and attempt >= self.max_retries:
+                break
+            attempt += 1
+            output.console_log_WARNING(f"System is noisy ({'; '.join(reasons)}), re-checking in {self.retry_interval_in_ms}ms")
+            time.sleep(self.retry_interval_in_ms / 1000)
+            reasons = self.check()
+
+        if reasons:
+            output.console_log_FAIL(f"System is noisy, the run is marked as suspect: {'; '.join(reasons)}")
+        return reasons
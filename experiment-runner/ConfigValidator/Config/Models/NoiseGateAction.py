@@ -0,0 +1,12 @@
+from enum import Enum, auto
+
+class NoiseGateAction(Enum):
+    """Run anyway, and record why the system was noisy in the run's `__suspect` column."""
+    MARK = auto()
+
+    """Re-check up to `NoiseGate.max_retries` times, `NoiseGate.retry_interval_in_ms` apart.
+    If the system is still noisy after that, run anyway and mark the run as suspect."""
+    RETRY = auto()
+
+    """Do not start the run until the system is quiet, however long that takes."""
+    BLOCK = auto()
@@ -0,0 +1,46 @@
+from ConfigValidator.CustomErrors.BaseError import BaseError
+from ProgressManager.RunTable.Models.RunProgress import RunProgress
+
+
+class RetryPolicy:
+    """Retry a run that FAILED (an exception in one of its hooks, or a crashed worker), and optionally one that hit a
+    TIMEOUT, up to `max_attempts` attempts in total.
+
+    The n-th retry waits `backoff_in_ms * backoff_factor ** (n - 1)`, at most `max_backoff_in_ms`, before the run
+    is started again. Other runs go ahead in the meantime. A run that is still failing after its last attempt keeps
+    its FAILED or TIMEOUT state; the number of attempts and the last error are stored in `__attempts` and `__error`.
+    When the experiment is restarted, the runs that still have attempts left are done again."""
+
+    def __init__(self,
+                 max_attempts: int = 3,
+                 backoff_in_ms: int = 1000,
+                 backoff_factor: float = 2.0,
+                 max_backoff_in_ms: int = 60000,
+                 retry_timeouts: bool = True
+                 ):
+        if max_attempts < 1:
+            raise BaseError("A run needs at least 1 attempt!")
+        if backoff_in_ms < 0 or max_backoff_in_ms < 0:
+            raise BaseError("The backoff cannot be negative!")
+        if backoff_factor < 1:
+            raise BaseError("The backoff factor must be at least 1!")
+
+        self.max_attempts = max_attempts
+        self.backoff_in_ms = backoff_in_ms
+        self.backoff_factor = backoff_factor
+        self.max_backoff_in_ms = max_backoff_in_ms
+        self.retry_timeouts = retry_timeouts
+
+    def __repr__(self) -> str:
+        return (f"RetryPolicy({self.max_attempts} attempts, backoff {self.backoff_in_ms}ms x{self.backoff_factor} "
+                f"up to {self.max_backoff_in_ms}ms{', also on timeouts' if self.retry_timeouts else ''})")
+
+    def should_retry(self, progress: RunProgress, attempts: int) -> bool:
+        """Whether a run that ended in `progress` after `attempts` attempts is started again."""
+        if progress is RunProgress.TIMEOUT and not self.retry_timeouts:
+            return False
+        return progress in (RunProgress.FAILED, RunProgress.TIMEOUT) and attempts < self.max_attempts
+
+    def backoff(self, attempts: int) -> float:
+        """The time (s) to wait before the next attempt of a run that already had `attempts` attempts."""
+        return min(self.backoff_in_ms * self.backoff_factor ** (attempts - 1), self.max_backoff_in_ms) / 1000
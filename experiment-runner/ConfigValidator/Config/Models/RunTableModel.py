@@ -1,11 +1,13 @@
 import itertools
+import math
 import random
-from typing import Dict, List, Tuple
+from typing import Dict, FrozenSet, Iterator, List, Optional, Tuple
 
 from ConfigValidator.CustomErrors.BaseError import BaseError
 from ExtendedTyping.Typing import SupportsStr
 from ProgressManager.RunTable.Models.RunProgress import RunProgress
 from ConfigValidator.Config.Models.FactorModel import FactorModel
+from ConfigValidator.Config.Models.AdaptiveRepetitions import AdaptiveRepetitions
 
 
 class RunTableModel:
@@ -14,7 +16,8 @@ class RunTableModel:
                  exclude_variations: List[Dict[FactorModel, List[SupportsStr]]] = None,
                  repetitions: int = 1,
                  data_columns: List[str] = None,
-                 shuffle: bool = False
+                 shuffle: bool = False,
+                 adaptive_repetitions: AdaptiveRepetitions = None
                  ):
         if exclude_variations is None:
             exclude_variations = {}
@@ -30,11 +33,18 @@ class RunTableModel:
         if len(set(data_columns)) != len(data_columns):
             raise BaseError("Duplicate data column detected!")
 
+        # That the target metric of adaptive repetitions is a data column is only checked by the ExperimentController,
+        # as plugins (e.g. profilers) add their data columns once the config created this model
+        if adaptive_repetitions is not None and adaptive_repetitions.min_repetitions > repetitions:
+            raise BaseError("The minimum number of adaptive repetitions exceeds the number of repetitions!")
+
         self.__factors = factors
         self.__exclude_variations = exclude_variations
         self.__repetitions = repetitions
         self.__data_columns = data_columns
         self.__shuffle = shuffle
+        self.__adaptive_repetitions = adaptive_repetitions
+        self.__compiled_exclusions = self.__compile_exclusions()
 
     def get_factors(self) -> List[FactorModel]:
         return self.__factors
@@ -42,57 +52,110 @@ class RunTableModel:
     def get_data_columns(self) -> List[str]:
         return self.__data_columns
 
-    def generate_experiment_run_table(self) -> List[Dict]:
-        def __filter_list(full_list: List[Tuple]):
-            if len(self.__exclude_variations) == 0:
-                return full_list
-
-            to_remove_indices = []
-            for exclusion in self.__exclude_variations:
-                # Construct the exclusion tuples
-                list_of_lists = []
-                indexes = []
-                for factor, treatment_list in exclusion.items():
-                    list_of_lists.append(treatment_list)
-                    indexes.append(self.__factors.index(factor))
-                exclude_combinations_list = list(itertools.product(*list_of_lists))
-
-                # Mark the exclusions in the full table
-                for idx, elem in enumerate(full_list):
-                    for exclude_combo in exclude_combinations_list:
-                        if all([exclude_combo[i] == elem[indexes[i]] for i in range(len(indexes))]):
-                            to_remove_indices.append(idx)
-
-            to_remove_indices.sort(reverse=True)
-            for idx in to_remove_indices:
-                del full_list[idx]
-            return full_list
-
-        list_of_lists = [factor.treatments for factor in self.__factors]
-        combinations_list = list(itertools.product(*list_of_lists))
-        filtered_list = __filter_list(combinations_list)
+    def get_shuffle(self) -> bool:
+        return self.__shuffle
 
+    def get_adaptive_repetitions(self) -> Optional[AdaptiveRepetitions]:
+        return self.__adaptive_repetitions
+
+    def get_column_names(self) -> List[str]:
         column_names = ['__run_id', '__done']  # Needed for experiment-runner functionality
+        if self.__adaptive_repetitions is not None:
+            column_names.append('__repetitions')
         for factor in self.__factors:
             column_names.append(factor.factor_name)
 
         if self.__data_columns:
             for data_column in self.__data_columns:
                 column_names.append(data_column)
-
-        experiment_run_table = []
+        return column_names
+
+    def __compile_exclusions(self) -> List[Tuple[int, Dict[int, FrozenSet]]]:
+        """Compile each exclusion into (index of its last constrained factor, {factor index: excluded treatments}),
+        so a treatment can be checked against a rule with a single hash lookup."""
+        factor_indexes = {factor: idx for idx, factor in enumerate(self.__factors)}
+        compiled = []
+        for exclusion in self.__exclude_variations:
+            rule = dict()
+            for factor, treatment_list in exclusion.items():
+                if factor not in factor_indexes:
+                    raise BaseError(f"Excluded variation refers to unknown factor {factor.factor_name}!")
+                rule[factor_indexes[factor]] = frozenset(treatment_list)
+            compiled.append((max(rule.keys(), default=-1), rule))
+        return compiled
+
+    def __walk(self, depth: int, alive: List[Tuple[int, Dict[int, FrozenSet]]]) -> Iterator[Tuple[SupportsStr, List]]:
+        """Yield (treatment, rules still alive) for every treatment of factor `depth` that no rule excludes yet.
+        A rule stays alive while every factor it constrains so far has one of its excluded treatments."""
+        for treatment in self.__factors[depth].treatments:
+            next_alive = []
+            excluded = False
+            for last_idx, rule in alive:
+                allowed = rule.get(depth)
+                if allowed is None:
+                    next_alive.append((last_idx, rule))
+                elif treatment in allowed:
+                    if last_idx == depth:
+                        excluded = True  # all constrained factors match, prune the whole subtree
+                        break
+                    next_alive.append((last_idx, rule))
+            if not excluded:
+                yield treatment, next_alive
+
+    def __iter_filtered_combinations(self) -> Iterator[Tuple]:
+        # Exclusions are pruned during generation: once no rule can match anymore, the remaining factors are a
+        # plain cartesian product. Rows are yielded in the same order as itertools.product.
+        treatments = [factor.treatments for factor in self.__factors]
+
+        def iter_combinations(depth: int, prefix: Tuple, alive: List) -> Iterator[Tuple]:
+            if not alive:
+                for suffix in itertools.product(*treatments[depth:]):
+                    yield prefix + suffix
+                return
+            for treatment, next_alive in self.__walk(depth, alive):
+                yield from iter_combinations(depth + 1, prefix + (treatment,), next_alive)
+
+        if any(last_idx == -1 for last_idx, _ in self.__compiled_exclusions):
+            return  # an empty exclusion excludes everything
+        yield from iter_combinations(0, (), self.__compiled_exclusions)
+
+    def __count_filtered_combinations(self) -> int:
+        sizes = [len(factor.treatments) for factor in self.__factors]
+
+        def count_combinations(depth: int, alive: List) -> int:
+            if not alive:
+                return math.prod(sizes[depth:])
+            return sum(count_combinations(depth + 1, next_alive) for _, next_alive in self.__walk(depth, alive))
+
+        if any(last_idx == -1 for last_idx, _ in self.__compiled_exclusions):
+            return 0
+        return count_combinations(0, self.__compiled_exclusions)
+
+    def get_run_table_length(self) -> int:
+        """The number of rows of the run table, computed without building it."""
+        return self.__count_filtered_combinations() * self.__repetitions
+
+    def iter_experiment_run_table(self) -> Iterator[Dict]:
+        """Yield the rows of the run table one by one, in generation order (i.e. ignoring `shuffle`).
+        The `__run_id` of a row only depends on the factors, exclusions and its repetition,
+        so it is stable across invocations."""
+        column_names = self.get_column_names()
         for j in range(self.__repetitions):
-            for i, combo in enumerate(filtered_list):
+            for i, combo in enumerate(self.__iter_filtered_combinations()):
                 row_list = list(combo)
                 row_list.insert(0, f'run_{i}_repetition_{j}')  # __run_id
                 row_list.insert(1, RunProgress.TODO)  # __done
+                if self.__adaptive_repetitions is not None:
+                    row_list.insert(2, " ")  # __repetitions, filled in once the treatment is complete
 
                 if self.__data_columns:
                     for _ in self.__data_columns:
                         row_list.append(" ")
-                experiment_run_table.append(dict(zip(column_names, row_list)))
+                yield dict(zip(column_names, row_list))
+
+    def generate_experiment_run_table(self) -> List[Dict]:
+        experiment_run_table = list(self.iter_experiment_run_table())
 
         if self.__shuffle:
             random.shuffle(experiment_run_table)
         return experiment_run_table
-
@@ -0,0 +1,11 @@
+from enum import Enum, auto
+
+class RunTableStore(Enum):
+    """The run table is stored in `run_table.csv` (updates are journaled in `run_table.journal`),
+    and the metadata in `metadata.json`."""
+    CSV = auto()
+
+    """The run table, the metadata and the status of each run are stored in a single SQLite database,
+    `experiment.db`, which can be queried while the experiment is running.
+    `run_table.csv` is exported from it at the end of the experiment."""
+    SQLITE = auto()
@@ -1,9 +1,11 @@
 from pathlib import Path
+from typing import FrozenSet
 
 
 class RunnerContext:
 
-    def __init__(self, run_variation: dict, run_nr: int, run_dir: Path):
+    def __init__(self, run_variation: dict, run_nr: int, run_dir: Path, cpus: FrozenSet[int] = frozenset()):
         self.run_variation = run_variation
         self.run_nr = run_nr
         self.run_dir = run_dir
+        self.cpus = cpus  # The CPUs this run may use (its slot if `RunnerConfig.pin_runs_to_cpu_slots` is set)
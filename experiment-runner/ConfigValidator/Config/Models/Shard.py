@@ -0,0 +1,55 @@
+import re
+from pathlib import Path
+from typing import Dict, Iterable, Iterator, Set
+
+from ConfigValidator.Config.Models.RunTableModel import RunTableModel
+from ConfigValidator.CustomErrors.BaseError import BaseError
+
+
+class Shard:
+    """Shard `index` (1-based) of `count` disjoint parts of the run table, for independent invocations on different machines.
+
+    Rows are dealt round-robin in generation order, so the shards differ in size by at most one run, and the
+    assignment only depends on the run table model (not on `shuffle`). Each shard is stored in its own
+    experiment folder, `<name>_shard_<index>_of_<count>`, which can be combined afterwards with the `merge` command."""
+
+    def __init__(self, index: int, count: int):
+        if not 1 <= index <= count:
+            raise BaseError(f"Invalid shard {index}/{count}, the index must be between 1 and {count}!")
+        self.index = index
+        self.count = count
+
+    @staticmethod
+    def parse(text: str) -> 'Shard':
+        match = re.fullmatch(r'(\d+)/(\d+)', text.strip())
+        if match is None:
+            raise BaseError(f"Invalid shard {text}, expected <index>/<count>, e.g. 2/8")
+        return Shard(int(match.group(1)), int(match.group(2)))
+
+    def __repr__(self) -> str:
+        return f"{self.index}/{self.count}"
+
+    def experiment_path(self, experiment_path: Path) -> Path:
+        return experiment_path.with_name(f"{experiment_path.name}_shard_{self.index}_of_{self.count}")
+
+    @staticmethod
+    def of_experiment_path(shard_path: Path) -> 'Shard':
+        """The shard whose experiment folder is `shard_path`, the reverse of `experiment_path`."""
+        match = re.fullmatch(r'.+_shard_(\d+)_of_(\d+)', shard_path.name)
+        if match is None:
+            raise BaseError(f"{shard_path} is not the experiment folder of a shard, expected <name>_shard_<index>_of_<count>")
+        return Shard(int(match.group(1)), int(match.group(2)))
+
+    def select(self, rows: Iterable[Dict]) -> Iterator[Dict]:
+        """The rows of this shard, out of all `rows` of the run table in generation order."""
+        for position, row in enumerate(rows):
+            if position % self.count == self.index - 1:
+                yield row
+
+    def length(self, run_table_model: RunTableModel) -> int:
+        """The number of rows of this shard, computed without building the run table."""
+        quotient, remainder = divmod(run_table_model.get_run_table_length(), self.count)
+        return quotient + (1 if self.index <= remainder else 0)
+
+    def run_ids(self, run_table_model: RunTableModel) -> Set[str]:
+        return {row['__run_id'] for row in self.select(run_table_model.iter_experiment_run_table())}
@@ -4,6 +4,12 @@ from ConfigValidator.Config.Models.RunTableModel import RunTableModel
 from ConfigValidator.Config.Models.FactorModel import FactorModel
 from ConfigValidator.Config.Models.RunnerContext import RunnerContext
 from ConfigValidator.Config.Models.OperationType import OperationType
+from ConfigValidator.Config.Models.RunTableStore import RunTableStore
+from ConfigValidator.Config.Models.CooldownPolicy import CooldownPolicy
+from ConfigValidator.Config.Models.NoiseGate import NoiseGate
+from ConfigValidator.Config.Models.NoiseGateAction import NoiseGateAction
+from ConfigValidator.Config.Models.RetryPolicy import RetryPolicy
+from ConfigValidator.Config.Models.MeasurementOutput import MeasurementOutput
 from ExtendedTyping.Typing import SupportsStr
 from ProgressManager.Output.OutputProcedure import OutputProcedure as output
 
@@ -27,10 +33,58 @@ class RunnerConfig:
     """Experiment operation type. Unless you manually want to initiate each run, use `OperationType.AUTO`."""
     operation_type:             OperationType   = OperationType.AUTO
 
-    """The time Experiment Runner will wait after a run completes.
+    """Where the run table and the metadata of the experiment are stored. `RunTableStore.SQLITE` keeps them in
+    `experiment.db`, which can be queried while the experiment runs, and exports `run_table.csv` when it ends."""
+    run_table_store:            RunTableStore   = RunTableStore.CSV
+
+    """Also write the run table as typed columns to `run_table.parquet` when the experiment ends (requires `pyarrow`).
+    Raw samples can be stored alongside with `ParquetOutputManager.write_samples()` in `populate_run_data`."""
+    columnar_output:            bool            = False
+
+    """The time Experiment Runner will wait after a run completes, before it starts a new run in its place.
     This can be essential to accommodate for cooldown periods on some systems."""
     time_between_runs_in_ms:    int             = 1000
 
+    """Instead of waiting a fixed `time_between_runs_in_ms`, wait after each run until the CPU temperature, package
+    power and load are back within a tolerance of a baseline taken before the first run, e.g. `CooldownPolicy()`.
+    See `CooldownPolicy` for the tolerances and the maximum wait. Requires `max_parallel_runs = 1`."""
+    cooldown_policy:            Optional[CooldownPolicy] = None
+
+    """Check for interfering load (CPU hogs, CPU frequency governor, swapping, thermal throttling) right before each run,
+    e.g. `NoiseGate(NoiseGateAction.RETRY)`. Runs started on a noisy system get the reasons in their `__suspect` column."""
+    noise_gate:                 Optional[NoiseGate] = None
+
+    """The maximum time (ms) each phase of a run may take, e.g. `{RunnerEvents.INTERACT: 60000}`. Only the events raised
+    within a run can be limited: START_RUN, START_MEASUREMENT, INTERACT, STOP_MEASUREMENT, STOP_RUN and POPULATE_RUN_DATA.
+    A run that overruns is killed, together with all processes it started, and marked as `TIMEOUT`."""
+    phase_timeouts_in_ms:       Dict[RunnerEvents, int] = {}
+
+    """Start a run again when one of its hooks raised an exception, or when it timed out, e.g. `RetryPolicy(max_attempts=3)`.
+    Without a retry policy, such runs are marked as `FAILED` or `TIMEOUT` right away. Either way, the experiment goes on."""
+    retry_policy:               Optional[RetryPolicy] = None
+
+    """What happens to the console output of the runner between START_MEASUREMENT and STOP_MEASUREMENT:
+    `MeasurementOutput.PRINT` it right away, `HOLD` it in memory until the measurement stopped, or `DROP` it.
+    Either way, it is also stored in `runner_log.jsonl` in the run's folder."""
+    measurement_output:         MeasurementOutput = MeasurementOutput.PRINT
+
+    """Account for the CPU time, RSS and (with RAPL) estimated energy Experiment Runner itself uses in each phase
+    of each run, in the controller process and in the run's process (and the profiler threads within it).
+    They are stored in `runner_overhead.csv` in the experiment folder."""
+    measure_runner_overhead:    bool = False
+
+    """The maximum number of runs Experiment Runner will execute at the same time. Each run keeps its own
+    `RunnerContext` and `run_dir`. Only raise this for experiments whose measurements are not affected by other runs
+    on the same machine (e.g. latency or throughput), never for whole-machine energy measurements."""
+    max_parallel_runs:          int             = 1
+
+    """Pin every run, and every process it starts, to its own fixed set of CPUs (one slot per parallel run).
+    Slots are kept within a single NUMA node where possible. The assigned CPUs are available as `context.cpus`."""
+    pin_runs_to_cpu_slots:      bool            = False
+
+    """The number of CPUs in each slot. If `None`, the available CPUs are divided evenly over `max_parallel_runs`."""
+    cpus_per_run:               Optional[int]   = None
+
     # Dynamic configurations can be one-time satisfied here before the program takes the config as-is
     # e.g. Setting some variable based on some criteria
     def __init__(self):
@@ -63,6 +117,8 @@ class RunnerConfig:
                 {factor1: ['example_treatment2'], factor2: [True]},  # all runs having the combination ("example_treatment2", True) will be excluded
             ],
             data_columns=['avg_cpu', 'avg_mem']
+            # repetitions=20, adaptive_repetitions=AdaptiveRepetitions('avg_cpu', relative_ci_half_width=0.05)
+            #   repeats each treatment until the 95% confidence interval of avg_cpu is within +-5% of its mean (at most 20 times)
         )
         return self.run_table_model
 
@@ -90,7 +146,9 @@ class RunnerConfig:
         output.console_log("Config.start_measurement() called!")
 
     def interact(self, context: RunnerContext) -> None:
-        """Perform any interaction with the running target system here, or block here until the target finishes."""
+        """Perform any interaction with the running target system here, or block here until the target finishes.
+        Hooks can also be `async def`, e.g. to send many concurrent requests to the target. The hooks of a run,
+        from start_run to populate_run_data, are then all called on the same event loop."""
 
         output.console_log("Config.interact() called!")
 
@@ -1,10 +1,18 @@
+import importlib.util
 from pathlib import Path
 from tabulate import tabulate
 
+from EventManager.EventSubscriptionController import EventSubscriptionController
 from ExperimentOrchestrator.Misc.DictConversion import class_to_dict
 from ExperimentOrchestrator.Misc.PathValidation import is_path_exists_or_creatable_portable
 from ConfigValidator.Config.RunnerConfig import RunnerConfig
 from ConfigValidator.Config.Models.OperationType import OperationType
+from ConfigValidator.Config.Models.RunTableStore import RunTableStore
+from ConfigValidator.Config.Models.CooldownPolicy import CooldownPolicy
+from ConfigValidator.Config.Models.NoiseGate import NoiseGate
+from ConfigValidator.Config.Models.RetryPolicy import RetryPolicy
+from ConfigValidator.Config.Models.MeasurementOutput import MeasurementOutput
+from ExperimentOrchestrator.Experiment.Run.RunController import RunController
 from ConfigValidator.CustomErrors.ConfigErrors import (ConfigInvalidError, ConfigAttributeInvalidError)
 
 class ConfigValidator:
@@ -19,14 +27,34 @@ class ConfigValidator:
                                                     f"\n\n{ConfigAttributeInvalidError(name, value, expected)}"
             ConfigValidator.error_found = True
 
+    @staticmethod
+    def __set_default(config: RunnerConfig, name, value):
+        # Configs written before an option existed do not declare it
+        if not hasattr(config, name):
+            setattr(config, name, value)
+
     @staticmethod
     def validate_config(config: RunnerConfig):
+        ConfigValidator.error_found = False
 
         # Runtime set experiment_path
         config.experiment_path = Path(str(config.results_output_path) + f"/{config.name}")
         if '~' in str(config.experiment_path):
             config.experiment_path = config.experiment_path.expanduser()
         
+        # Runtime set defaults for optional config attributes
+        ConfigValidator.__set_default(config, 'run_table_store', RunTableStore.CSV)
+        ConfigValidator.__set_default(config, 'columnar_output', False)
+        ConfigValidator.__set_default(config, 'max_parallel_runs', 1)
+        ConfigValidator.__set_default(config, 'pin_runs_to_cpu_slots', False)
+        ConfigValidator.__set_default(config, 'cpus_per_run', None)
+        ConfigValidator.__set_default(config, 'cooldown_policy', None)
+        ConfigValidator.__set_default(config, 'noise_gate', None)
+        ConfigValidator.__set_default(config, 'phase_timeouts_in_ms', {})
+        ConfigValidator.__set_default(config, 'retry_policy', None)
+        ConfigValidator.__set_default(config, 'measurement_output', MeasurementOutput.PRINT)
+        ConfigValidator.__set_default(config, 'measure_runner_overhead', False)
+
         # Convert class to dictionary with utility method
         ConfigValidator.config_values_or_exception_dict = class_to_dict(config)
 
@@ -34,10 +62,66 @@ class ConfigValidator:
         ConfigValidator.__check_expression('operation_type', config.operation_type, OperationType, 
                                 (lambda a, b: not isinstance(type(a), type(b)))
                             )
+        # run_table_store
+        ConfigValidator.__check_expression('run_table_store', config.run_table_store, RunTableStore,
+                                (lambda a, b: not isinstance(a, b))
+                            )
+        # columnar_output
+        ConfigValidator.__check_expression('columnar_output', config.columnar_output, bool,
+                                (lambda a, b: not isinstance(a, b))
+                            )
+        # Checked now rather than when the Parquet file is written, which is only after all runs
+        ConfigValidator.__check_expression('columnar_output', config.columnar_output,
+                                "False, or pyarrow installed (pip install pyarrow)",
+                                (lambda a, b: a is True and importlib.util.find_spec('pyarrow') is None)
+                            )
         # time_between_runs_in_ms
         ConfigValidator.__check_expression('time_between_runs_in_ms', config.time_between_runs_in_ms, int,
                                 (lambda a, b: not isinstance(a, b))
                             )
+        # cooldown_policy
+        ConfigValidator.__check_expression('cooldown_policy', config.cooldown_policy, "None or CooldownPolicy",
+                                (lambda a, b: a is not None and not isinstance(a, CooldownPolicy))
+                            )
+        # noise_gate
+        ConfigValidator.__check_expression('noise_gate', config.noise_gate, "None or NoiseGate",
+                                (lambda a, b: a is not None and not isinstance(a, NoiseGate))
+                            )
+        # phase_timeouts_in_ms
+        ConfigValidator.__check_expression('phase_timeouts_in_ms', config.phase_timeouts_in_ms,
+                                f"dict of {', '.join(phase.name for phase in RunController.PHASES)} -> int > 0",
+                                (lambda a, b: not isinstance(a, dict) or
+                                              any(phase not in RunController.PHASES or not isinstance(timeout, int) or timeout <= 0
+                                                  for phase, timeout in a.items()))
+                            )
+        # retry_policy
+        ConfigValidator.__check_expression('retry_policy', config.retry_policy, "None or RetryPolicy",
+                                (lambda a, b: a is not None and not isinstance(a, RetryPolicy))
+                            )
+        # measurement_output
+        ConfigValidator.__check_expression('measurement_output', config.measurement_output, MeasurementOutput,
+                                (lambda a, b: not isinstance(a, b))
+                            )
+        # measure_runner_overhead
+        ConfigValidator.__check_expression('measure_runner_overhead', config.measure_runner_overhead, bool,
+                                (lambda a, b: not isinstance(a, b))
+                            )
+        # max_parallel_runs
+        ConfigValidator.__check_expression('max_parallel_runs', config.max_parallel_runs, "int >= 1",
+                                (lambda a, b: not isinstance(a, int) or a < 1)
+                            )
+        # The machine cannot get back to its baseline while other runs are still active
+        ConfigValidator.__check_expression('cooldown_policy', config.cooldown_policy, "None if max_parallel_runs > 1",
+                                (lambda a, b: a is not None and config.max_parallel_runs != 1)
+                            )
+        # pin_runs_to_cpu_slots
+        ConfigValidator.__check_expression('pin_runs_to_cpu_slots', config.pin_runs_to_cpu_slots, bool,
+                                (lambda a, b: not isinstance(a, b))
+                            )
+        # cpus_per_run
+        ConfigValidator.__check_expression('cpus_per_run', config.cpus_per_run, "None or int >= 1",
+                                (lambda a, b: a is not None and (not isinstance(a, int) or a < 1))
+                            )
 
         # Results output path
         ConfigValidator.__check_expression("results_output_path", 
@@ -62,4 +146,7 @@ class ConfigValidator:
         )
 
         if ConfigValidator.error_found:
-            raise ConfigInvalidError
\ No newline at end of file
+            raise ConfigInvalidError
+
+        # Here rather than in RunnerConfig.__init__, which configs with an __init__ of their own do not call
+        EventSubscriptionController.subscribe_plugins(config)  # e.g. @profilers(..., start_group=...)
\ No newline at end of file
@@ -1,12 +1,50 @@
-from typing import Callable, List, Tuple
+import time
+import asyncio
+import inspect
+import threading
+from typing import Any, Callable, Dict, List, NamedTuple, Optional, Tuple
 from EventManager.Models.RunnerEvents import RunnerEvents
+from EventManager.EventTimingRecorder import EventTimingRecorder
+
+class Subscription(NamedTuple):
+    callback:   Callable
+    order:      int             # lower goes first, ties in order of subscription
+    name:       str             # a new subscription with the same name replaces the old one
+    group:      Optional[str]   # subscriptions of the same group are called concurrently, behind a barrier
 
 class EventSubscriptionController:
-    __call_back_register: dict = dict()
+    """Each event can have several subscribers, called in `order`. The hooks of the RunnerConfig are subscribed under
+    the name `CONFIG` with order 0, so plugins can run before (< 0) or after (> 0) them without wrapping the hooks.
+
+    Subscribers that share a `group` are called together, each on its own thread, at the position of the first of
+    them: all threads wait on a barrier before calling, so e.g. several profilers start their measurement at the
+    same moment rather than one after another. The event is done when all of them returned.
+
+    If subscribers return dicts (POPULATE_RUN_DATA), they are merged in order; otherwise, `raise_event` returns
+    the last value that is not None.
+
+    Subscribers can be `async def`. `raise_event` runs each of them to completion on an event loop of its own, while
+    `raise_event_async` awaits them on the running loop, so that all events it raises (e.g. the lifecycle of a run,
+    see `RunController`) share one loop. There, the loop takes part in the barrier of a group: once all of its
+    other subscribers are ready on their threads, they are released together with the loop, which then starts
+    all coroutines of the group in the same iteration.
+
+    Plugins that subscribe callbacks of their own (e.g. `Profiler.profilers(..., start_group=...)`) register
+    for a config class with `register_plugin`, and are subscribed for each config by `subscribe_plugins`."""
+
+    CONFIG = ''
+
+    __call_back_register: Dict[RunnerEvents, List[Subscription]] = dict()
+    __plugin_register: Dict[type, List[Callable]] = dict()
 
     @staticmethod
-    def subscribe_to_single_event(event: RunnerEvents, callback_method: Callable):
-            EventSubscriptionController.__call_back_register[event] = callback_method
+    def subscribe_to_single_event(event: RunnerEvents, callback_method: Callable, order: int = 0,
+                                  name: str = CONFIG, group: Optional[str] = None):
+        subscriptions = [subscription for subscription in EventSubscriptionController.__call_back_register.get(event, [])
+                         if subscription.name != name]
+        subscriptions.append(Subscription(callback_method, order, name, group))
+        subscriptions.sort(key=lambda subscription: subscription.order)  # stable, so ties keep their order
+        EventSubscriptionController.__call_back_register[event] = subscriptions
 
     @staticmethod
     def subscribe_to_multiple_events(subscriptions: List[Tuple[RunnerEvents, Callable]]):
@@ -15,20 +53,160 @@ class EventSubscriptionController:
             EventSubscriptionController.subscribe_to_single_event(event, callback)
 
     @staticmethod
-    def raise_event(event: RunnerEvents, runner_context=None):
-        try:
-            event_callback = EventSubscriptionController.__call_back_register[event]
-        except KeyError:
-            return None
+    def register_plugin(config_cls: type, subscribe: Callable):
+        """Have `subscribe(config)` called for each config of `config_cls`, or of a subclass, by `subscribe_plugins`."""
+        EventSubscriptionController.__plugin_register.setdefault(config_cls, []).append(subscribe)
+
+    @staticmethod
+    def subscribe_plugins(config):
+        """Subscribe the plugins registered for the class of `config` and its base classes, the bases' first.
+        Called by `ConfigValidator.validate_config`, once the config's own hooks are subscribed."""
+        for config_cls in reversed(type(config).__mro__):
+            for subscribe in EventSubscriptionController.__plugin_register.get(config_cls, []):
+                subscribe(config)
+
+    @staticmethod
+    def unsubscribe(event: RunnerEvents, name: str = CONFIG):
+        subscriptions = EventSubscriptionController.__call_back_register.get(event, [])
+        EventSubscriptionController.__call_back_register[event] = [subscription for subscription in subscriptions
+                                                                   if subscription.name != name]
 
+    @staticmethod
+    def is_async(event: RunnerEvents) -> bool:
+        return any(inspect.iscoroutinefunction(subscription.callback)
+                   for subscription in EventSubscriptionController.__call_back_register.get(event, []))
+
+    @staticmethod
+    def __call(callback: Callable, runner_context) -> Any:
         if runner_context:
-            return event_callback(runner_context)
+            return callback(runner_context)
         else:
-            return event_callback()
+            return callback()
 
     @staticmethod
-    def get_event_callback(event: RunnerEvents):
+    def __call_to_completion(callback: Callable, runner_context) -> Any:
+        result = EventSubscriptionController.__call(callback, runner_context)
+        return asyncio.run(result) if inspect.iscoroutine(result) else result
+
+    @staticmethod
+    def __steps(subscriptions: List[Subscription]) -> List[List[Subscription]]:
+        """The subscriptions, each group at the position of its first member."""
+        steps = []
+        called_groups = set()
+        for subscription in subscriptions:
+            if subscription.group is None:
+                steps.append([subscription])
+            elif subscription.group not in called_groups:
+                called_groups.add(subscription.group)
+                steps.append([member for member in subscriptions if member.group == subscription.group])
+        return steps
+
+    @staticmethod
+    def __call_concurrently(subscriptions: List[Subscription], runner_context,
+                            barrier: Optional[threading.Barrier] = None) -> List[Any]:
+        if barrier is None:
+            barrier = threading.Barrier(len(subscriptions))
+        results: List[Any] = [None] * len(subscriptions)
+        errors: List[Optional[BaseException]] = [None] * len(subscriptions)
+
+        def call(i: int, callback: Callable):
+            try:
+                barrier.wait()
+                results[i] = EventSubscriptionController.__call_to_completion(callback, runner_context)
+            except BaseException as e:
+                barrier.abort()  # do not leave the others waiting for a subscriber that will not arrive
+                errors[i] = e
+
+        threads = [threading.Thread(target=call, args=(i, subscription.callback), name=f'{subscription.group}-{i}')
+                   for i, subscription in enumerate(subscriptions)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        # A subscriber that failed breaks the barrier for the others, report the original error
+        failed = [error for error in errors if error is not None]
+        if failed:
+            raise next((error for error in failed if not isinstance(error, threading.BrokenBarrierError)), failed[0])
+        return results
+
+    @staticmethod
+    def raise_event(event: RunnerEvents, runner_context=None):
+        subscriptions = EventSubscriptionController.__call_back_register.get(event)
+        if not subscriptions:
+            return None
+
+        start_ns = time.monotonic_ns()
         try:
-            return EventSubscriptionController.__call_back_register[event]
-        except KeyError:
+            results = []
+            for step in EventSubscriptionController.__steps(subscriptions):
+                if step[0].group is None:
+                    results.append(EventSubscriptionController.__call_to_completion(step[0].callback, runner_context))
+                else:
+                    results.extend(EventSubscriptionController.__call_concurrently(step, runner_context))
+            return EventSubscriptionController.__combine(results)
+        finally:
+            run_id = runner_context.run_variation['__run_id'] if runner_context else None
+            EventTimingRecorder.record(event, run_id, start_ns, time.monotonic_ns() - start_ns)
+
+    @staticmethod
+    async def __call_concurrently_async(subscriptions: List[Subscription], runner_context) -> List[Any]:
+        coroutines = [subscription for subscription in subscriptions if inspect.iscoroutinefunction(subscription.callback)]
+        others = [subscription for subscription in subscriptions if subscription not in coroutines]
+
+        calls = []
+        if others:
+            # Off the loop, so that it keeps serving the coroutines. The loop is one more party of the barrier.
+            barrier = threading.Barrier(len(others) + 1)
+            calls.append(asyncio.ensure_future(asyncio.to_thread(EventSubscriptionController.__call_concurrently,
+                                                                 others, runner_context, barrier)))
+            try:
+                await asyncio.to_thread(barrier.wait)
+            except threading.BrokenBarrierError:
+                await calls[0]  # report the error of the subscriber that broke it
+                raise
+        calls = [EventSubscriptionController.__call(subscription.callback, runner_context)
+                 for subscription in coroutines] + calls
+        results = await asyncio.gather(*calls)
+
+        by_subscription = dict(zip(map(id, coroutines), results))
+        if others:
+            by_subscription.update(zip(map(id, others), results[-1]))
+        return [by_subscription[id(subscription)] for subscription in subscriptions]
+
+    @staticmethod
+    async def raise_event_async(event: RunnerEvents, runner_context=None):
+        subscriptions = EventSubscriptionController.__call_back_register.get(event)
+        if not subscriptions:
             return None
+
+        start_ns = time.monotonic_ns()
+        try:
+            results = []
+            for step in EventSubscriptionController.__steps(subscriptions):
+                if step[0].group is None:
+                    result = EventSubscriptionController.__call(step[0].callback, runner_context)
+                    results.append(await result if inspect.isawaitable(result) else result)
+                else:
+                    results.extend(await EventSubscriptionController.__call_concurrently_async(step, runner_context))
+            return EventSubscriptionController.__combine(results)
+        finally:
+            run_id = runner_context.run_variation['__run_id'] if runner_context else None
+            EventTimingRecorder.record(event, run_id, start_ns, time.monotonic_ns() - start_ns)
+
+    @staticmethod
+    def __combine(results: List[Any]) -> Any:
+        results = [result for result in results if result is not None]
+        if len(results) > 1 and all(isinstance(result, dict) for result in results):
+            combined = dict()
+            for result in results:
+                combined.update(result)
+            return combined
+        return results[-1] if results else None
+
+    @staticmethod
+    def get_event_callback(event: RunnerEvents):
+        for subscription in EventSubscriptionController.__call_back_register.get(event, []):
+            if subscription.name == EventSubscriptionController.CONFIG:
+                return subscription.callback
+        return None
@@ -0,0 +1,79 @@
+import csv
+import math
+import os
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+from EventManager.Models.RunnerEvents import RunnerEvents
+
+class EventTimingRecorder:
+    """Collects the time spent in each dispatched event, as (event, run id, PID, start, duration) with `time.monotonic_ns()`.
+
+    Timings are buffered in memory, and appended to the timing table of the experiment with `flush()`, which the
+    experiment controller calls outside of the measurements: before each run is forked (so a run does not inherit
+    the timings of its parent) and by the run itself once it is completed. Each flush is a single append, so the
+    runs of a parallel experiment can share the table."""
+
+    FILE_NAME   = 'event_timings.csv'
+    COLUMNS     = ['event', '__run_id', 'pid', 'start_ns', 'duration_ns']
+
+    __timings: List[Tuple[str, str, int, int, int]] = []
+    __timing_table: Optional[Path] = None
+
+    """The run that events raised without a `RunnerContext` (e.g. BEFORE_RUN) belong to."""
+    current_run_id: str = ''
+
+    @staticmethod
+    def open(experiment_path: Path):
+        EventTimingRecorder.__timings = []
+        EventTimingRecorder.__timing_table = experiment_path / EventTimingRecorder.FILE_NAME
+        if not EventTimingRecorder.__timing_table.exists():
+            with open(EventTimingRecorder.__timing_table, 'w', newline='') as csvfile:
+                csv.writer(csvfile).writerow(EventTimingRecorder.COLUMNS)
+
+    @staticmethod
+    def record(event: RunnerEvents, run_id: Optional[str], start_ns: int, duration_ns: int):
+        if EventTimingRecorder.__timing_table is None:
+            return
+        EventTimingRecorder.__timings.append((event.name, run_id if run_id is not None else EventTimingRecorder.current_run_id,
+                                              os.getpid(), start_ns, duration_ns))
+
+    @staticmethod
+    def flush():
+        if EventTimingRecorder.__timing_table is None or not EventTimingRecorder.__timings:
+            return
+        # Timings are numbers and enum names, so no quoting is needed
+        lines = ''.join(','.join(str(value) for value in timing) + '\n' for timing in EventTimingRecorder.__timings)
+        EventTimingRecorder.__timings = []
+        fd = os.open(EventTimingRecorder.__timing_table, os.O_WRONLY | os.O_APPEND)
+        try:
+            os.write(fd, lines.encode())
+        finally:
+            os.close(fd)
+
+    @staticmethod
+    def __percentile(sorted_values: List[int], percentile: float) -> int:
+        # Nearest-rank method
+        return sorted_values[max(0, math.ceil(percentile / 100 * len(sorted_values)) - 1)]
+
+    @staticmethod
+    def summary(timing_table: Path) -> List[Dict]:
+        """The number of dispatches and the p50, p95 and maximum duration (ms) of each event in `timing_table`."""
+        durations: Dict[str, List[int]] = dict()
+        with open(timing_table, newline='') as csvfile:
+            for row in csv.DictReader(csvfile):
+                durations.setdefault(row['event'], []).append(int(row['duration_ns']))
+
+        summary = []
+        for event in RunnerEvents:
+            if event.name not in durations:
+                continue
+            values = sorted(durations[event.name])
+            summary.append({
+                'event':    event.name,
+                'count':    len(values),
+                'p50_ms':   round(EventTimingRecorder.__percentile(values, 50) / 1e6, 3),
+                'p95_ms':   round(EventTimingRecorder.__percentile(values, 95) / 1e6, 3),
+                'max_ms':   round(values[-1] / 1e6, 3),
+            })
+        return summary
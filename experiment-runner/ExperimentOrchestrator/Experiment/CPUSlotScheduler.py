@@ -0,0 +1,102 @@
+import os
+import heapq
+from pathlib import Path
+from typing import FrozenSet, List, Optional, Set, Tuple
+
+from ConfigValidator.CustomErrors.BaseError import BaseError
+
+
+###     =========================================================
+###     |                                                       |
+###     |                    CPUSlotScheduler                   |
+###     |       - Split the usable CPUs into fixed, equally     |
+###     |         sized slots that stay within a NUMA node      |
+###     |         whenever possible                             |
+###     |       - Hand out one slot per concurrent run          |
+###     |       - Pin a run's process tree to its slot          |
+###     |                                                       |
+###     =========================================================
+class CPUSlotScheduler:
+
+    def __init__(self, nr_slots: int, cpus_per_slot: Optional[int] = None,
+                 cpus: Optional[Set[int]] = None, sysfs_root: Path = Path('/sys')):
+        if cpus is None:
+            cpus = CPUSlotScheduler.available_cpus()
+
+        self.__slots = CPUSlotScheduler.partition(nr_slots, cpus_per_slot, cpus,
+                                                  CPUSlotScheduler.read_numa_nodes(sysfs_root))
+        self.__free_slots = list(range(len(self.__slots)))  # min-heap, so the lowest free slot is always reused first
+
+    @property
+    def slots(self) -> List[FrozenSet[int]]:
+        return self.__slots
+
+    def acquire(self) -> Tuple[int, FrozenSet[int]]:
+        slot = heapq.heappop(self.__free_slots)
+        return slot, self.__slots[slot]
+
+    def release(self, slot: int):
+        heapq.heappush(self.__free_slots, slot)
+
+    @staticmethod
+    def pin(cpus: FrozenSet[int]):
+        """Restrict the calling process to `cpus`. Processes started afterwards inherit the affinity."""
+        os.sched_setaffinity(0, cpus)
+
+    @staticmethod
+    def available_cpus() -> FrozenSet[int]:
+        if hasattr(os, 'sched_getaffinity'):
+            return frozenset(os.sched_getaffinity(0))
+        return frozenset(range(os.cpu_count()))  # e.g. macOS, which has no CPU affinity API
+
+    @staticmethod
+    def parse_cpu_list(cpu_list: str) -> Set[int]:
+        """Parse the kernel's cpulist format, e.g. '0-3,8-11'."""
+        cpus = set()
+        for part in cpu_list.strip().split(','):
+            if not part:
+                continue
+            if '-' in part:
+                first, last = part.split('-')
+                cpus.update(range(int(first), int(last) + 1))
+            else:
+                cpus.add(int(part))
+        return cpus
+
+    @staticmethod
+    def read_numa_nodes(sysfs_root: Path = Path('/sys')) -> List[Set[int]]:
+        node_dirs = sorted((sysfs_root / 'devices' / 'system' / 'node').glob('node[0-9]*'),
+                           key=lambda node_dir: int(node_dir.name[len('node'):]))
+        nodes = []
+        for node_dir in node_dirs:
+            try:
+                nodes.append(CPUSlotScheduler.parse_cpu_list((node_dir / 'cpulist').read_text()))
+            except OSError:
+                continue
+        return nodes
+
+    @staticmethod
+    def partition(nr_slots: int, cpus_per_slot: Optional[int], cpus: Set[int], numa_nodes: List[Set[int]]) -> List[FrozenSet[int]]:
+        if cpus_per_slot is None:
+            cpus_per_slot = len(cpus) // nr_slots
+        if cpus_per_slot < 1:
+            raise BaseError(f"Cannot split {len(cpus)} CPU(s) into {nr_slots} slot(s)!")
+
+        # CPUs outside of any known NUMA node (or no NUMA information at all) are treated as one extra node
+        nodes = [sorted(node & cpus) for node in numa_nodes]
+        unassigned = sorted(cpus.difference(*numa_nodes))
+        if unassigned:
+            nodes.append(unassigned)
+
+        def chunk(cpu_list: List[int]) -> List[FrozenSet[int]]:
+            return [frozenset(cpu_list[i:i + cpus_per_slot])
+                    for i in range(0, len(cpu_list) - cpus_per_slot + 1, cpus_per_slot)]
+
+        # Prefer slots that do not straddle NUMA nodes, fall back to consecutive CPUs in node order
+        slots = [slot for node in nodes for slot in chunk(node)]
+        if len(slots) < nr_slots:
+            slots = chunk([cpu for node in nodes for cpu in node])
+        if len(slots) < nr_slots:
+            raise BaseError(f"Cannot split {len(cpus)} CPU(s) into {nr_slots} slot(s) of {cpus_per_slot} CPU(s)!")
+
+        return slots[:nr_slots]
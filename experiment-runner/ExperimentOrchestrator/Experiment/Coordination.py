@@ -0,0 +1,98 @@
+import threading
+from multiprocessing import Pipe
+from multiprocessing.connection import Client, Connection, Listener
+from typing import Dict, List, Optional, Tuple, Union
+
+from ConfigValidator.CustomErrors.BaseError import BaseError
+from ProgressManager.Output.OutputProcedure import OutputProcedure as output
+
+
+###     =========================================================
+###     |                                                       |
+###     |                      Coordination                     |
+###     |       - Connect the workers of a distributed          |
+###     |         experiment to their coordinator, over TCP     |
+###     |         (tcp://host:port) or a Unix socket            |
+###     |         (unix:///path/to/socket)                      |
+###     |       - Authenticate both sides with the md5sum of    |
+###     |         the config, so all of them run the same code  |
+###     |                                                       |
+###     |       * Messages are pickled, only use this within    |
+###     |         a trusted network                             |
+###     |                                                       |
+###     =========================================================
+
+# Worker -> coordinator
+NEXT_RUN    = 'next_run'     # ask for the next run, answered with {'__run_id', '__attempts'}, or None if there is none.
+                             # While other workers still have runs, the answer waits until one of theirs is handed back.
+UPDATE_ROW  = 'update_row'   # followed by a (partial) row of the run table, as written by the worker's ExperimentController
+
+def parse_address(address: str) -> Tuple[Union[str, Tuple[str, int]], str]:
+    """Parse `tcp://host:port` or `unix:///path` into an address and family for `multiprocessing.connection`."""
+    if address.startswith('tcp://'):
+        host, _, port = address[len('tcp://'):].rpartition(':')
+        if not host or not port.isdigit():
+            raise BaseError(f"Invalid coordinator address {address}, expected tcp://host:port")
+        return (host.strip('[]'), int(port)), 'AF_INET6' if ':' in host else 'AF_INET'
+    if address.startswith('unix://'):
+        return address[len('unix://'):], 'AF_UNIX'
+    raise BaseError(f"Invalid coordinator address {address}, expected tcp://host:port or unix:///path")
+
+class CoordinatorListener:
+    """Accepts workers in the background. `wakeup` becomes readable whenever a new worker connected,
+    so it can be waited on together with the connections of the workers."""
+
+    def __init__(self, address: str, authkey: bytes):
+        listen_address, family = parse_address(address)
+        self.__listener = Listener(listen_address, family, authkey=authkey)
+        self.__new_workers: List[Connection] = []
+        self.__lock = threading.Lock()
+        self.wakeup, self.__wakeup_send = Pipe(duplex=False)
+        threading.Thread(target=self.__accept_loop, name='CoordinatorListener', daemon=True).start()
+
+    def __accept_loop(self):
+        while True:
+            try:
+                worker = self.__listener.accept()
+            except OSError:
+                return  # closed
+            except Exception as e:  # e.g. a worker with a different config, which fails the authentication
+                output.console_log_FAIL(f"Rejected a worker: {type(e).__name__}: {e}")
+                continue
+            with self.__lock:
+                self.__new_workers.append(worker)
+            self.__wakeup_send.send(None)
+
+    def new_workers(self) -> List[Connection]:
+        while self.wakeup.poll():
+            self.wakeup.recv()
+        with self.__lock:
+            workers, self.__new_workers = self.__new_workers, []
+        return workers
+
+    def close(self):
+        self.__listener.close()
+
+class CoordinatorClient:
+    """The worker side of the connection. Stands in for the output manager of the worker's ExperimentController:
+    all rows it updates are sent to the coordinator, which stores them."""
+
+    def __init__(self, address: str, authkey: bytes):
+        connect_address, family = parse_address(address)
+        self.__connection = Client(connect_address, family, authkey=authkey)
+
+    def next_run(self) -> Optional[Dict]:
+        try:
+            self.__connection.send(NEXT_RUN)
+            return self.__connection.recv()
+        except (EOFError, OSError):
+            return None  # the coordinator is done
+
+    def update_row_data(self, updated_row: Dict):
+        self.__connection.send((UPDATE_ROW, updated_row))
+
+    def flush(self):
+        pass
+
+    def close(self):
+        self.__connection.close()
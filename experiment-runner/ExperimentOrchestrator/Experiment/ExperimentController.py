@@ -1,17 +1,33 @@
 import time
+import heapq
+import random
+import traceback
 import multiprocessing
+from tabulate import tabulate
+from collections import deque
+from multiprocessing.connection import Connection, wait
+from typing import Dict, FrozenSet, Iterable, Iterator, List, Optional, Tuple, Union
 
 from ConfigValidator.Config.Models.Metadata import Metadata
 from ConfigValidator.CustomErrors.BaseError import BaseError
 from ProgressManager.Output.JSONOutputManager import JSONOutputManager
 from ProgressManager.RunTable.Models.RunProgress import RunProgress
 from ConfigValidator.Config.Models.OperationType import OperationType
+from ConfigValidator.Config.Models.RunTableStore import RunTableStore
+from ConfigValidator.Config.Models.NoiseGate import NoiseGate
+from ConfigValidator.Config.Models.Shard import Shard
 from EventManager.Models.RunnerEvents import RunnerEvents
 from ProgressManager.Output.CSVOutputManager import CSVOutputManager
+from ProgressManager.Output.SQLiteOutputManager import SQLiteOutputManager
 from ExperimentOrchestrator.Experiment.Run.RunController import RunController
+from ExperimentOrchestrator.Experiment.CPUSlotScheduler import CPUSlotScheduler
+from ExperimentOrchestrator.Experiment.RunWatchdog import RunWatchdog
+from ExperimentOrchestrator.Experiment.RunnerOverhead import RunnerOverhead
+from ExperimentOrchestrator.Experiment.Coordination import NEXT_RUN, CoordinatorClient, CoordinatorListener
 from ConfigValidator.Config.RunnerConfig import RunnerConfig
 from ProgressManager.Output.OutputProcedure import OutputProcedure as output
 from EventManager.EventSubscriptionController import EventSubscriptionController
+from EventManager.EventTimingRecorder import EventTimingRecorder
 from ConfigValidator.CustomErrors.ProgressErrors import AllRunsCompletedOnRestartError
 
 
@@ -30,24 +46,49 @@ from ConfigValidator.CustomErrors.ProgressErrors import AllRunsCompletedOnRestar
 ###     =========================================================
 class ExperimentController:
 
-    def __init__(self, config: RunnerConfig, metadata: Metadata):
+    def __init__(self, config: RunnerConfig, metadata: Metadata, coordinator: Optional[CoordinatorClient] = None,
+                 shard: Optional[Shard] = None):
         self.config = config
         self.metadata = metadata
+        self.coordinator = coordinator  # set for a worker of a distributed experiment, whose coordinator owns the run table
+        if shard is not None:
+            self.config.experiment_path = shard.experiment_path(self.config.experiment_path)
 
-        self.csv_data_manager = CSVOutputManager(self.config.experiment_path)
-        self.json_data_manager = JSONOutputManager(self.config.experiment_path)
-        self.run_table = self.config.create_run_table_model().generate_experiment_run_table()
+        if self.coordinator is not None:
+            self.data_manager = self.coordinator
+            self.metadata_manager = None
+        elif self.config.run_table_store is RunTableStore.SQLITE:
+            self.data_manager = SQLiteOutputManager(self.config.experiment_path)
+            self.metadata_manager = self.data_manager
+        else:
+            self.data_manager = CSVOutputManager(self.config.experiment_path)
+            self.metadata_manager = JSONOutputManager(self.config.experiment_path)
+        self.run_table_model = self.config.create_run_table_model()
+        self.shard = shard
+        adaptive_repetitions = self.run_table_model.get_adaptive_repetitions()
+        if adaptive_repetitions is not None and adaptive_repetitions.target_metric not in self.run_table_model.get_data_columns():
+            raise BaseError(f"Adaptive repetitions target metric {adaptive_repetitions.target_metric} is not a data column!")
+        if shard is not None and shard.count > 1 and adaptive_repetitions is not None:
+            raise BaseError("Adaptive repetitions need all repetitions of a treatment, they cannot be sharded!")
+        # The run table is streamed from the model rather than kept in memory, see __generate_run_table and __fetch_run
+        self.nr_runs = shard.length(self.run_table_model) if shard is not None else self.run_table_model.get_run_table_length()
+        self.positions: Dict[str, int] = dict()  # run id -> position in the run table, of the runs being done
+        self.cpu_slot_scheduler = None
+        if self.config.pin_runs_to_cpu_slots:
+            self.cpu_slot_scheduler = CPUSlotScheduler(self.config.max_parallel_runs, self.config.cpus_per_run)
+        self.watchdog = RunWatchdog(self.config.phase_timeouts_in_ms)
 
         # Create experiment output folder, and in case that it exists, check if we can resume
         self.restarted = False
+        run_table: Iterable[Tuple[int, Dict]] = ()  # (position, variation), a worker has no run table of its own
         try:
-            self.config.experiment_path.mkdir(parents=True, exist_ok=False)
+            self.config.experiment_path.mkdir(parents=True, exist_ok=self.coordinator is not None)
         except FileExistsError:
             output.console_log_WARNING(f"Reusing already existing experiment path: {self.config.experiment_path}")
-            existing_run_table = self.csv_data_manager.read_run_table()
+            existing_run_table = self.data_manager.read_run_table()
 
-            # First sanity check. If there is no "TODO" in the __done column, simply abort.
-            todo_run_found = any([variation['__done'] != RunProgress.DONE for variation in existing_run_table])
+            # First sanity check. If there is no run left to do (see __is_left_to_do), simply abort.
+            todo_run_found = any(self.__is_left_to_do(variation) for variation in existing_run_table)
             if not todo_run_found:
                 raise BaseError("The experiment was restarted, but all runs have already been completed.")
 
@@ -56,13 +97,20 @@ class ExperimentController:
             #   1. The column names of the stored run_table and the generated one must match
             #   2. The stored md5sum for the code must match the current one
 
+            # Run tables stored before a column of the controller itself existed get it with its initial value
+            missing_columns = {column: value for column, value in self.__controller_columns().items()
+                               if column not in existing_run_table[0]}
+            for existing_var in existing_run_table:
+                existing_var.update(missing_columns)
+
             # check column names
-            if not set(existing_run_table[0].keys()) == set(self.run_table[0].keys()):
+            first_generated_var = next(self.__generate_run_table(), dict())
+            if not set(existing_run_table[0].keys()) == set(first_generated_var.keys()):
                 raise BaseError("The generated run table from the config file, and the found run table in the CSV in "
                                 "the experiment output path, do not define the same columns!"
                                 )
             # check md5sum
-            existing_metadata = self.json_data_manager.read_metadata()
+            existing_metadata = self.metadata_manager.read_metadata()
             if existing_metadata.md5sum != self.metadata.md5sum:  # check md5sum
                 cont = output.query_yes_no("md5sum mismatch! This can occur if the configuration code "
                                            "has changed since the last run. Continue anyway?", default=None)
@@ -70,42 +118,140 @@ class ExperimentController:
                     raise BaseError("Aborting due to md5sum mismatch.")
 
                 output.console_log_WARNING(f"Updating md5sum from {existing_metadata.md5sum.hex()} to {self.metadata.md5sum.hex()}")
-                self.json_data_manager.write_metadata(self.metadata)
+                self.metadata_manager.write_metadata(self.metadata)
+
+            if missing_columns:
+                output.console_log_WARNING(f"Adding the column(s) {', '.join(missing_columns)} to the stored run table")
+                self.data_manager.write_run_table(existing_run_table)
 
             self.restarted = True
-            assert(len(existing_run_table) == len(self.run_table))
+            run_table = self.__resume_run_table(existing_run_table)
+            output.console_log_WARNING(">> WARNING << -- Experiment is restarted!")
+        if not self.restarted and self.coordinator is None:
+            run_table = self.__create_run_table()
+            self.metadata_manager.write_metadata(self.metadata)
 
-            # Re-order the generated run table to match the already existing one
-            tmp_run_table = []
-            for existing_var in existing_run_table:
-                for generated_var in self.run_table:
-                    if existing_var['__run_id'] == generated_var['__run_id']:
-                        tmp_run_table.append(generated_var)
-                        break
-            self.run_table = tmp_run_table
-            for existing_var, generated_var in zip(existing_run_table, self.run_table):
-                assert(existing_var['__run_id'] == generated_var['__run_id'])
+        # Runs are pulled from `pending_runs` as (position, variation) only once they are about to be done.
+        # A worker of a distributed experiment gets its runs from the coordinator instead, see __worker_variation.
+        self.pending_runs = iter(())
+        if self.coordinator is None:
+            self.pending_runs = ((position, variation) for position, variation in run_table
+                                 if variation['__done'] == RunProgress.TODO)
+        else:
+            self.worker_run_table = enumerate(self.__generate_run_table())
+            self.worker_unassigned_runs: Dict[str, Tuple[int, Dict]] = dict()  # generated before the run they were looked for
 
-            # Fill in the run_table.
-            # Note that the stored run_table has only a str() representation of the factor treatment levels.
-            # The generated one can have arbitrary python objects.
-            for existing_var, generated_var in zip(existing_run_table, self.run_table):
-                assert (existing_var['__run_id'] == generated_var['__run_id'])
+        EventTimingRecorder.open(self.config.experiment_path)
+        # A single one for the controller, whose phases do not overlap when runs are performed in parallel
+        self.controller_overhead: Optional[RunnerOverhead] = None
+        if self.config.measure_runner_overhead:
+            RunnerOverhead.create_table(self.config.experiment_path)
+            self.controller_overhead = RunnerOverhead(self.config.experiment_path, '', RunnerOverhead.CONTROLLER)
 
-                for k in map(lambda factor: factor.factor_name,
-                             self.config.run_table_model.get_factors()):  # treatment levels remain the same
-                    assert (str(generated_var[k]) == str(existing_var[k]))
+        # With adaptive repetitions, all repetitions of a treatment are looked at together to decide whether more are needed
+        # The coordinator of a distributed experiment decides this, as it sees the repetitions of all workers
+        self.adaptive_repetitions = self.run_table_model.get_adaptive_repetitions() if self.coordinator is None else None
+        self.treatments = dict()  # treatment levels (as str) -> all repetitions of that treatment
+        if self.adaptive_repetitions is not None:
+            for _, variation in run_table:
+                self.treatments.setdefault(self.__treatment_of(variation), []).append(variation)
 
-                for k in set(self.config.run_table_model.get_data_columns()).union(
-                        ['__done']):  # update data columns and __done column
-                    generated_var[k] = existing_var[k]
+        output.console_log_WARNING("Experiment run table created...")
 
-            output.console_log_WARNING(">> WARNING << -- Experiment is restarted!")
-        if not self.restarted:
-            self.csv_data_manager.write_run_table(self.run_table)
-            self.json_data_manager.write_metadata(self.metadata)
+    def __controller_columns(self) -> Dict[str, Union[int, str]]:
+        """The columns this controller adds to each row of the run table, with their initial values."""
+        columns = {
+            '__attempts': 0,
+            '__error': ''  # why the last attempt of the run failed, if it did
+        }
+        if self.config.noise_gate is not None:
+            columns[NoiseGate.SUSPECT_COLUMN] = ''  # why the system was noisy when the run started, if it was
+        return columns
 
-        output.console_log_WARNING("Experiment run table created...")
+    def __generate_run_table(self) -> Iterator[Dict]:
+        """The rows of the run table (of this shard), in generation order, one at a time."""
+        rows = self.run_table_model.iter_experiment_run_table()
+        if self.shard is not None:
+            rows = self.shard.select(rows)
+        controller_columns = self.__controller_columns()
+        for variation in rows:
+            variation.update(controller_columns)
+            yield variation
+
+    def __create_run_table(self) -> Iterable[Tuple[int, Dict]]:
+        """Store a new run table, and return its rows as (position, variation)."""
+        if not self.run_table_model.get_shuffle() and self.run_table_model.get_adaptive_repetitions() is None:
+            self.data_manager.write_run_table(self.__generate_run_table())
+            return enumerate(self.__generate_run_table())
+
+        # A shuffled order can only be drawn over all rows at once, and adaptive repetitions look at all
+        # repetitions of a treatment together: both need the whole run table in memory
+        run_table = list(self.__generate_run_table())
+        if self.run_table_model.get_shuffle():
+            random.shuffle(run_table)
+        self.data_manager.write_run_table(run_table)
+        return list(enumerate(run_table))
+
+    def __is_left_to_do(self, existing_var: Dict) -> bool:
+        """Whether a run of a stored run table is done when the experiment is resumed: those that were still to do,
+        or RUNNING when the previous invocation stopped, and those that FAILED or hit a TIMEOUT with attempts left."""
+        if existing_var['__done'] in (RunProgress.TODO, RunProgress.RUNNING):
+            return True
+        retry_policy = self.config.retry_policy
+        # Run tables stored before __attempts existed do not have it yet
+        return retry_policy is not None and retry_policy.should_retry(existing_var['__done'],
+                                                                      int(existing_var.get('__attempts', 0)))
+
+    def __resume_run_table(self, existing_run_table: List[Dict]) -> List[Tuple[int, Dict]]:
+        """The rows of the generated run table that are still to be done, as (position, variation), in the order and
+        with the progress of the stored run table. With adaptive repetitions, all rows, as the finished ones count."""
+        # Note that the stored run_table has only a str() representation of the factor treatment levels.
+        # The generated one can have arbitrary python objects.
+        existing_positions = {existing_var['__run_id']: position for position, existing_var in enumerate(existing_run_table)}
+        factor_names = [factor.factor_name for factor in self.run_table_model.get_factors()]
+        updated_columns = set(self.run_table_model.get_data_columns()).union(['__done', '__attempts', '__error'])
+        if self.run_table_model.get_adaptive_repetitions() is not None:
+            updated_columns.add('__repetitions')
+        if self.config.noise_gate is not None:
+            updated_columns.add(NoiseGate.SUSPECT_COLUMN)
+
+        run_table = []
+        nr_generated, position = 0, None
+        for generated_var in self.__generate_run_table():
+            nr_generated += 1
+            position = existing_positions.get(generated_var['__run_id'])
+            if position is None:
+                break
+            existing_var = existing_run_table[position]
+            if not self.__is_left_to_do(existing_var) and self.run_table_model.get_adaptive_repetitions() is None:
+                continue
+
+            for k in factor_names:  # treatment levels remain the same
+                assert (str(generated_var[k]) == str(existing_var[k]))
+
+            for k in updated_columns:  # update data columns and __done column
+                generated_var[k] = existing_var[k]
+            if self.__is_left_to_do(generated_var):
+                generated_var['__done'] = RunProgress.TODO
+            run_table.append((position, generated_var))
+        if position is None or nr_generated != len(existing_run_table) or len(existing_positions) != len(existing_run_table):
+            raise BaseError("The generated run table from the config file, and the found run table in the CSV in "
+                            "the experiment output path, do not define the same runs!"
+                            )
+        run_table.sort(key=lambda position_variation: position_variation[0])
+        return run_table
+
+    def __worker_variation(self, run_id: str) -> Tuple[int, Dict]:
+        """Look up a run the coordinator handed to this worker, as (position, variation) in generation order.
+        The coordinator hands out the runs in the order of its run table, so unless it is shuffled, each run is
+        found right after the previous one."""
+        if run_id in self.worker_unassigned_runs:
+            return self.worker_unassigned_runs.pop(run_id)
+        for position, variation in self.worker_run_table:
+            if variation['__run_id'] == run_id:
+                return position, variation
+            self.worker_unassigned_runs[variation['__run_id']] = (position, variation)
+        raise BaseError(f"The coordinator handed out run {run_id}, which is not in the run table of this worker!")
 
     def do_experiment(self):
         output.console_log_OK("Experiment setup completed...")
@@ -114,33 +260,384 @@ class ExperimentController:
         # TODO: From a user perspective, it would be nice to know if this is a restarted experiment or not (in case something failed)
         output.console_log_WARNING("Calling before_experiment config hook")
         EventSubscriptionController.raise_event(RunnerEvents.BEFORE_EXPERIMENT)
+        if self.config.cooldown_policy is not None:
+            # After the hook, so that any setup it does is part of the state the machine has to return to
+            self.config.cooldown_policy.take_baseline()
 
         # -- Experiment
-        for variation in self.run_table:
-            if variation['__done'] == RunProgress.DONE:
-                continue
-
-            output.console_log_WARNING("Calling before_run config hook")
-            EventSubscriptionController.raise_event(RunnerEvents.BEFORE_RUN)
+        # Runs are executed by at most `max_parallel_runs` worker processes at a time. Each run is a single fork:
+        # the worker calls all run hooks itself and only sends its updated row back (one pickle per run),
+        # this process is the single writer of the run table.
+        # Per-run overhead budget of the runner itself (fork, result pipe, journal append + fsync): < 25ms,
+        # ~4ms measured for no-op runs on Linux. See test_ExperimentController.TestExperimentControllerOverhead.
+        # Runs are fetched one at a time (see __fetch_run), from the run table or, for a worker of a distributed
+        # experiment, from the coordinator. `todo_runs` only holds the runs that are due for a retry.
+        # A fetched run that has to wait for the time between runs stays at the front of `todo_runs`.
+        todo_runs = deque()
+        active_runs = dict()  # result connection -> (worker process, variation, cpu slot)
+        self.retry_runs = []  # min-heap of (monotonic time to retry at, run id, variation)
+        self.slot_gaps = []  # monotonic times until which the slot of a finished run is not reused, see __finish_run
+        self.cool_down_due = False
+        self.coordinator_done = False
+        self.__enter_overhead_phase('', RunnerOverhead.ACTIVE_RUNS)
+        try:
+            while True:
+                while self.retry_runs and self.retry_runs[0][0] <= time.monotonic():
+                    todo_runs.appendleft(heapq.heappop(self.retry_runs)[2])
 
-            run_controller = RunController(variation, self.config, (self.run_table.index(variation) + 1), len(self.run_table))
-            perform_run = multiprocessing.Process(
-                target=run_controller.do_run,
-                args=[]
-            )
-            perform_run.start()
-            perform_run.join()
+                while len(active_runs) < self.config.max_parallel_runs and (todo_runs or self.__fetch_run(todo_runs)):
+                    if len(active_runs) + len(self.__waiting_slots()) >= self.config.max_parallel_runs:
+                        break
+                    variation = todo_runs.popleft()
+                    if self.__has_enough_repetitions(variation):
+                        self.__skip_run(variation)
+                        continue
+                    if self.cool_down_due:
+                        self.config.cooldown_policy.cool_down()
+                        self.cool_down_due = False
+                    slot, cpus = self.cpu_slot_scheduler.acquire() if self.cpu_slot_scheduler else (None, None)
+                    started = self.__start_run(variation, cpus)
+                    if started is None:  # before_run failed
+                        if slot is not None:
+                            self.cpu_slot_scheduler.release(slot)
+                        continue
+                    perform_run, result_conn = started
+                    active_runs[result_conn] = (perform_run, variation, slot)
+                if not active_runs and not self.retry_runs and not todo_runs:
+                    break
 
-            time_btwn_runs = self.config.time_between_runs_in_ms
-            if time_btwn_runs > 0:
-                output.console_log_bold(f"Run fully ended, waiting for: {time_btwn_runs}ms == {time_btwn_runs / 1000}s")
-                time.sleep(time_btwn_runs / 1000)
+                # Workers send their updated row, or the error that failed the run.
+                # With phase timeouts, they first report each phase they enter.
+                timeouts = [timeout for timeout in (self.watchdog.time_until_deadline(), self.__time_until_retry(),
+                                                    self.__time_until_next_start() if todo_runs else None)
+                            if timeout is not None]
+                for result_conn in wait(list(active_runs.keys()), min(timeouts, default=None)):
+                    try:
+                        result = result_conn.recv()
+                    except EOFError:
+                        result = None
+                    if isinstance(result, RunnerEvents):
+                        self.watchdog.enter_phase(result_conn, result)
+                        continue
+                    self.__finish_run(result_conn, *active_runs.pop(result_conn), result=result)
 
-            if self.config.operation_type is OperationType.SEMI:
-                EventSubscriptionController.raise_event(RunnerEvents.CONTINUE)
+                for result_conn, phase in self.watchdog.expired():
+                    perform_run, variation, slot = active_runs.pop(result_conn)
+                    output.console_log_FAIL(f"Run {variation['__run_id']} exceeded the "
+                                            f"{self.config.phase_timeouts_in_ms[phase]}ms timeout of {phase.name}, killing it")
+                    RunWatchdog.kill(perform_run)
+                    self.__finish_run(result_conn, perform_run, variation, slot, timed_out_phase=phase)
+        finally:
+            # Do not leave runs behind when the experiment is interrupted, they are in their own process groups
+            for perform_run, _, _ in active_runs.values():
+                RunWatchdog.kill(perform_run)
+        if self.controller_overhead is not None:
+            self.controller_overhead.stop()
+            self.controller_overhead.flush()
 
         output.console_log_OK("Experiment completed...")
+        if self.coordinator is None:
+            self.__store_run_table()
 
         # -- After experiment
         output.console_log_WARNING("Calling after_experiment config hook")
+        EventTimingRecorder.current_run_id = ''
         EventSubscriptionController.raise_event(RunnerEvents.AFTER_EXPERIMENT)
+        EventTimingRecorder.flush()
+        self.__report_event_timings()
+
+    def __report_event_timings(self):
+        summary = EventTimingRecorder.summary(self.config.experiment_path / EventTimingRecorder.FILE_NAME)
+        output.console_log_bold(f"Time spent per event (all timings in {EventTimingRecorder.FILE_NAME}):")
+        print(tabulate(summary, headers='keys', tablefmt='rst'))
+
+    def coordinate(self, address: str):
+        """Hand out the runs to the workers that connect to `address`, and store the rows they send back.
+        The workers call all the hooks of the experiment, the coordinator only owns the run table."""
+        listener = CoordinatorListener(address, self.metadata.md5sum)
+        output.console_log_OK(f"Coordinating the experiment at {address}, waiting for workers...")
+
+        todo_runs = deque()  # runs of lost workers, handed out before the ones still pending in the run table
+        assigned_runs = dict()  # run id -> (connection of the worker it was handed to, variation)
+        # Idle workers are not told the experiment is done while other workers still have runs: if one of those
+        # is lost, its runs are handed to the waiting workers. Once all runs are stored, they see the end.
+        waiting_workers = []
+        workers = []
+        try:
+            while todo_runs or assigned_runs or self.__fetch_run(todo_runs):
+                for worker in wait(workers + [listener.wakeup]):
+                    if worker is listener.wakeup:
+                        workers.extend(listener.new_workers())
+                        output.console_log_OK(f"{len(workers)} worker(s) connected")
+                        continue
+
+                    try:
+                        message = worker.recv()
+                    except EOFError:
+                        workers.remove(worker)
+                        if worker in waiting_workers:
+                            waiting_workers.remove(worker)
+                        worker.close()
+                        self.__reassign_runs(worker, assigned_runs, todo_runs)
+                        while waiting_workers and todo_runs:
+                            waiting_worker = waiting_workers.pop(0)
+                            self.__answer_next_run(waiting_worker, assigned_runs, todo_runs, waiting_workers)
+                        continue
+                    if message == NEXT_RUN:
+                        self.__answer_next_run(worker, assigned_runs, todo_runs, waiting_workers)
+                    else:
+                        _, updated_row = message
+                        self.__store_row(updated_row, assigned_runs)
+        finally:
+            listener.close()
+            for worker in workers:
+                worker.close()  # idle workers see this as the end of the experiment
+
+        output.console_log_OK("Experiment completed...")
+        self.__store_run_table()
+
+    def __answer_next_run(self, worker: Connection, assigned_runs: Dict[str, Tuple[Connection, Dict]], todo_runs: deque,
+                          waiting_workers: List[Connection]):
+        run = self.__assign_run(worker, assigned_runs, todo_runs)
+        if run is None and assigned_runs:
+            waiting_workers.append(worker)  # answered once a lost worker's run is handed back, or the experiment is done
+        else:
+            worker.send(run)
+
+    def __assign_run(self, worker: Connection, assigned_runs: Dict[str, Tuple[Connection, Dict]],
+                     todo_runs: deque) -> Optional[Dict]:
+        while todo_runs or self.__fetch_run(todo_runs):
+            variation = todo_runs.popleft()
+            self.positions.pop(variation['__run_id'], None)  # the worker shows its own
+            if self.__has_enough_repetitions(variation):
+                self.__skip_run(variation)
+                continue
+            assigned_runs[variation['__run_id']] = (worker, variation)
+            # Only the run id, the worker generates the treatment levels as python objects itself
+            return {'__run_id': variation['__run_id'], '__attempts': int(variation['__attempts'])}
+        return None
+
+    def __reassign_runs(self, worker: Connection, assigned_runs: Dict[str, Tuple[Connection, Dict]], todo_runs: deque):
+        for run_id in [run_id for run_id, (assignee, _) in assigned_runs.items() if assignee is worker]:
+            _, variation = assigned_runs.pop(run_id)
+            variation['__done'] = RunProgress.TODO
+            self.data_manager.update_row_data({'__run_id': run_id, '__done': RunProgress.TODO})
+            todo_runs.appendleft(variation)
+            output.console_log_FAIL(f"Lost the worker of run {run_id}, it is handed to the next worker")
+
+    def __store_row(self, updated_row: Dict, assigned_runs: Dict[str, Tuple[Connection, Dict]]):
+        _, variation = assigned_runs[updated_row['__run_id']]  # workers only update the runs handed to them
+        variation.update(updated_row)
+        self.data_manager.update_row_data(updated_row)
+        if variation['__done'] not in (RunProgress.TODO, RunProgress.RUNNING):
+            del assigned_runs[variation['__run_id']]
+            self.__update_repetitions(variation)
+
+    def __fetch_run(self, todo_runs: deque) -> bool:
+        """Get the next run that is still to be done, from the run table or, if this is a worker of a distributed
+        experiment, from the coordinator."""
+        if self.coordinator is None:
+            position, variation = next(self.pending_runs, (None, None))
+            if variation is None:
+                return False
+        else:
+            if self.coordinator_done:
+                return False
+            run = self.coordinator.next_run()
+            if run is None:
+                self.coordinator_done = True
+                return False
+            position, variation = self.__worker_variation(run['__run_id'])
+            variation['__attempts'] = run['__attempts']
+        self.positions[variation['__run_id']] = position
+        todo_runs.append(variation)
+        return True
+
+    def __store_run_table(self):
+        self.data_manager.flush()
+        if self.config.columnar_output:
+            from ProgressManager.Output.ParquetOutputManager import ParquetOutputManager  # pyarrow is optional
+            ParquetOutputManager(self.config.experiment_path).write_run_table(self.data_manager.read_run_table())
+
+    def __start_run(self, variation: Dict, cpus: Optional[FrozenSet[int]]) -> Optional[Tuple[multiprocessing.Process, Connection]]:
+        variation['__attempts'] = int(variation['__attempts']) + 1
+        variation['__error'] = ''
+        variation['__done'] = RunProgress.RUNNING
+        self.data_manager.update_row_data({key: variation[key] for key in ('__run_id', '__done', '__attempts', '__error')})
+
+        self.__enter_overhead_phase(variation['__run_id'], RunnerEvents.BEFORE_RUN.name)
+        EventTimingRecorder.current_run_id = variation['__run_id']
+        try:
+            output.console_log_WARNING("Calling before_run config hook")
+            EventSubscriptionController.raise_event(RunnerEvents.BEFORE_RUN)
+
+            if self.config.noise_gate is not None:
+                variation[NoiseGate.SUSPECT_COLUMN] = '; '.join(self.config.noise_gate.wait_until_quiet())
+        except Exception as e:
+            traceback.print_exc()
+            self.__fail_run(variation, RunProgress.FAILED, ExperimentController.__describe(e))
+            if variation['__done'] != RunProgress.TODO:
+                del self.positions[variation['__run_id']]
+            self.__enter_overhead_phase('', RunnerOverhead.ACTIVE_RUNS, flush=True)
+            return None
+
+        EventTimingRecorder.flush()  # so that the run does not inherit, and write again, the timings so far
+        run_controller = RunController(variation, self.config, self.positions[variation['__run_id']] + 1, self.nr_runs, cpus)
+        result_recv, result_send = multiprocessing.Pipe(duplex=False)
+        perform_run = multiprocessing.Process(
+            target=ExperimentController.__perform_run,
+            args=[run_controller, result_send, cpus, bool(self.config.phase_timeouts_in_ms)]
+        )
+        perform_run.start()
+        result_send.close()  # only the worker writes, so a crashed worker shows up as EOF
+        self.__enter_overhead_phase('', RunnerOverhead.ACTIVE_RUNS)
+        return perform_run, result_recv
+
+    @staticmethod
+    def __perform_run(run_controller: RunController, result_conn: Connection, cpus: Optional[FrozenSet[int]],
+                      watched: bool):
+        if cpus is not None:
+            CPUSlotScheduler.pin(cpus)  # before any hook runs, so everything the run starts inherits it
+        if watched:
+            RunWatchdog.isolate()
+            run_controller.phase_listener = result_conn.send
+        if run_controller.config.measure_runner_overhead:
+            run_controller.overhead = RunnerOverhead(run_controller.config.experiment_path,
+                                                     run_controller.variation['__run_id'], RunnerOverhead.RUN)
+        output.open_run_log()
+        try:
+            result = run_controller.do_run()
+        except Exception as e:  # fails this run only, the experiment goes on
+            traceback.print_exc()
+            result = ExperimentController.__describe(e)
+        output.write_run_log(run_controller.run_dir)  # before the result, so the run is complete once it is stored
+        if run_controller.overhead is not None:
+            run_controller.overhead.flush()
+        result_conn.send(result)
+        result_conn.close()
+        EventTimingRecorder.flush()
+
+    def __enter_overhead_phase(self, run_id: str, phase: str, flush: bool = False):
+        # Stored with the run it is spent on, or without a run id while waiting for (and handling) all active runs
+        if self.controller_overhead is None:
+            return
+        self.controller_overhead.stop()
+        if flush:  # once a run is settled, like the rows of the run's own process
+            self.controller_overhead.flush()
+        self.controller_overhead.run_id = run_id
+        self.controller_overhead.enter(phase)
+
+    @staticmethod
+    def __describe(error: Exception) -> str:
+        return f"{type(error).__name__}: {error}"
+
+    def __finish_run(self, result_conn: Connection, perform_run: multiprocessing.Process, variation: Dict,
+                     slot: Optional[int], result: Union[Dict, str, None] = None,
+                     timed_out_phase: Optional[RunnerEvents] = None):
+        self.__enter_overhead_phase(variation['__run_id'], 'FINISH_RUN')
+        self.watchdog.forget(result_conn)
+        result_conn.close()
+        perform_run.join()
+        if slot is not None:
+            self.cpu_slot_scheduler.release(slot)
+
+        if timed_out_phase is not None:
+            self.__fail_run(variation, RunProgress.TIMEOUT, f"Exceeded the {self.config.phase_timeouts_in_ms[timed_out_phase]}ms "
+                                                            f"timeout of {timed_out_phase.name}")
+        elif isinstance(result, dict):
+            variation.update(result)
+            self.data_manager.update_row_data(result)
+        else:
+            self.__fail_run(variation, RunProgress.FAILED,
+                            result if result is not None else f"Worker process exited with code {perform_run.exitcode}")
+        if variation['__done'] != RunProgress.TODO:  # not retried
+            del self.positions[variation['__run_id']]
+        self.__update_repetitions(variation)
+        self.__enter_overhead_phase('', RunnerOverhead.ACTIVE_RUNS, flush=True)
+
+        # Not waited for here, as that would also hold up the results of the other active runs:
+        # the slot of this run is only reused once the time has passed, or the machine has cooled down.
+        time_btwn_runs = self.config.time_between_runs_in_ms
+        if self.config.cooldown_policy is not None:
+            self.cool_down_due = True
+        elif time_btwn_runs > 0:
+            output.console_log_bold(f"Run fully ended, waiting for: {time_btwn_runs}ms == {time_btwn_runs / 1000}s")
+            self.slot_gaps.append(time.monotonic() + time_btwn_runs / 1000)
+
+        if self.config.operation_type is OperationType.SEMI:
+            EventTimingRecorder.current_run_id = variation['__run_id']
+            EventSubscriptionController.raise_event(RunnerEvents.CONTINUE)
+
+    def __update_repetitions(self, variation: Dict):
+        # Once all repetitions of the treatment are done or skipped, so each row is written once
+        if self.adaptive_repetitions is None or variation['__done'] in (RunProgress.TODO, RunProgress.RUNNING):
+            return
+        rows = self.treatments[self.__treatment_of(variation)]
+        if all(row['__done'] not in (RunProgress.TODO, RunProgress.RUNNING) for row in rows):
+            self.__record_repetitions(rows)
+
+    def __fail_run(self, variation: Dict, progress: RunProgress, error: str):
+        attempts = variation['__attempts']
+        retry_policy = self.config.retry_policy
+        retry = retry_policy is not None and retry_policy.should_retry(progress, attempts)
+
+        variation['__error'] = error
+        variation['__done'] = RunProgress.TODO if retry else progress
+        self.data_manager.update_row_data({key: variation[key] for key in ('__run_id', '__done', '__error')})
+        if retry:
+            backoff = retry_policy.backoff(attempts)
+            output.console_log_FAIL(f"Run {variation['__run_id']} {progress.name} on attempt {attempts} ({error}), "
+                                    f"retrying in {backoff:.1f}s")
+            heapq.heappush(self.retry_runs, (time.monotonic() + backoff, variation['__run_id'], variation))
+        else:
+            output.console_log_FAIL(f"Run {variation['__run_id']} {progress.name} after {attempts} attempt(s): {error}")
+
+    def __time_until_retry(self) -> Optional[float]:
+        if not self.retry_runs:
+            return None
+        return max(0.0, self.retry_runs[0][0] - time.monotonic())
+
+    def __waiting_slots(self) -> List[float]:
+        now = time.monotonic()
+        self.slot_gaps = [gap_end for gap_end in self.slot_gaps if gap_end > now]
+        return self.slot_gaps
+
+    def __time_until_next_start(self) -> Optional[float]:
+        waiting_slots = self.__waiting_slots()
+        return min(waiting_slots) - time.monotonic() if waiting_slots else None
+
+    def __treatment_of(self, variation: Dict) -> Tuple:
+        # str(), as the treatment levels of a resumed run table are only stored as their str() representation
+        return tuple(str(variation[factor.factor_name]) for factor in self.config.run_table_model.get_factors())
+
+    def __target_values(self, rows: List[Dict]) -> List[float]:
+        values = []
+        for row in rows:
+            if row['__done'] == RunProgress.DONE:
+                try:
+                    values.append(float(row[self.adaptive_repetitions.target_metric]))
+                except (TypeError, ValueError):
+                    output.console_log_WARNING(f"Run {row['__run_id']} has no numeric "
+                                               f"{self.adaptive_repetitions.target_metric}, it is ignored for adaptive repetitions")
+        return values
+
+    def __has_enough_repetitions(self, variation: Dict) -> bool:
+        if self.adaptive_repetitions is None:
+            return False
+        rows = self.treatments[self.__treatment_of(variation)]
+        return any(row['__done'] == RunProgress.SKIPPED for row in rows) or \
+            self.adaptive_repetitions.is_satisfied(self.__target_values(rows))
+
+    def __record_repetitions(self, rows: List[Dict]):
+        repetitions = sum(row['__done'] == RunProgress.DONE for row in rows)
+        for row in rows:
+            row['__repetitions'] = repetitions
+            self.data_manager.update_row_data({'__run_id': row['__run_id'], '__repetitions': repetitions})
+
+    def __skip_run(self, variation: Dict):
+        output.console_log_OK(f"Run {variation['__run_id']} is {RunProgress.SKIPPED.name}, its treatment has "
+                              f"reached the target confidence interval for {self.adaptive_repetitions.target_metric}")
+        variation['__done'] = RunProgress.SKIPPED
+        self.positions.pop(variation['__run_id'], None)
+        self.data_manager.update_row_data({'__run_id': variation['__run_id'], '__done': RunProgress.SKIPPED})
+        self.__update_repetitions(variation)
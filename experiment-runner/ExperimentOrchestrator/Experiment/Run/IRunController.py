@@ -1,12 +1,13 @@
-from typing import Dict
+from typing import Callable, Dict, FrozenSet, Optional
 
-from ProgressManager.Output.CSVOutputManager import CSVOutputManager
 from pathlib import Path
 from abc import ABC, abstractmethod
-from multiprocessing import Event
 
 from ConfigValidator.Config.RunnerConfig import RunnerConfig
 from ConfigValidator.Config.Models.RunnerContext import RunnerContext
+from EventManager.Models.RunnerEvents import RunnerEvents
+from ExperimentOrchestrator.Experiment.CPUSlotScheduler import CPUSlotScheduler
+from ExperimentOrchestrator.Experiment.RunnerOverhead import RunnerOverhead
 
 class IRunController(ABC):
     run_dir: Path = None
@@ -14,22 +15,23 @@ class IRunController(ABC):
     variation: Dict = None
     config: RunnerConfig = None
     run_context: RunnerContext = None
-    data_manager: CSVOutputManager = None
+    phase_listener: Optional[Callable[[RunnerEvents], None]] = None  # called right before each lifecycle event of the run
+    overhead: Optional[RunnerOverhead] = None  # accounts for the resources used in each lifecycle event of the run
 
-    def __init__(self, variation: Dict, config: RunnerConfig, current_run: int, total_runs: int):
+    def __init__(self, variation: Dict, config: RunnerConfig, current_run: int, total_runs: int,
+                 cpus: Optional[FrozenSet[int]] = None):
         self.run_dir = config.experiment_path / variation['__run_id']
         self.run_dir.mkdir(parents=True, exist_ok=True)
 
         self.variation = variation
         self.config = config
         self.current_run = current_run
-        self.run_context = RunnerContext(self.variation, self.current_run, self.run_dir)
-        self.data_manager = CSVOutputManager(self.config.experiment_path)
-
-        self.run_completed_event = Event()
+        self.run_context = RunnerContext(self.variation, self.current_run, self.run_dir,
+                                         cpus if cpus is not None else CPUSlotScheduler.available_cpus())
 
         print(f"\n-----------------NEW RUN [{current_run} / {total_runs}]-----------------\n")
 
     @abstractmethod
-    def do_run(self):
+    def do_run(self) -> Dict:
+        """Perform the run and return its updated row for the run table."""
         pass
@@ -1,37 +1,96 @@
+import asyncio
+from typing import Any, Dict, Generator
+
 from ProgressManager.RunTable.Models.RunProgress import RunProgress
+from ConfigValidator.Config.Models.MeasurementOutput import MeasurementOutput
 from EventManager.Models.RunnerEvents import RunnerEvents
 from EventManager.EventSubscriptionController import EventSubscriptionController
-from ExperimentOrchestrator.Architecture.Processify import processify
 from ExperimentOrchestrator.Experiment.Run.IRunController import IRunController
 from ProgressManager.Output.OutputProcedure import OutputProcedure as output
 
 class RunController(IRunController):
-    @processify
+    # The lifecycle events raised within the run's worker process, in order
+    PHASES = [
+        RunnerEvents.START_RUN,
+        RunnerEvents.START_MEASUREMENT,
+        RunnerEvents.INTERACT,
+        RunnerEvents.STOP_MEASUREMENT,
+        RunnerEvents.STOP_RUN,
+        RunnerEvents.POPULATE_RUN_DATA,
+    ]
+
+    def __enter_phase(self, phase: RunnerEvents):
+        if self.overhead is not None:
+            self.overhead.enter(phase.name)
+        if self.phase_listener is not None:
+            self.phase_listener(phase)
+
     def do_run(self):
+        """Perform the lifecycle of the run. If any of its hooks is `async def`, all of them are called on one event
+        loop, so that tasks, subprocesses and connections started in one hook can be awaited in the next."""
+        if any(EventSubscriptionController.is_async(phase) for phase in RunController.PHASES):
+            return asyncio.run(self.__do_run_async())
+
+        lifecycle = self.__lifecycle()
+        phase = next(lifecycle)
+        while True:
+            self.__enter_phase(phase)
+            try:
+                result = EventSubscriptionController.raise_event(phase, self.run_context)
+            except Exception as e:
+                phase = lifecycle.throw(e)  # raises it again, after the lifecycle cleaned up
+                continue
+            try:
+                phase = lifecycle.send(result)
+            except StopIteration as done:
+                return done.value
+
+    async def __do_run_async(self):
+        lifecycle = self.__lifecycle()
+        phase = next(lifecycle)
+        while True:
+            self.__enter_phase(phase)
+            try:
+                result = await EventSubscriptionController.raise_event_async(phase, self.run_context)
+            except Exception as e:
+                phase = lifecycle.throw(e)
+                continue
+            try:
+                phase = lifecycle.send(result)
+            except StopIteration as done:
+                return done.value
+
+    def __lifecycle(self) -> Generator[RunnerEvents, Any, Dict]:
+        """Yields each phase of the run, and gets back the result of its event."""
         # -- Start run
         output.console_log_WARNING("Calling start_run config hook")
-        EventSubscriptionController.raise_event(RunnerEvents.START_RUN, self.run_context)
+        yield RunnerEvents.START_RUN
 
         # -- Start measurement
         output.console_log_WARNING("... Starting measurement ...")
-        EventSubscriptionController.raise_event(RunnerEvents.START_MEASUREMENT, self.run_context)
+        if self.config.measurement_output is not MeasurementOutput.PRINT:
+            output.hold(drop=self.config.measurement_output is MeasurementOutput.DROP)
+        try:
+            yield RunnerEvents.START_MEASUREMENT
 
-        # -- Start interaction
-        output.console_log_WARNING("Calling interaction config hook")
-        EventSubscriptionController.raise_event(RunnerEvents.INTERACT, self.run_context)
-        output.console_log_OK("... Run completed ...")
+            # -- Start interaction
+            output.console_log_WARNING("Calling interaction config hook")
+            yield RunnerEvents.INTERACT
+            output.console_log_OK("... Run completed ...")
 
-        # -- Stop measurement
-        output.console_log_WARNING("... Stopping measurement ...")
-        EventSubscriptionController.raise_event(RunnerEvents.STOP_MEASUREMENT, self.run_context)
+            # -- Stop measurement
+            output.console_log_WARNING("... Stopping measurement ...")
+            yield RunnerEvents.STOP_MEASUREMENT
+        finally:
+            output.release()
 
         # -- Stop run
         output.console_log_WARNING("Calling stop_run config hook")
-        EventSubscriptionController.raise_event(RunnerEvents.STOP_RUN, self.run_context)
+        yield RunnerEvents.STOP_RUN
 
         # -- Collect data from measurements
         output.console_log_WARNING("Calling populate_run_data config hook")
-        user_run_data = EventSubscriptionController.raise_event(RunnerEvents.POPULATE_RUN_DATA, self.run_context)
+        user_run_data = yield RunnerEvents.POPULATE_RUN_DATA
 
         if user_run_data:
             # TODO: check if data columns exist and if yes, if they match
@@ -41,4 +100,4 @@ class RunController(IRunController):
             updated_run_data = self.run_context.run_variation
 
         updated_run_data['__done'] = RunProgress.DONE
-        self.data_manager.update_row_data(updated_run_data)
+        return updated_run_data
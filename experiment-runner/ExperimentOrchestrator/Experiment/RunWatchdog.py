@@ -0,0 +1,65 @@
+import os
+import signal
+import time
+import multiprocessing
+from typing import Dict, Hashable, List, Optional, Tuple
+
+from EventManager.Models.RunnerEvents import RunnerEvents
+
+
+###     =========================================================
+###     |                                                       |
+###     |                      RunWatchdog                      |
+###     |       - Track the lifecycle phase each active run     |
+###     |         is in, as reported by its worker process      |
+###     |       - Give each phase its own deadline              |
+###     |       - Kill the process group of a run that          |
+###     |         overran its deadline                          |
+###     |                                                       |
+###     =========================================================
+class RunWatchdog:
+
+    def __init__(self, phase_timeouts_in_ms: Dict[RunnerEvents, int]):
+        self.phase_timeouts_in_ms = phase_timeouts_in_ms
+        self.__phases: Dict[Hashable, Tuple[RunnerEvents, Optional[float]]] = dict()  # run -> (phase, deadline)
+
+    def enter_phase(self, run: Hashable, phase: RunnerEvents):
+        timeout_in_ms = self.phase_timeouts_in_ms.get(phase)
+        deadline = time.monotonic() + timeout_in_ms / 1000 if timeout_in_ms is not None else None
+        self.__phases[run] = (phase, deadline)
+
+    def phase(self, run: Hashable) -> Optional[RunnerEvents]:
+        phase, _ = self.__phases.get(run, (None, None))
+        return phase
+
+    def forget(self, run: Hashable):
+        self.__phases.pop(run, None)
+
+    def time_until_deadline(self) -> Optional[float]:
+        """Seconds until the nearest deadline of all runs, or None if no run is in a phase with a timeout."""
+        deadlines = [deadline for _, deadline in self.__phases.values() if deadline is not None]
+        if not deadlines:
+            return None
+        return max(0.0, min(deadlines) - time.monotonic())
+
+    def expired(self) -> List[Tuple[Hashable, RunnerEvents]]:
+        """The runs that are still in a phase whose deadline has passed, with that phase."""
+        now = time.monotonic()
+        return [(run, phase) for run, (phase, deadline) in self.__phases.items()
+                if deadline is not None and now >= deadline]
+
+    @staticmethod
+    def isolate():
+        """Make the calling process the leader of a new process group. Processes started afterwards
+        (the target system, profilers, ...) join it, so the whole run can be killed at once."""
+        os.setpgid(0, 0)
+
+    @staticmethod
+    def kill(process: multiprocessing.Process):
+        """Kill the process group led by `process`, and `process` itself in case it was not isolated yet."""
+        try:
+            os.killpg(process.pid, signal.SIGKILL)
+        except (ProcessLookupError, PermissionError):
+            pass
+        process.kill()
+        process.join()
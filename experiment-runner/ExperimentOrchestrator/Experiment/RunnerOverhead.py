@@ -0,0 +1,121 @@
+import os
+import re
+import csv
+import time
+from pathlib import Path
+from typing import List, NamedTuple, Optional, Tuple
+
+import psutil
+
+
+class _Snapshot(NamedTuple):
+    wall_ns:        int
+    cpu:            float   # s, all threads of this process, without its children
+    main_cpu:       float   # s, the main thread of this process
+    busy_cpu:       float   # s, all CPUs of the system
+    energy_uj:      Optional[List[int]]
+
+
+###     =========================================================
+###     |                                                       |
+###     |                     RunnerOverhead                    |
+###     |       - Account for the resources Experiment Runner   |
+###     |         itself uses in each phase of a run: CPU time, |
+###     |         RSS and (with RAPL) estimated energy          |
+###     |       - Separately for the controller process and     |
+###     |         the process the run is performed in, and the  |
+###     |         profiler threads running within them          |
+###     |       - Append them to `runner_overhead.csv`          |
+###     |                                                       |
+###     |       * Must be used from the main thread, whose CPU  |
+###     |         time is told apart from the other threads     |
+###     |                                                       |
+###     =========================================================
+class RunnerOverhead:
+    FILE_NAME       = 'runner_overhead.csv'
+    COLUMNS         = ['__run_id', 'process', 'phase', 'wall_ms', 'cpu_ms', 'profiler_cpu_ms', 'rss_mb', 'energy_j']
+    POWERCAP_PATH   = Path('class') / 'powercap'
+
+    CONTROLLER      = 'controller'
+    RUN             = 'run'
+
+    ACTIVE_RUNS     = 'ACTIVE_RUNS'  # the controller waiting for, and handling, all active runs, stored without a run id
+
+    def __init__(self, experiment_path: Path, run_id: str, process: str, sysfs_root: Path = Path('/sys')):
+        self.overhead_table = experiment_path / RunnerOverhead.FILE_NAME
+        self.run_id = run_id
+        self.process = process
+        self.rows: List[List] = []
+        self.__process = psutil.Process()
+        self.__domains = RunnerOverhead.__package_domains(sysfs_root)
+        self.__phase: Optional[Tuple[str, _Snapshot]] = None
+
+    @staticmethod
+    def create_table(experiment_path: Path):
+        overhead_table = experiment_path / RunnerOverhead.FILE_NAME
+        if not overhead_table.exists():
+            with open(overhead_table, 'w', newline='') as csvfile:
+                csv.writer(csvfile).writerow(RunnerOverhead.COLUMNS)
+
+    @staticmethod
+    def __package_domains(sysfs_root: Path) -> List[Tuple[int, int]]:
+        # The top-level RAPL domains (intel-rapl:0, intel-rapl:1, ...) are the packages, their counters are kept open
+        domains = []
+        for path in (sysfs_root / RunnerOverhead.POWERCAP_PATH).glob('*-rapl:*'):
+            if re.fullmatch(r'.+-rapl:\d+', path.name):
+                try:
+                    max_energy_range_uj = int((path / 'max_energy_range_uj').read_text())
+                    domains.append((os.open(path / 'energy_uj', os.O_RDONLY), max_energy_range_uj))
+                except (OSError, ValueError):
+                    continue  # e.g. energy_uj is only readable by root
+        return domains
+
+    def __snapshot(self) -> _Snapshot:
+        system_times = psutil.cpu_times()
+        busy_cpu = sum(system_times) - system_times.idle - getattr(system_times, 'iowait', 0)
+        energy_uj = [int(os.pread(fd, 32, 0)) for fd, _ in self.__domains] if self.__domains else None
+        return _Snapshot(time.monotonic_ns(), time.process_time(), time.thread_time(), busy_cpu, energy_uj)
+
+    def enter(self, phase: str):
+        """End the current phase, if any, and start accounting for `phase`."""
+        self.stop()
+        self.__phase = (phase, self.__snapshot())
+
+    def stop(self):
+        """End the current phase, if any."""
+        if self.__phase is None:
+            return
+        phase, start = self.__phase
+        end = self.__snapshot()
+        self.__phase = None
+
+        cpu = end.cpu - start.cpu
+        energy_j = ''
+        if start.energy_uj is not None:
+            # Attribute the package energy by the share of all CPU time this process used
+            energy_uj = sum(after - before if after >= before else after + max_energy_range_uj - before
+                            for (_, max_energy_range_uj), before, after in zip(self.__domains, start.energy_uj, end.energy_uj))
+            busy_cpu = end.busy_cpu - start.busy_cpu
+            energy_j = round(energy_uj / 1e6 * min(1.0, cpu / busy_cpu), 6) if busy_cpu > 0 else 0.0
+        self.rows.append([self.run_id, self.process, phase,
+                          round((end.wall_ns - start.wall_ns) / 1e6, 3),
+                          round(cpu * 1000, 3),
+                          round(max(0.0, cpu - (end.main_cpu - start.main_cpu)) * 1000, 3),
+                          round(self.__process.memory_info().rss / 2 ** 20, 1),
+                          energy_j])
+
+    def flush(self):
+        """Append the accounted phases to the overhead table of the experiment, in a single write."""
+        self.stop()
+        for fd, _ in self.__domains:
+            os.close(fd)
+        self.__domains = []
+        if not self.rows:
+            return
+        lines = ''.join(','.join(str(value) for value in row) + '\n' for row in self.rows)  # run ids and numbers only
+        self.rows = []
+        fd = os.open(self.overhead_table, os.O_WRONLY | os.O_APPEND)
+        try:
+            os.write(fd, lines.encode())
+        finally:
+            os.close(fd)
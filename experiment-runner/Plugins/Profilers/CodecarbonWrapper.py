@@ -1,14 +1,15 @@
 
 from enum import Enum, auto
-from pathlib import Path
-from typing import Iterable
+from typing import Dict, Iterable, Optional
 
 import codecarbon
-import csv
 import re
 
 from ConfigValidator.Config.Models.RunnerContext import RunnerContext
 from ConfigValidator.Config.RunnerConfig import RunnerConfig
+from EventManager.EventSubscriptionController import EventSubscriptionController
+from ExtendedTyping.Typing import SupportsStr
+from Plugins.Profilers.Profiler import Profiler, measurement_subscriber, no_hook
 
 class DataColumns(Enum):
     """For the description of data columns, see
@@ -28,13 +29,56 @@ class DataColumns(Enum):
     def name(self) -> str:
         return f'codecarbon__{super().name.lower()}'
 
-def emission_tracker(online=False, *decargs, **deckwargs):
+class CodecarbonProfiler(Profiler):
+    """Estimates the emissions and energy of each run with codecarbon, e.g. together with other profilers:
+    `Profiler.profilers(RAPLSampler(), CodecarbonProfiler(country_iso_code="NLD"))`.
+
+    codecarbon measures on a thread of its own, so it is not sampled by the `SamplingEngine`. The other arguments are
+    passed on to codecarbon's (Offline)EmissionsTracker, which writes its `emissions.csv` to the run's folder."""
+
+    def __init__(self, data_columns: Iterable[DataColumns] = (DataColumns.EMISSIONS,), online=False,
+                 *tracker_args, **tracker_kwargs):
+        self.data_columns = [dc.name for dc in data_columns]
+        self.online = online
+        self.tracker_args = tracker_args
+        self.tracker_kwargs = tracker_kwargs
+        self.tracker = None
+
+    def start(self, context: Optional[RunnerContext]):
+        tracker_kwargs = dict(self.tracker_kwargs)
+        if context is not None:
+            tracker_kwargs.setdefault('project_name', context.run_dir.parent.name)  # the experiment, named after the config
+            tracker_kwargs.setdefault('output_dir', str(context.run_dir.resolve()))
+        elif 'output_dir' not in tracker_kwargs:  # e.g. an idle baseline, which has no folder of its own
+            tracker_kwargs.setdefault('save_to_file', False)
+        codecarbon_cls = codecarbon.EmissionsTracker if self.online else codecarbon.OfflineEmissionsTracker
+
+        self.tracker = codecarbon_cls(*self.tracker_args, **tracker_kwargs)
+        self.tracker.start()
+
+    def stop(self, context: Optional[RunnerContext]):
+        self.tracker.stop()
+
+    def collect(self, context: Optional[RunnerContext]) -> Dict[str, SupportsStr]:
+        # All columns, whether they are in the run table is up to the caller (see `populate_data_columns`)
+        emissions_data = self.tracker.final_emissions_data
+        return {dc.name: float(getattr(emissions_data, DataColumns._PATTERN.value.match(dc.name).group(2)))
+                for dc in DataColumns if dc is not DataColumns._PATTERN}
+
+def emission_tracker(online=False, *decargs, start_group: Optional[str] = None, **deckwargs):
+    """With a `start_group`, the tracker is started together with the other subscribers of that group,
+    e.g. the profilers of `Profiler.profilers(..., start_group=...)`, instead of wrapping the config's hooks."""
     def emission_tracker_decorator(cls: RunnerConfig.__class__):
         data_columns =  deckwargs.pop('data_columns', [DataColumns.EMISSIONS])
 
         cls.create_run_table_model  = add_data_columns(data_columns)(cls.create_run_table_model)
-        cls.start_measurement       = start_emission_tracker(online=online, *decargs, **deckwargs)(cls.start_measurement)
-        cls.stop_measurement        = stop_emission_tracker(cls.stop_measurement)
+        if start_group is None:
+            cls.start_measurement   = start_emission_tracker(online=online, *decargs, **deckwargs)(cls.start_measurement)
+            cls.stop_measurement    = stop_emission_tracker(cls.stop_measurement)
+        else:
+            EventSubscriptionController.register_plugin(cls, measurement_subscriber(f'{cls.__qualname__}.codecarbon', start_group,
+                                                                                    start_emission_tracker(online=online, *decargs, **deckwargs)(no_hook),
+                                                                                    stop_emission_tracker(no_hook)))
         cls.populate_run_data       = populate_data_columns(cls.populate_run_data)
 
         return cls
@@ -42,18 +86,14 @@ def emission_tracker(online=False, *decargs, **deckwargs):
 
 def start_emission_tracker(online=False, *decargs, **deckwargs):
     def start_emission_tracker_decorator(func):
+        profiler = CodecarbonProfiler((), online, *decargs, **deckwargs)  # its data columns are added by add_data_columns
+
         def wrapper(*args, **kwargs):
             self: RunnerConfig = args[0]
             context: RunnerContext = args[1]
 
-            if 'project_name' not in deckwargs:
-                deckwargs['project_name'] = self.name
-            if 'output_dir' not in deckwargs:
-                deckwargs['output_dir'] = str(context.run_dir.resolve())
-            codecarbon_cls = codecarbon.EmissionsTracker if online else codecarbon.OfflineEmissionsTracker
-
-            self.__emission_tracker__ = codecarbon_cls(*decargs, **deckwargs)
-            self.__emission_tracker__.start()
+            self.__emission_tracker__ = profiler
+            self.__emission_tracker__.start(context)
             return func(*args, **kwargs)
         return wrapper
     return start_emission_tracker_decorator
@@ -61,9 +101,10 @@ def start_emission_tracker(online=False, *decargs, **deckwargs):
 def stop_emission_tracker(func):
     def wrapper(*args, **kwargs):
         self: RunnerConfig = args[0]
+        context: RunnerContext = args[1]
 
         ret_val = func(*args, **kwargs)
-        self.__emission_tracker__.stop()
+        self.__emission_tracker__.stop(context)
         return ret_val
     return wrapper
 
@@ -74,7 +115,8 @@ def add_data_columns(data_cols: Iterable[DataColumns]):
 
             func(*args, **kwargs)  # will set self.run_table_model
             for dc in data_cols:
-                self.run_table_model.get_data_columns().append(dc.name)
+                if dc.name not in self.run_table_model.get_data_columns():  # e.g. also listed by the config
+                    self.run_table_model.get_data_columns().append(dc.name)
             return self.run_table_model
         return wrapper
     return add_data_columns_decorator
@@ -82,18 +124,14 @@ def add_data_columns(data_cols: Iterable[DataColumns]):
 def populate_data_columns(func):
     def wrapper(*args, **kwargs):
         self: RunnerConfig = args[0]
+        context: RunnerContext = args[1]
 
         ret_val = func(*args, **kwargs)
         if ret_val is None:
             ret_val = {}
-        with open(Path(self.__emission_tracker__._output_dir) / Path(self.__emission_tracker__._output_file)) as csvfile:
-            reader = csv.DictReader(csvfile)
-            rows = [row for row in reader]
-            assert(len(rows) == 1)
-            data = rows[0]
-            for dc in self.run_table_model.get_data_columns():
-                m = DataColumns._PATTERN.value.match(dc)
-                if m:
-                    ret_val[dc] = float(data[m.group(2)])
+        data = self.__emission_tracker__.collect(context)
+        for column in self.run_table_model.get_data_columns():
+            if column in data:
+                ret_val[column] = data[column]
         return ret_val
     return wrapper
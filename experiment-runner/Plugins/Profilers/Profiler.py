@@ -0,0 +1,242 @@
+from abc import ABC, abstractmethod
+from enum import Enum
+from typing import Dict, Iterable, List, Optional, Sequence
+
+import csv
+import time
+import functools
+
+from ConfigValidator.Config.Models.RunnerContext import RunnerContext
+from ConfigValidator.Config.RunnerConfig import RunnerConfig
+from EventManager.Models.RunnerEvents import RunnerEvents
+from EventManager.EventSubscriptionController import EventSubscriptionController
+from ExtendedTyping.Typing import SupportsStr
+from ProgressManager.Output.OutputProcedure import OutputProcedure as output
+
+class BaselineCorrection(Enum):
+    """How the idle baseline is subtracted from a data column."""
+
+    CUMULATIVE = 1
+    """The value accumulates over the measurement (e.g. energy): the idle value is scaled to the run's duration."""
+
+    LEVEL = 2
+    """The value does not depend on the duration of the measurement (e.g. average power): the idle value is subtracted as is."""
+
+class IdleBaseline:
+    """Measure the idle machine with the same profilers before the experiment, and again every `every_n_runs` runs,
+    for `duration_in_ms` each time. Every measurement is appended to `idle_baseline.csv` in the experiment folder.
+    Only meaningful with `max_parallel_runs = 1`, as the machine must be idle in between runs."""
+
+    FILE_NAME = 'idle_baseline.csv'
+
+    def __init__(self, duration_in_ms: int = 10000, every_n_runs: Optional[int] = None):
+        self.duration_in_ms = duration_in_ms
+        self.every_n_runs = every_n_runs
+
+class Profiler(ABC):
+    """A measurement that is started and stopped around each run and contributes data columns.
+
+    Profilers are not bound to the runner's events one by one: the `profilers` decorator drives all profilers
+    of a config through one shared `SamplingEngine`, around the START_MEASUREMENT, STOP_MEASUREMENT and
+    POPULATE_RUN_DATA hooks."""
+
+    data_columns: List[str] = []
+
+    # The data columns that get a baseline-corrected `<column>_corrected` next to them when an `IdleBaseline` is used
+    baseline_corrections: Dict[str, BaselineCorrection] = {}
+
+    def start(self, context: Optional[RunnerContext]):
+        """Prepare a new measurement. Called before sampling starts."""
+        pass
+
+    def stop(self, context: Optional[RunnerContext]):
+        """Finish the measurement. Called after the last sample was taken."""
+        pass
+
+    @abstractmethod
+    def collect(self, context: Optional[RunnerContext]) -> Dict[str, SupportsStr]:
+        """Return the values of the data columns for the run that was just measured."""
+        pass
+
+class SampledProfiler(Profiler):
+    """A profiler that is read periodically by the `SamplingEngine`.
+
+    At every tick, `read()` is called for all sampled profilers right after each other, and the
+    values are stored under the same timestamp. Once stopped, the samples are available as
+    `timestamps` (seconds, `time.monotonic()`) and `samples` (one row per timestamp, one column per channel)."""
+
+    timestamps: Sequence[float] = None
+    samples: Sequence[Sequence[float]] = None
+
+    @property
+    @abstractmethod
+    def channels(self) -> List[str]:
+        """The names of the values returned by `read()`. Only needs to be known after `start()`."""
+        pass
+
+    @abstractmethod
+    def read(self) -> Sequence[float]:
+        """Return the current value of each channel. Runs on the sampling thread, so keep it short."""
+        pass
+
+def profilers(*profiler_list: Profiler, frequency: int = 100, idle_baseline: Optional[IdleBaseline] = None,
+              start_group: Optional[str] = None):
+    """Class decorator that adds the data columns of `profiler_list` to a RunnerConfig and measures every run with them.
+    With an `idle_baseline`, baseline-corrected columns are added next to the raw ones.
+    With a `start_group`, the profilers are started and stopped by their own subscribers of the measurement events,
+    together with all other subscribers of that group (see `EventSubscriptionController`)."""
+    def profilers_decorator(cls: RunnerConfig.__class__):
+        cls.create_run_table_model  = add_data_columns(profiler_list, idle_baseline is not None)(cls.create_run_table_model)
+        if start_group is None:
+            cls.start_measurement   = start_profilers(*profiler_list, frequency=frequency)(cls.start_measurement)
+            cls.stop_measurement    = stop_profilers(cls.stop_measurement)
+        else:
+            EventSubscriptionController.register_plugin(cls, measurement_subscriber(f'{cls.__qualname__}.profilers', start_group,
+                                                                                    start_profilers(*profiler_list, frequency=frequency)(no_hook),
+                                                                                    stop_profilers(no_hook)))
+        cls.populate_run_data       = populate_data_columns(cls.populate_run_data)
+        if idle_baseline is not None:
+            cls.before_experiment   = measure_idle_baseline(*profiler_list, frequency=frequency, idle_baseline=idle_baseline)(cls.before_experiment)
+            cls.before_run          = remeasure_idle_baseline(cls.before_run)
+
+        return cls
+    return profilers_decorator
+
+def measure_idle_baseline(*profiler_list: Profiler, frequency: int = 100, idle_baseline: IdleBaseline = None):
+    def measure_idle_baseline_decorator(func):
+        def wrapper(*args, **kwargs):
+            self: RunnerConfig = args[0]
+
+            if getattr(self, 'max_parallel_runs', 1) > 1:
+                output.console_log_WARNING("The idle baseline is measured while other runs are active (max_parallel_runs > 1)")
+            from Plugins.Profilers.SamplingEngine import SamplingEngine  # which depends on this module
+
+            self.__idle_baseline__ = idle_baseline
+            self.__idle_baseline_engine__ = SamplingEngine(profiler_list, frequency)
+            self.__nr_runs_since_idle_baseline__ = 0
+            ret_val = func(*args, **kwargs)
+            take_idle_baseline(self)  # after the hook, so the machine is set up like it is for the runs
+            return ret_val
+        return wrapper
+    return measure_idle_baseline_decorator
+
+def remeasure_idle_baseline(func):
+    def wrapper(*args, **kwargs):
+        self: RunnerConfig = args[0]
+
+        # Runs are forked after BEFORE_RUN, so each run sees the baseline that was most recently measured
+        every_n_runs = self.__idle_baseline__.every_n_runs
+        if every_n_runs and self.__nr_runs_since_idle_baseline__ >= every_n_runs:
+            take_idle_baseline(self)
+            self.__nr_runs_since_idle_baseline__ = 0
+        self.__nr_runs_since_idle_baseline__ += 1
+        return func(*args, **kwargs)
+    return wrapper
+
+def take_idle_baseline(self: RunnerConfig):
+    engine = self.__idle_baseline_engine__
+    output.console_log_bold(f"Measuring the idle baseline for {self.__idle_baseline__.duration_in_ms}ms...")
+    engine.start()
+    time.sleep(self.__idle_baseline__.duration_in_ms / 1000)
+    engine.stop()
+    self.__idle_baseline_data__ = engine.collect()
+    self.__idle_baseline_duration__ = engine.duration
+
+    experiment_path = getattr(self, 'experiment_path', None)
+    if experiment_path is not None:
+        baseline_file = experiment_path / IdleBaseline.FILE_NAME
+        columns = ['timestamp', 'duration'] + list(self.__idle_baseline_data__.keys())
+        is_new = not baseline_file.exists()
+        with open(baseline_file, 'a', newline='') as csvfile:
+            writer = csv.DictWriter(csvfile, fieldnames=columns)
+            if is_new:
+                writer.writeheader()
+            writer.writerow({'timestamp': time.time(), 'duration': round(engine.duration, 6), **self.__idle_baseline_data__})
+
+def no_hook(*args, **kwargs):
+    pass
+
+def measurement_subscriber(name: str, start_group: str, start, stop):
+    """A plugin (see `EventSubscriptionController.register_plugin`) that subscribes `start` right before, and `stop`
+    right after, the config's own START_MEASUREMENT and STOP_MEASUREMENT hooks, in `start_group`.
+    They are called with the config, like the hooks they would otherwise wrap."""
+    def subscribe(self: RunnerConfig):
+        EventSubscriptionController.subscribe_to_single_event(RunnerEvents.START_MEASUREMENT, functools.partial(start, self),
+                                                              order=-1, name=name, group=start_group)
+        EventSubscriptionController.subscribe_to_single_event(RunnerEvents.STOP_MEASUREMENT, functools.partial(stop, self),
+                                                              order=1, name=name, group=start_group)
+    return subscribe
+
+def corrected_column(column: str) -> str:
+    return f'{column}_corrected'
+
+def start_profilers(*profiler_list: Profiler, frequency: int = 100):
+    def start_profilers_decorator(func):
+        def wrapper(*args, **kwargs):
+            self: RunnerConfig = args[0]
+            context: RunnerContext = args[1]
+            from Plugins.Profilers.SamplingEngine import SamplingEngine  # which depends on this module
+
+            self.__sampling_engine__ = SamplingEngine(profiler_list, frequency)
+            self.__sampling_engine__.start(context)
+            return func(*args, **kwargs)
+        return wrapper
+    return start_profilers_decorator
+
+def stop_profilers(func):
+    def wrapper(*args, **kwargs):
+        self: RunnerConfig = args[0]
+        context: RunnerContext = args[1]
+
+        ret_val = func(*args, **kwargs)
+        self.__sampling_engine__.stop(context)
+        return ret_val
+    return wrapper
+
+def add_data_columns(profiler_list: Iterable[Profiler], corrected: bool = False):
+    def add_data_columns_decorator(func):
+        def wrapper(*args, **kwargs):
+            self: RunnerConfig = args[0]
+
+            func(*args, **kwargs)  # will set self.run_table_model
+            data_columns = self.run_table_model.get_data_columns()
+            for profiler in profiler_list:
+                for column in profiler.data_columns:
+                    columns = [column]
+                    if corrected and column in profiler.baseline_corrections:
+                        columns.append(corrected_column(column))
+                    for added_column in columns:
+                        if added_column not in data_columns:  # e.g. also listed by the config
+                            data_columns.append(added_column)
+            return self.run_table_model
+        return wrapper
+    return add_data_columns_decorator
+
+def populate_data_columns(func):
+    def wrapper(*args, **kwargs):
+        self: RunnerConfig = args[0]
+        context: RunnerContext = args[1]
+
+        ret_val = func(*args, **kwargs)
+        if ret_val is None:
+            ret_val = {}
+        engine = self.__sampling_engine__
+        data_columns = self.run_table_model.get_data_columns()
+        data = engine.collect(context)
+        for column, value in data.items():
+            if column in data_columns:
+                ret_val[column] = value
+
+        idle_data = getattr(self, '__idle_baseline_data__', None)
+        if idle_data is not None:
+            idle_duration = self.__idle_baseline_duration__
+            for profiler in engine.profilers:
+                for column, correction in profiler.baseline_corrections.items():
+                    if corrected_column(column) not in data_columns or column not in data or column not in idle_data:
+                        continue
+                    idle_value = idle_data[column]
+                    if correction is BaselineCorrection.CUMULATIVE:
+                        idle_value = idle_value * engine.duration / idle_duration if idle_duration > 0 else 0
+                    ret_val[corrected_column(column)] = round(data[column] - idle_value, 3)
+        return ret_val
+    return wrapper
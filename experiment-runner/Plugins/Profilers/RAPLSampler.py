@@ -0,0 +1,139 @@
+from enum import Enum, auto
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional
+
+import csv
+import os
+import re
+
+import numpy as np
+
+from ConfigValidator.Config.Models.RunnerContext import RunnerContext
+from ConfigValidator.CustomErrors.BaseError import BaseError
+from ExtendedTyping.Typing import SupportsStr
+from Plugins.Profilers import Profiler
+from Plugins.Profilers.Profiler import BaselineCorrection, SampledProfiler
+
+class DataColumns(Enum):
+    """Energy (J) and average power (W) per kind of RAPL domain, summed over all sockets.
+    For the meaning of each domain, see https://www.kernel.org/doc/html/latest/power/powercap/powercap.html
+    """
+    PACKAGE_ENERGY  = auto()
+    PACKAGE_POWER   = auto()
+    CORE_ENERGY     = auto()
+    CORE_POWER      = auto()
+    UNCORE_ENERGY   = auto()
+    UNCORE_POWER    = auto()
+    DRAM_ENERGY     = auto()
+    DRAM_POWER      = auto()
+    PSYS_ENERGY     = auto()
+    PSYS_POWER      = auto()
+
+    @property
+    def name(self) -> str:
+        return f'rapl__{super().name.lower()}'
+
+class RAPLDomain:
+    """A single RAPL energy counter, e.g. `intel-rapl:0` ("package-0") or `intel-rapl:0:2` ("dram")."""
+
+    def __init__(self, path: Path):
+        self.path = path
+        self.name = (path / 'name').read_text().strip()
+        self.kind = re.sub(r'-\d+$', '', self.name)  # package-0 -> package
+        self.max_energy_range_uj = int((path / 'max_energy_range_uj').read_text())
+
+class RAPLSampler(SampledProfiler):
+    """Samples all RAPL domains together, driven by a `SamplingEngine`.
+
+    At every tick, all energy counters are read back to back, so that the samples of different
+    domains line up. Counters wrap around at `max_energy_range_uj`, which is accounted for as
+    long as a counter does not wrap twice between two samples (minutes even at full load)."""
+
+    POWERCAP_PATH   = Path('class') / 'powercap'
+
+    def __init__(self, data_columns: Iterable[DataColumns] = (DataColumns.PACKAGE_ENERGY, DataColumns.DRAM_ENERGY),
+                 sysfs_root: Path = Path('/sys'), domains: Optional[List[RAPLDomain]] = None):
+        self.data_columns = [dc.name for dc in data_columns]
+        self.baseline_corrections = {column: BaselineCorrection.CUMULATIVE if column.endswith('_energy') else BaselineCorrection.LEVEL
+                                     for column in self.data_columns}
+        self.sysfs_root = sysfs_root
+        self.domains = domains
+        self.__fds: List[int] = []
+
+    @staticmethod
+    def discover_domains(sysfs_root: Path = Path('/sys')) -> List[RAPLDomain]:
+        domains = []
+        for path in sorted((sysfs_root / RAPLSampler.POWERCAP_PATH).glob('*-rapl:*')):
+            try:
+                domains.append(RAPLDomain(path))
+            except (OSError, ValueError):
+                continue  # e.g. energy_uj is only readable by root
+        return domains
+
+    @property
+    def channels(self) -> List[str]:
+        return [domain.name for domain in self.domains]
+
+    def read(self) -> List[int]:
+        return [int(os.pread(fd, 32, 0)) for fd in self.__fds]
+
+    def start(self, context: Optional[RunnerContext]):
+        if self.domains is None:
+            self.domains = RAPLSampler.discover_domains(self.sysfs_root)
+        if not self.domains:
+            raise BaseError(f"No RAPL domains found in {self.sysfs_root / RAPLSampler.POWERCAP_PATH}!")
+        self.__fds = [os.open(domain.path / 'energy_uj', os.O_RDONLY) for domain in self.domains]
+
+    def stop(self, context: Optional[RunnerContext]):
+        for fd in self.__fds:
+            os.close(fd)
+        self.__fds = []
+        if context is not None:
+            self.write_samples(context.run_dir / 'rapl.csv')
+
+    @property
+    def energy_uj(self) -> np.ndarray:
+        """Per sample and domain, the energy (uJ) consumed since the first sample."""
+        deltas = np.diff(self.samples, axis=0)
+        max_energy_range_uj = np.array([domain.max_energy_range_uj for domain in self.domains])
+        deltas = np.where(deltas < 0, deltas + max_energy_range_uj, deltas)
+        return np.vstack([np.zeros((1, len(self.domains))), np.cumsum(deltas, axis=0)])
+
+    @property
+    def duration(self) -> float:
+        return self.timestamps[-1] - self.timestamps[0]
+
+    def energy(self) -> Dict[str, float]:
+        """Energy (J) consumed per domain kind, summed over all sockets."""
+        energy = {}
+        for domain, energy_uj in zip(self.domains, self.energy_uj[-1]):
+            energy[domain.kind] = energy.get(domain.kind, 0) + energy_uj / 1e6
+        return energy
+
+    def power(self) -> Dict[str, float]:
+        """Average power (W) per domain kind, summed over all sockets."""
+        duration = self.duration
+        return {kind: energy / duration if duration > 0 else 0.0 for kind, energy in self.energy().items()}
+
+    def collect(self, context: Optional[RunnerContext]) -> Dict[str, SupportsStr]:
+        # Columns of domains the machine does not have are left empty
+        data = {}
+        for quantity, measurements in (('energy', self.energy()), ('power', self.power())):
+            for kind, value in measurements.items():
+                data[f'rapl__{kind}_{quantity}'] = round(value, 3)
+        return data
+
+    def write_samples(self, file: Path):
+        """Write the power (W) of each domain between consecutive samples."""
+        power = np.diff(self.energy_uj, axis=0) / 1e6
+        elapsed = np.diff(self.timestamps)
+        power = np.divide(power, elapsed[:, None], out=np.zeros_like(power), where=elapsed[:, None] > 0)
+        with open(file, 'w', newline='') as csvfile:
+            writer = csv.writer(csvfile)
+            writer.writerow(['timestamp'] + self.channels)
+            for timestamp, row in zip(self.timestamps[1:] - self.timestamps[0], power):
+                writer.writerow([round(timestamp, 6)] + [round(value, 3) for value in row])
+
+def rapl_sampler(frequency: int = 100, *decargs, **deckwargs):
+    """Shorthand for `Profiler.profilers(RAPLSampler(...), frequency=frequency)`."""
+    return Profiler.profilers(RAPLSampler(*decargs, **deckwargs), frequency=frequency)
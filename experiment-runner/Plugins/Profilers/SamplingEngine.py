@@ -0,0 +1,108 @@
+from typing import Dict, Iterable, List, Optional
+
+import threading
+import time
+
+import numpy as np
+
+from ConfigValidator.Config.Models.RunnerContext import RunnerContext
+from ConfigValidator.CustomErrors.BaseError import BaseError
+from ExtendedTyping.Typing import SupportsStr
+from Plugins.Profilers.Profiler import Profiler, SampledProfiler
+
+class SamplingEngine:
+    """Drives a set of profilers with a single timer thread.
+
+    Each tick takes one timestamp and reads all sampled profilers right after each other, so their
+    samples line up and share one clock. Samples are written into preallocated numpy buffers, which
+    only grow (doubling) when a run lasts longer than `initial_duration` seconds."""
+
+    MIN_FREQUENCY   = 1
+    MAX_FREQUENCY   = 1000
+
+    def __init__(self, profilers: Iterable[Profiler], frequency: int = 100, initial_duration: float = 60):
+        if not SamplingEngine.MIN_FREQUENCY <= frequency <= SamplingEngine.MAX_FREQUENCY:
+            raise BaseError(f"Sampling frequency must be between {SamplingEngine.MIN_FREQUENCY} "
+                            f"and {SamplingEngine.MAX_FREQUENCY} Hz, got {frequency}!")
+
+        self.profilers = list(profilers)
+        self.sampled_profilers = [profiler for profiler in self.profilers if isinstance(profiler, SampledProfiler)]
+        self.frequency = frequency
+        self.__initial_capacity = max(1, int(initial_duration * frequency))
+
+        self.__nr_samples = 0
+        self.__started_at = 0.0
+        self.__stopped_at = 0.0
+        self.__timestamps = np.empty(0)
+        self.__buffers: List[np.ndarray] = []
+        self.__stop_event = threading.Event()
+        self.__thread: Optional[threading.Thread] = None
+
+    @property
+    def nr_samples(self) -> int:
+        return self.__nr_samples
+
+    @property
+    def duration(self) -> float:
+        """The time (s) between the end of `start()` and the beginning of `stop()`."""
+        return self.__stopped_at - self.__started_at
+
+    def __grow(self):
+        capacity = 2 * len(self.__timestamps)
+        self.__timestamps = np.resize(self.__timestamps, capacity)
+        self.__buffers = [np.resize(buffer, (capacity, buffer.shape[1])) for buffer in self.__buffers]
+
+    def tick(self):
+        """Take one sample of all sampled profilers."""
+        if self.__nr_samples == len(self.__timestamps):
+            self.__grow()
+
+        i = self.__nr_samples
+        self.__timestamps[i] = time.monotonic()
+        for profiler, buffer in zip(self.sampled_profilers, self.__buffers):
+            buffer[i] = profiler.read()
+        self.__nr_samples += 1
+
+    def __sample_loop(self):
+        # Schedule against absolute deadlines, so the time spent sampling does not make the rate drift
+        interval = 1 / self.frequency
+        deadline = self.__timestamps[0] + interval
+        while not self.__stop_event.wait(max(0.0, deadline - time.monotonic())):
+            self.tick()
+            deadline += interval
+
+    def start(self, context: Optional[RunnerContext] = None):
+        for profiler in self.profilers:
+            profiler.start(context)
+
+        self.__nr_samples = 0
+        self.__timestamps = np.empty(self.__initial_capacity)
+        self.__buffers = [np.empty((self.__initial_capacity, len(profiler.channels)))
+                          for profiler in self.sampled_profilers]
+
+        self.__started_at = time.monotonic()
+        if self.sampled_profilers:
+            self.tick()
+            self.__stop_event.clear()
+            self.__thread = threading.Thread(target=self.__sample_loop, name='SamplingEngine', daemon=True)
+            self.__thread.start()
+
+    def stop(self, context: Optional[RunnerContext] = None):
+        self.__stopped_at = time.monotonic()
+        if self.__thread is not None:
+            self.__stop_event.set()
+            self.__thread.join()
+            self.__thread = None
+            self.tick()  # so that the measurement ends exactly now, not at the last tick
+
+        for profiler, buffer in zip(self.sampled_profilers, self.__buffers):
+            profiler.timestamps = self.__timestamps[:self.__nr_samples]
+            profiler.samples = buffer[:self.__nr_samples]
+        for profiler in self.profilers:
+            profiler.stop(context)
+
+    def collect(self, context: Optional[RunnerContext] = None) -> Dict[str, SupportsStr]:
+        data = {}
+        for profiler in self.profilers:
+            data.update(profiler.collect(context))
+        return data
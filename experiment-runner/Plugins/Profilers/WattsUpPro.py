@@ -1,15 +1,42 @@
 import os, serial
+import csv
 import datetime, time
+import threading
+from enum import Enum, auto
+from pathlib import Path
 from platform import uname
+from typing import Dict, Iterable, Optional
 
-class WattsUpPro(object):
-    """An integration of "Watts up? Pro" power meter: https://github.com/isaaclino/wattsup"""
+import numpy as np
+
+from ConfigValidator.Config.Models.RunnerContext import RunnerContext
+from ExtendedTyping.Typing import SupportsStr
+from Plugins.Profilers.Profiler import BaselineCorrection, Profiler
+
+class DataColumns(Enum):
+    ENERGY          = auto()    # J, integrated over all samples of the run
+    AVG_POWER       = auto()    # W
+    MAX_POWER       = auto()    # W
+    AVG_VOLTAGE     = auto()    # V
+    AVG_CURRENT     = auto()    # A
+
+    @property
+    def name(self) -> str:
+        return f'wattsuppro__{super().name.lower()}'
+
+class WattsUpPro(Profiler):
+    """An integration of "Watts up? Pro" power meter: https://github.com/isaaclino/wattsup
+
+    While measuring, a background thread decodes the meter's `#d` frames into a fixed-size ring buffer
+    of (timestamp, W, V, A) rows, holding the last `capacity` samples. The energy integral and the
+    summary are kept as running totals, so they cover the whole measurement however long it lasts."""
     EXTERNAL_MODE = 'E'
     INTERNAL_MODE = 'I'
     TCPIP_MODE = 'T'
     FULLHANDLING = 2
 
-    def __init__(self, port: str = None, interval=1.0):
+    def __init__(self, port: str = None, interval=1.0, capacity: int = 24 * 60 * 60,
+                 data_columns: Iterable[DataColumns] = (DataColumns.ENERGY, DataColumns.AVG_POWER)):
 
         # Set up & check serial ports
         if port is None:
@@ -27,47 +54,128 @@ class WattsUpPro(object):
                 print( 'Default port is /dev/ttyUSB0 for Linux')
                 raise RuntimeError("Invalid port")
 
-        self.s = serial.Serial(port, 115200 )
-        self.logfile = None
+        self.port = port
+        self.s = None
         self.interval = interval
-        # initialize lists for keeping data
-        self.t = []
-        self.power = []
-        self.potential = []
-        self.current = []
+        self.data_columns = [dc.name for dc in data_columns]
+        corrections = {DataColumns.ENERGY: BaselineCorrection.CUMULATIVE,
+                       DataColumns.AVG_POWER: BaselineCorrection.LEVEL,
+                       DataColumns.AVG_CURRENT: BaselineCorrection.LEVEL}
+        self.baseline_corrections = {dc.name: corrections[dc] for dc in data_columns if dc in corrections}
+
+        self.__buffer = np.zeros((capacity, 4))  # ring buffer of (timestamp, W, V, A)
+        self.__nr_samples = 0
+        self.__energy = 0.0
+        self.__totals = np.zeros(3)             # sum of W, V, A
+        self.__max_power = 0.0
+        self.__stop_event = threading.Event()
+        self.__thread: Optional[threading.Thread] = None
 
     def mode(self, runmode):
         temp = '#L,W,3,%s,,%d;' % (runmode, self.interval)
         self.s.write( str.encode(temp))
         if runmode == self.INTERNAL_MODE:
-            self.s.write('#O,W,1,%d' % self.FULLHANDLING)
+            self.s.write( str.encode('#O,W,1,%d' % self.FULLHANDLING))
 
-    def log(self,timeout, logfile = None):
-        print('Logging...')
+    @staticmethod
+    def decode(line: bytes) -> Optional[np.ndarray]:
+        """Decode a `#d` frame into (W, V, A), or None for any other (or a truncated) line."""
+        if not line.startswith( str.encode('#d') ):
+            return None
+        fields = line.split(str.encode(','))
+        if len(fields) <= 5:
+            return None
+        try:
+            return np.array([float(fields[3]) / 10, float(fields[4]) / 10, float(fields[5]) / 1000])
+        except ValueError:
+            return None
+
+    def __append(self, timestamp: float, values: np.ndarray):
+        if self.__nr_samples > 0:
+            previous = self.__buffer[(self.__nr_samples - 1) % len(self.__buffer)]
+            self.__energy += (timestamp - previous[0]) * (values[0] + previous[1]) / 2  # trapezoidal rule
+        self.__buffer[self.__nr_samples % len(self.__buffer)] = (timestamp, *values)
+        self.__totals += values
+        self.__max_power = max(self.__max_power, values[0])
+        self.__nr_samples += 1
+
+    def __read_loop(self):
+        pending = b''
+        while not self.__stop_event.is_set():
+            pending += self.s.read(max(1, self.s.in_waiting))  # returns early after the serial timeout
+            *lines, pending = pending.split(b'\n')
+            for line in lines:
+                values = WattsUpPro.decode(line)
+                if values is not None:
+                    self.__append(time.monotonic(), values)
+
+    def start(self, context: Optional[RunnerContext] = None):
+        self.__nr_samples = 0
+        self.__energy = 0.0
+        self.__totals[:] = 0
+        self.__max_power = 0.0
+
+        self.s = serial.Serial(self.port, 115200, timeout=0.1)
         self.mode(self.EXTERNAL_MODE)
-        if logfile:
-            self.logfile = logfile
-            o = open(self.logfile,'w')
-
-        line = self.s.readline()
-        n = 0
-        timeout_start = time.time()
-        
-
-        while time.time() < timeout_start + timeout:
-            if line.startswith( str.encode('#d') ):
-                fields = line.split(str.encode(','))
-                if len(fields)>5:
-                    W = float(fields[3]) / 10
-                    V = float(fields[4]) / 10
-                    A = float(fields[5]) / 1000
-                   
-                    if self.logfile:
-                        o.write('%s %d %3.1f %3.1f %5.3f\n' % (datetime.datetime.now(), n, W, V, A))  # SAVE TO LOG
-                    n += self.interval
-            line = self.s.readline()
+        self.__stop_event.clear()
+        self.__thread = threading.Thread(target=self.__read_loop, name='WattsUpPro', daemon=True)
+        self.__thread.start()
 
-        try:
-            o.close()
-        except:
-            pass
+    def stop(self, context: Optional[RunnerContext] = None):
+        self.__stop_event.set()
+        self.__thread.join()
+        self.s.close()
+        if context is not None:
+            self.write_samples(context.run_dir / 'wattsuppro.csv')
+
+    @property
+    def samples(self) -> np.ndarray:
+        """The buffered (timestamp, W, V, A) rows, oldest first. Timestamps are `time.monotonic()` seconds."""
+        if self.__nr_samples <= len(self.__buffer):
+            return self.__buffer[:self.__nr_samples].copy()
+        oldest = self.__nr_samples % len(self.__buffer)
+        return np.concatenate([self.__buffer[oldest:], self.__buffer[:oldest]])
+
+    @property
+    def nr_samples(self) -> int:
+        """The number of samples of the measurement, including those no longer in the ring buffer."""
+        return self.__nr_samples
+
+    def energy(self) -> float:
+        """Energy (J) over the whole measurement."""
+        return self.__energy
+
+    def summary(self) -> Dict[str, float]:
+        averages = self.__totals / self.__nr_samples if self.__nr_samples else self.__totals
+        return {
+            'energy':       self.__energy,
+            'avg_power':    averages[0],
+            'max_power':    self.__max_power,
+            'avg_voltage':  averages[1],
+            'avg_current':  averages[2],
+        }
+
+    def collect(self, context: Optional[RunnerContext] = None) -> Dict[str, SupportsStr]:
+        return {f'wattsuppro__{key}': round(float(value), 3) for key, value in self.summary().items()}
+
+    def write_samples(self, file: Path):
+        with open(file, 'w', newline='') as csvfile:
+            writer = csv.writer(csvfile)
+            writer.writerow(['timestamp', 'power', 'voltage', 'current'])
+            writer.writerows(self.samples.tolist())
+
+    def log(self, timeout, logfile = None):
+        """Measure for `timeout` seconds, optionally writing the samples to `logfile`. Blocks the caller;
+        within an experiment, use the profiler hooks instead (see Plugins/README.md)."""
+        print('Logging...')
+        self.start()
+        time.sleep(timeout)
+        self.stop()
+
+        if logfile:
+            started = datetime.datetime.now() - datetime.timedelta(seconds=timeout)
+            samples = self.samples
+            with open(logfile, 'w') as o:
+                for n, (timestamp, W, V, A) in enumerate(samples):
+                    moment = started + datetime.timedelta(seconds=timestamp - samples[0][0])
+                    o.write('%s %d %3.1f %3.1f %5.3f\n' % (moment, n * self.interval, W, V, A))  # SAVE TO LOG
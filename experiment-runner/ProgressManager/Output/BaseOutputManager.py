@@ -5,3 +5,7 @@ class BaseOutputManager:
 
     def __init__(self, experiment_path: Path):
         self._experiment_path = experiment_path
+
+    def flush(self):
+        """Bring the experiment output up to date with all stored updates. Called at the end of the experiment."""
+        pass
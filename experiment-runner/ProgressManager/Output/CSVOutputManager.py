@@ -1,75 +1,162 @@
 from ProgressManager.RunTable.Models.RunProgress import RunProgress
+from ProgressManager.RunTable.RunTableIndex import RunTableIndex
 from ConfigValidator.CustomErrors.ExperimentOutputErrors import ExperimentOutputFileDoesNotExistError
 from ProgressManager.Output.OutputProcedure import OutputProcedure as output
 from ProgressManager.Output.BaseOutputManager import BaseOutputManager
 
 from tempfile import NamedTemporaryFile
-import shutil
+from pathlib import Path
+import json
+import os
 import csv
-from typing import Dict, List
+from typing import Dict, Iterable, List
 
 
 class CSVOutputManager(BaseOutputManager):
+    """Stores the run table in `run_table.csv`.
+
+    Finished runs are not written into the CSV directly. Each updated row is appended (and fsynced) to a
+    write-ahead journal, `run_table.journal`, which is folded back into `run_table.csv` every
+    `compaction_interval` records and whenever `compact_journal()` is called (e.g. at the end of the experiment).
+    `read_run_table()` replays any pending journal records, so a crash between two compactions loses nothing."""
+
+    RUN_TABLE_FILE_NAME = 'run_table.csv'
+    JOURNAL_FILE_NAME   = 'run_table.journal'
+
+    def __init__(self, experiment_path: Path, compaction_interval: int = 100):
+        super().__init__(experiment_path)
+        self._compaction_interval = compaction_interval
+        self.__nr_journal_records = len(self.__read_journal())  # kept up to date, rather than reading the journal per update
+
+    @property
+    def run_table_path(self) -> Path:
+        return self._experiment_path / CSVOutputManager.RUN_TABLE_FILE_NAME
+
+    @property
+    def journal_path(self) -> Path:
+        return self._experiment_path / CSVOutputManager.JOURNAL_FILE_NAME
+
+    @staticmethod
+    def __to_csv_values(row: Dict) -> Dict:
+        # Mirror what csv.DictWriter would store, so that replayed rows and rows read from the CSV look the same.
+        # The __done column is written as human-readable: enum_value.name
+        values = {}
+        for key, value in row.items():
+            if isinstance(value, RunProgress):
+                values[key] = value.name
+            else:
+                values[key] = '' if value is None else str(value)
+        return values
+
+    @staticmethod
+    def __from_csv_values(row: Dict) -> Dict:
+        # if value was integer, stored as string by CSV writer, then convert back to integer.
+        for key, value in row.items():
+            if value.isnumeric():
+                row[key] = int(value)
+
+            if key == '__done':
+                row[key] = RunProgress[value]
+        return row
+
+    def __read_csv_rows(self) -> List[Dict]:
+        with open(self.run_table_path, 'r', newline='') as csvfile:
+            return [row for row in csv.DictReader(csvfile)]
+
+    def __read_journal(self) -> List[Dict]:
+        records = []
+        try:
+            with open(self.journal_path, 'r') as journal:
+                for line in journal:
+                    if not line.strip():
+                        continue
+                    try:
+                        records.append(json.loads(line))
+                    except json.JSONDecodeError:
+                        # A torn write from a crash mid-append. Only the record being written can be affected.
+                        output.console_log_WARNING(f"CSVManager: Ignoring incomplete journal record in {self.journal_path}")
+        except FileNotFoundError:
+            pass
+        return records
+
+    def __apply_journal(self, rows: List[Dict]) -> List[Dict]:
+        records = self.__read_journal()
+        if not records:
+            return rows
+
+        index = RunTableIndex(rows)
+        for record in records:  # later records win
+            if record['__run_id'] in index:
+                row = index.row(record['__run_id'])
+                row.update((key, value) for key, value in record.items() if key in row)
+        return rows
+
+    def __write_csv_rows(self, rows: Iterable[Dict]):
+        rows = iter(rows)
+        first_row = next(rows)
+
+        # Write next to the run table and atomically swap it in, so readers never observe a partial file.
+        tempfile = NamedTemporaryFile(mode='w', newline='', delete=False,
+                                      dir=self._experiment_path, prefix='.run_table.', suffix='.tmp')
+        with tempfile:
+            writer = csv.DictWriter(tempfile, fieldnames=list(first_row.keys()))
+            writer.writeheader()
+            writer.writerow(first_row)
+            writer.writerows(rows)
+            tempfile.flush()
+            os.fsync(tempfile.fileno())
+        os.replace(tempfile.name, self.run_table_path)
+
     def read_run_table(self) -> List[Dict]:
-        read_run_table = []
         try:
-            with open(self._experiment_path / 'run_table.csv', 'r') as csvfile:
-                reader = csv.DictReader(csvfile)
-                for row in reader:
-                    # if value was integer, stored as string by CSV writer, then convert back to integer.
-                    for key, value in row.items():
-                        if value.isnumeric():
-                            row[key] = int(value)
-
-                        if key == '__done':
-                            row[key] = RunProgress[value]
-
-                    read_run_table.append(row)
-            
-            return read_run_table
+            rows = self.__apply_journal(self.__read_csv_rows())
+            return [CSVOutputManager.__from_csv_values(row) for row in rows]
         except:
             raise ExperimentOutputFileDoesNotExistError
 
-    def write_run_table(self, run_table: List[Dict]):
+    def write_run_table(self, run_table: Iterable[Dict]):
+        """Write the run table, which can also be streamed, e.g. from `RunTableModel.iter_experiment_run_table()`."""
         try:
-            with open(self._experiment_path / 'run_table.csv', 'w', newline='') as myfile:
-                writer = csv.DictWriter(myfile, fieldnames=list(run_table[0].keys()))
-                writer.writeheader()
-                for data in run_table:
-                    data['__done'] = data['__done'].name
-                    writer.writerow(data)
+            self.__write_csv_rows(CSVOutputManager.__to_csv_values(data) for data in run_table)
         except:
             raise ExperimentOutputFileDoesNotExistError
 
+        # The freshly written table is authoritative; drop any records that refer to a previous version of it.
+        self.journal_path.unlink(missing_ok=True)
+        self.__nr_journal_records = 0
+
     # TODO: Nice To have
     def shuffle_experiment_run_table(self):
         pass
-    
+
     def update_row_data(self, updated_row: dict):
-        tempfile = NamedTemporaryFile(mode='w', delete=False)
-
-        with open(self._experiment_path / 'run_table.csv', 'r') as csvfile, tempfile:
-            reader = csv.DictReader(csvfile, fieldnames=list(updated_row.keys()))
-            writer = csv.DictWriter(tempfile, fieldnames=list(updated_row.keys()))
-
-            for row in reader:
-                if row['__run_id'] == updated_row['__run_id']:
-                    # When the row is updated, it is an ENUM value again.
-                    # Write as human-readable: enum_value.name
-                    updated_row['__done'] = updated_row['__done'].name
-                    writer.writerow(updated_row)
-                else:
-                    writer.writerow(row)
-
-        shutil.move(tempfile.name, self._experiment_path / 'run_table.csv')
+        record = json.dumps(CSVOutputManager.__to_csv_values(updated_row)).encode() + b'\n'
+        with open(self.journal_path, 'a+b') as journal:
+            # Never glue a record onto a torn one left behind by a crash
+            if journal.tell() > 0:
+                journal.seek(-1, os.SEEK_END)
+                if journal.read(1) != b'\n':
+                    record = b'\n' + record
+            journal.write(record)
+            journal.flush()
+            os.fsync(journal.fileno())
+
         output.console_log_WARNING(f"CSVManager: Updated row {updated_row['__run_id']}")
 
-        # with open(self.experiment_path + '/run_table.csv', 'w', newline='') as myfile:
-        #     wr = csv.writer(myfile, quoting=csv.QUOTE_ALL)
-        #     wr.writerow(updated_row)
+        self.__nr_journal_records += 1
+        if self.__nr_journal_records >= self._compaction_interval:
+            self.compact_journal()
+
+    def compact_journal(self):
+        """Fold all pending journal records into `run_table.csv` and truncate the journal.
+        Replaying a record twice is harmless, so a crash between both steps is safe."""
+        if not self.journal_path.exists():
+            return
+
+        self.__write_csv_rows(self.__apply_journal(self.__read_csv_rows()))
+        self.journal_path.unlink()
+        self.__nr_journal_records = 0
+        output.console_log_WARNING(f"CSVManager: Compacted run table journal into {self.run_table_path}")
 
-    # for row in reader:
-    # if name == row['name']:
-    #     row['name'] = input("enter new name for {}".format(name))
-    # # write the row either way
-    # writer.writerow({'name': row['name'], 'number': row['number'], 'address': row['address']})
\ No newline at end of file
+    def flush(self):
+        self.compact_journal()
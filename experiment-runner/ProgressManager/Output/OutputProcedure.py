@@ -1,5 +1,9 @@
+import os
 import time
 import sys
+import json
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
 from tabulate import tabulate
 from ExperimentOrchestrator.Misc.DictConversion import class_to_dict
 from ExperimentOrchestrator.Misc.BashHeaders import BashHeaders
@@ -16,33 +20,81 @@ from ExperimentOrchestrator.Misc.BashHeaders import BashHeaders
 ###     =========================================================
 class OutputProcedure:
     runner = "[EXPERIMENT_RUNNER]: "
+    RUN_LOG_FILE_NAME = 'runner_log.jsonl'
+
+    # While measuring (see `hold()`), the (text, color, empty_line) of each console log that is held back
+    __held: Optional[List[Tuple[str, str, bool]]] = None
+    __drop_held: bool = False
+    __nr_dropped: int = 0
+    # The structured log records of the current run (see `open_run_log()`)
+    __run_log: Optional[List[Dict]] = None
 
     @staticmethod
-    def console_log(txt: str, empty_line=False):
+    def __print(txt: str, color: str, empty_line: bool):
         if empty_line:
             print(" " * 100)
 
-        print(f"{OutputProcedure.runner} {txt}")
+        print(f"{OutputProcedure.runner} {color + txt + BashHeaders.ENDC if color else txt}")
+
+    @staticmethod
+    def console_log(txt: str, empty_line=False, level: str = 'INFO', color: str = ''):
+        if OutputProcedure.__run_log is not None:
+            OutputProcedure.__run_log.append({'time': time.time(), 'pid': os.getpid(), 'level': level, 'message': txt})
+
+        if OutputProcedure.__held is None:
+            OutputProcedure.__print(txt, color, empty_line)
+        elif OutputProcedure.__drop_held:
+            OutputProcedure.__nr_dropped += 1
+        else:
+            OutputProcedure.__held.append((txt, color, empty_line))  # formatted and printed on release()
 
     @staticmethod
     def console_log_OK(txt: str, empty_line=False):
-        txt = BashHeaders.OKGREEN + txt + BashHeaders.ENDC
-        OutputProcedure.console_log(txt, empty_line)
+        OutputProcedure.console_log(txt, empty_line, 'OK', BashHeaders.OKGREEN)
 
     @staticmethod
     def console_log_WARNING(txt: str, empty_line=False):
-        txt = BashHeaders.WARNING + txt + BashHeaders.ENDC
-        OutputProcedure.console_log(txt, empty_line)
+        OutputProcedure.console_log(txt, empty_line, 'WARNING', BashHeaders.WARNING)
 
     @staticmethod
     def console_log_FAIL(txt: str, empty_line=False):
-        txt = BashHeaders.FAIL + txt + BashHeaders.ENDC
-        OutputProcedure.console_log(txt, empty_line)
+        OutputProcedure.console_log(txt, empty_line, 'FAIL', BashHeaders.FAIL)
 
     @staticmethod
     def console_log_bold(txt: str, empty_line=False):
-        bold_text = f"\033[1m{txt}\033[0m"
-        OutputProcedure.console_log(bold_text, empty_line)
+        OutputProcedure.console_log(txt, empty_line, 'INFO', BashHeaders.BOLD)
+
+    @staticmethod
+    def hold(drop: bool = False):
+        """Start a quiet window (e.g. the measurement of a run): console logs are only kept in memory, or discarded
+        when `drop` is set, until `release()`. This keeps terminal I/O and formatting out of the measurement.
+        Text printed directly with `print()` is not affected."""
+        OutputProcedure.__held = []
+        OutputProcedure.__drop_held = drop
+        OutputProcedure.__nr_dropped = 0
+
+    @staticmethod
+    def release():
+        """End the quiet window started by `hold()`, and print what was held back."""
+        held, OutputProcedure.__held = OutputProcedure.__held, None
+        for txt, color, empty_line in held or []:
+            OutputProcedure.__print(txt, color, empty_line)
+        if OutputProcedure.__nr_dropped > 0:
+            OutputProcedure.__print(f"({OutputProcedure.__nr_dropped} lines logged during the measurement were not printed)", '', False)
+            OutputProcedure.__nr_dropped = 0
+
+    @staticmethod
+    def open_run_log():
+        """Start collecting every console log as a structured record (time, pid, level, message) in memory."""
+        OutputProcedure.__run_log = []
+
+    @staticmethod
+    def write_run_log(run_dir: Path):
+        """Append the records collected since `open_run_log()` to `runner_log.jsonl` in `run_dir`, and stop collecting."""
+        records, OutputProcedure.__run_log = OutputProcedure.__run_log, None
+        if records:
+            with open(run_dir / OutputProcedure.RUN_LOG_FILE_NAME, 'a') as log_file:
+                log_file.writelines(json.dumps(record) + '\n' for record in records)
 
     @staticmethod
     def console_log_tabulate_dict(d: dict):     # Used to output dictionary as readable, pretty table
@@ -0,0 +1,79 @@
+from ConfigValidator.Config.Models.RunnerContext import RunnerContext
+from ProgressManager.RunTable.Models.RunProgress import RunProgress
+from ProgressManager.Output.BaseOutputManager import BaseOutputManager
+
+from pathlib import Path
+from typing import Any, Dict, Iterable, List
+
+import pyarrow as pa
+import pyarrow.dataset as ds
+import pyarrow.parquet as pq
+
+
+class ParquetOutputManager(BaseOutputManager):
+    """Writes the run table and the raw samples of each run as typed, columnar Parquet files.
+
+    The run table is written to `run_table.parquet`. Raw samples are written per run to
+    `<run_dir>/<name>.parquet`, and all runs together can be scanned lazily as one dataset,
+    partitioned by `__run_id`, with `open_samples_dataset()`. Requires `pyarrow`."""
+
+    RUN_TABLE_FILE_NAME = 'run_table.parquet'
+
+    @property
+    def run_table_path(self) -> Path:
+        return self._experiment_path / ParquetOutputManager.RUN_TABLE_FILE_NAME
+
+    @staticmethod
+    def __infer_column(values: List[Any]) -> pa.Array:
+        # Rows read back from the CSV store only contain strings and ints, so values are parsed
+        # to the narrowest type that fits the whole column. Empty cells (e.g. runs still TODO) become nulls.
+        values = [value.name if isinstance(value, RunProgress) else value for value in values]
+        values = [None if value is None or (isinstance(value, str) and value.strip() == '') else value
+                  for value in values]
+        present = [value for value in values if value is not None]
+
+        def parses_as(parse) -> bool:
+            try:
+                for value in present:
+                    parse(value)
+                return True
+            except (TypeError, ValueError):
+                return False
+
+        if present and all(isinstance(value, bool) or value in ('True', 'False') for value in present):
+            return pa.array([None if value is None else value in (True, 'True') for value in values], pa.bool_())
+        if not any(isinstance(value, float) for value in present) and parses_as(int):
+            return pa.array([None if value is None else int(value) for value in values], pa.int64())
+        if parses_as(float):
+            return pa.array([None if value is None else float(value) for value in values], pa.float64())
+        return pa.array([None if value is None else str(value) for value in values], pa.string())
+
+    def write_run_table(self, run_table: Iterable[Dict]):
+        run_table = list(run_table)
+        columns = list(run_table[0].keys())
+        table = pa.table({column: ParquetOutputManager.__infer_column([row[column] for row in run_table])
+                          for column in columns})
+        pq.write_table(table, self.run_table_path)
+
+    def read_run_table(self) -> List[Dict]:
+        return pq.read_table(self.run_table_path).to_pylist()
+
+    def write_samples(self, context: RunnerContext, samples, name: str = 'samples'):
+        """Write the raw samples of a run, given as a `pandas.DataFrame`, a `pyarrow.Table`
+        or a dict of equally long columns (lists or numpy arrays)."""
+        if isinstance(samples, dict):
+            table = pa.table(samples)
+        elif isinstance(samples, pa.Table):
+            table = samples
+        else:
+            table = pa.Table.from_pandas(samples, preserve_index=False)
+        pq.write_table(table, context.run_dir / f'{name}.parquet')
+
+    def open_samples_dataset(self, name: str = 'samples') -> ds.Dataset:
+        """All runs' samples called `name` as one lazily scanned dataset, with an extra `__run_id` column."""
+        return ds.dataset(
+            sorted(str(path) for path in self._experiment_path.glob(f'*/{name}.parquet')),
+            format='parquet',
+            partitioning=ds.DirectoryPartitioning(pa.schema([('__run_id', pa.string())])),
+            partition_base_dir=str(self._experiment_path)
+        )
@@ -0,0 +1,129 @@
+from ConfigValidator.Config.Models.Metadata import Metadata
+from ProgressManager.RunTable.Models.RunProgress import RunProgress
+from ConfigValidator.CustomErrors.ExperimentOutputErrors import ExperimentOutputFileDoesNotExistError
+from ProgressManager.Output.OutputProcedure import OutputProcedure as output
+from ProgressManager.Output.BaseOutputManager import BaseOutputManager
+from ProgressManager.Output.CSVOutputManager import CSVOutputManager
+
+from contextlib import closing
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional
+import itertools
+import sqlite3
+import jsonpickle
+
+
+class SQLiteOutputManager(BaseOutputManager):
+    """Stores the run table, the metadata and the status of each run in a single SQLite database.
+
+    The database runs in WAL mode, so other processes (e.g. monitoring scripts) can read it while the experiment
+    is running, and every row update is a single transaction. Numbers and strings keep their type; any other
+    value is stored as its str() representation, like in the CSV store."""
+
+    DATABASE_FILE_NAME = 'experiment.db'
+
+    def __init__(self, experiment_path: Path):
+        super().__init__(experiment_path)
+        self.__column_names: Optional[List[str]] = None  # of the run table, which only change when it is written
+
+    @property
+    def database_path(self) -> Path:
+        return self._experiment_path / SQLiteOutputManager.DATABASE_FILE_NAME
+
+    @staticmethod
+    def __quote(identifier: str) -> str:
+        return '"' + identifier.replace('"', '""') + '"'
+
+    @staticmethod
+    def __to_sql_value(value):
+        if isinstance(value, RunProgress):
+            return value.name
+        if isinstance(value, bool):
+            return str(value)  # not 0/1, so treatment levels keep the same str() representation as in the CSV
+        if value is None or isinstance(value, (int, float, str, bytes)):
+            return value
+        return str(value)
+
+    def __connect(self) -> sqlite3.Connection:
+        # A new connection per operation: managers are created before run processes are forked,
+        # and a SQLite connection must not be shared across a fork.
+        connection = sqlite3.connect(self.database_path, timeout=30)
+        connection.execute('PRAGMA journal_mode=WAL')
+        return connection
+
+    def __columns(self, connection: sqlite3.Connection, cached: bool = True) -> List[str]:
+        if self.__column_names is None or not cached:
+            columns = [row[1] for row in connection.execute('PRAGMA table_info(run_table)')]
+            if not columns:
+                return []  # no run table yet
+            self.__column_names = [column for column in columns if column != '__position']
+        return self.__column_names
+
+    def read_run_table(self) -> List[Dict]:
+        if not self.database_path.exists():
+            raise ExperimentOutputFileDoesNotExistError(SQLiteOutputManager.DATABASE_FILE_NAME)
+
+        with closing(self.__connect()) as connection:
+            columns = self.__columns(connection, cached=False)  # e.g. written by another manager meanwhile
+            if not columns:
+                raise ExperimentOutputFileDoesNotExistError(SQLiteOutputManager.DATABASE_FILE_NAME)
+
+            select = f"SELECT {', '.join(map(SQLiteOutputManager.__quote, columns))} FROM run_table ORDER BY __position"
+            read_run_table = []
+            for values in connection.execute(select):
+                row = dict(zip(columns, values))
+                row['__done'] = RunProgress[row['__done']]
+                read_run_table.append(row)
+            return read_run_table
+
+    def write_run_table(self, run_table: Iterable[Dict]):
+        rows = iter(run_table)
+        first_row = next(rows)
+        columns = list(first_row.keys())
+        quoted_columns = ', '.join(map(SQLiteOutputManager.__quote, columns))
+        values = ([position] + [SQLiteOutputManager.__to_sql_value(row[column]) for column in columns]
+                  for position, row in enumerate(itertools.chain([first_row], rows)))
+
+        with closing(self.__connect()) as connection, connection:
+            connection.execute('DROP TABLE IF EXISTS run_table')
+            connection.execute(f"CREATE TABLE run_table (__position INTEGER PRIMARY KEY, {quoted_columns})")
+            connection.execute('CREATE UNIQUE INDEX run_table_run_id ON run_table ("__run_id")')
+            connection.execute('CREATE INDEX run_table_done ON run_table ("__done")')
+            connection.executemany(
+                f"INSERT INTO run_table (__position, {quoted_columns}) VALUES ({', '.join('?' * (len(columns) + 1))})",
+                values
+            )
+        self.__column_names = columns
+
+    def update_row_data(self, updated_row: dict):
+        with closing(self.__connect()) as connection, connection:
+            columns = [column for column in self.__columns(connection)
+                       if column in updated_row and column != '__run_id']
+            if not columns:
+                return  # nothing the run table stores
+            connection.execute(
+                f"UPDATE run_table SET {', '.join(SQLiteOutputManager.__quote(column) + ' = ?' for column in columns)} "
+                f"WHERE \"__run_id\" = ?",
+                [SQLiteOutputManager.__to_sql_value(updated_row[column]) for column in columns] + [updated_row['__run_id']]
+            )
+
+        output.console_log_WARNING(f"SQLiteManager: Updated row {updated_row['__run_id']}")
+
+    def write_metadata(self, metadata: Metadata):
+        with closing(self.__connect()) as connection, connection:
+            connection.execute('CREATE TABLE IF NOT EXISTS metadata (key TEXT PRIMARY KEY, value TEXT)')
+            connection.execute("INSERT OR REPLACE INTO metadata (key, value) VALUES ('metadata', ?)",
+                               [jsonpickle.encode(metadata, indent=2)])
+
+    def read_metadata(self) -> Metadata:
+        with closing(self.__connect()) as connection:
+            value, = connection.execute("SELECT value FROM metadata WHERE key = 'metadata'").fetchone()
+        return jsonpickle.decode(value)
+
+    def export_csv(self, destination: Path = None):
+        """Export the run table to `run_table.csv` in `destination` (defaults to the experiment path)."""
+        CSVOutputManager(destination or self._experiment_path).write_run_table(self.read_run_table())
+
+    def flush(self):
+        self.export_csv()
+        output.console_log_WARNING(f"SQLiteManager: Exported run table to {self._experiment_path / CSVOutputManager.RUN_TABLE_FILE_NAME}")
@@ -0,0 +1,92 @@
+import re
+import shutil
+from pathlib import Path
+from typing import Dict, List, Tuple
+
+from ConfigValidator.Config.Models.Metadata import Metadata
+from ConfigValidator.Config.Models.Shard import Shard
+from ConfigValidator.CustomErrors.BaseError import BaseError
+from ProgressManager.Output.CSVOutputManager import CSVOutputManager
+from ProgressManager.Output.JSONOutputManager import JSONOutputManager
+from ProgressManager.Output.OutputProcedure import OutputProcedure as output
+from ProgressManager.Output.SQLiteOutputManager import SQLiteOutputManager
+from ProgressManager.RunTable.Models.RunProgress import RunProgress
+
+
+class ShardMerger:
+    """Combines the experiment folders of the shards of one experiment (see `Shard`) into a single experiment folder,
+    as if all runs had been executed by one invocation: a CSV run table, its metadata, and the folder of each run.
+
+    All shards of the experiment must be given, and must have been executed with the same config,
+    i.e. their metadata has the same md5sum."""
+
+    def __init__(self, destination: Path):
+        self.destination = destination
+
+    @staticmethod
+    def __read_shard(shard_path: Path) -> Tuple[List[Dict], Metadata]:
+        if (shard_path / SQLiteOutputManager.DATABASE_FILE_NAME).exists():
+            manager = SQLiteOutputManager(shard_path)
+            return manager.read_run_table(), manager.read_metadata()
+        return CSVOutputManager(shard_path).read_run_table(), JSONOutputManager(shard_path).read_metadata()
+
+    @staticmethod
+    def __check_complete(shard_paths: List[Path]):
+        # The shard of each folder is told by its name, as given by Shard.experiment_path
+        shards = [Shard.of_experiment_path(shard_path) for shard_path in shard_paths]
+        counts = {shard.count for shard in shards}
+        if len(counts) > 1:
+            raise BaseError(f"The shards split the run table into a different number of shards "
+                            f"({', '.join(map(str, sorted(counts)))}), they are not of the same experiment!")
+        count = counts.pop()
+        missing = sorted(set(range(1, count + 1)) - {shard.index for shard in shards})
+        if missing:
+            raise BaseError(f"Shard(s) {', '.join(f'{index}/{count}' for index in missing)} are missing, "
+                            f"all {count} shards are needed to merge them!")
+
+    @staticmethod
+    def __generation_order(row: Dict) -> Tuple[int, int]:
+        match = re.fullmatch(r'run_(\d+)_repetition_(\d+)', row['__run_id'])
+        return (int(match.group(2)), int(match.group(1))) if match else (0, 0)
+
+    def merge(self, shard_paths: List[Path]) -> List[Dict]:
+        if self.destination.exists() and any(self.destination.iterdir()):
+            raise BaseError(f"The destination {self.destination} is not empty, it would be overwritten!")
+        if not shard_paths:
+            raise BaseError("No shards to merge!")
+        ShardMerger.__check_complete(shard_paths)
+
+        run_table = []
+        metadata = None
+        run_ids = dict()  # run id -> shard it was found in
+        for shard_path in shard_paths:
+            rows, shard_metadata = ShardMerger.__read_shard(shard_path)
+            if metadata is None:
+                metadata = shard_metadata
+            elif shard_metadata.md5sum != metadata.md5sum:
+                raise BaseError(f"md5sum mismatch! {shard_path} was executed with a different config "
+                                f"({shard_metadata.md5sum.hex()}) than {shard_paths[0]} ({metadata.md5sum.hex()}).")
+
+            if rows and run_table and set(rows[0].keys()) != set(run_table[0].keys()):
+                raise BaseError(f"The run table of {shard_path} does not define the same columns as the one of {shard_paths[0]}!")
+            for row in rows:
+                if row['__run_id'] in run_ids:
+                    raise BaseError(f"Run {row['__run_id']} is in both {run_ids[row['__run_id']]} and {shard_path}, "
+                                    f"the shards overlap!")
+                run_ids[row['__run_id']] = shard_path
+            run_table.extend(rows)
+
+        run_table.sort(key=ShardMerger.__generation_order)
+
+        self.destination.mkdir(parents=True, exist_ok=True)
+        for row in run_table:
+            run_dir = run_ids[row['__run_id']] / row['__run_id']
+            if run_dir.is_dir():
+                shutil.copytree(run_dir, self.destination / row['__run_id'])
+        CSVOutputManager(self.destination).write_run_table(run_table)
+        JSONOutputManager(self.destination).write_metadata(metadata)
+
+        unfinished = [row['__run_id'] for row in run_table if row['__done'] in (RunProgress.TODO, RunProgress.RUNNING)]
+        if unfinished:
+            output.console_log_WARNING(f"{len(unfinished)} run(s) were not executed yet, e.g. {unfinished[0]}")
+        return run_table
@@ -2,4 +2,8 @@ from enum import Enum
 
 class RunProgress(Enum):
     TODO = 1
-    DONE = 2
\ No newline at end of file
+    DONE = 2
+    SKIPPED = 3  # not needed anymore, e.g. by adaptive repetitions
+    TIMEOUT = 4  # killed after exceeding one of the `phase_timeouts_in_ms`
+    RUNNING = 5  # started, but its result was not recorded yet, e.g. when the runner itself was killed
+    FAILED = 6  # one of its hooks raised an exception, or its worker process crashed
@@ -0,0 +1,21 @@
+from typing import Dict, List
+
+from ConfigValidator.CustomErrors.BaseError import BaseError
+
+
+class RunTableIndex:
+    """A `__run_id`-keyed index over a run table, for constant-time lookups of a row.
+    The index does not copy the rows; it has to be rebuilt when rows are added, removed or re-ordered."""
+
+    def __init__(self, run_table: List[Dict]):
+        self.__run_table = run_table
+        self.__positions = {row['__run_id']: position for position, row in enumerate(run_table)}
+
+        if len(self.__positions) != len(run_table):
+            raise BaseError("Duplicate __run_id detected in the run table!")
+
+    def __contains__(self, run_id: str) -> bool:
+        return run_id in self.__positions
+
+    def row(self, run_id: str) -> Dict:
+        return self.__run_table[self.__positions[run_id]]
@@ -3,6 +3,7 @@ import traceback
 import dill as pickle
 import hashlib
 import ast
+import argparse
 from typing import List
 from importlib import util
 import multiprocessing
@@ -13,6 +14,8 @@ from ConfigValidator.CLIRegister.CLIRegister import CLIRegister
 from ConfigValidator.Config.Validation.ConfigValidator import ConfigValidator
 from ConfigValidator.CustomErrors.ConfigErrors import ConfigInvalidClassNameError
 from ExperimentOrchestrator.Experiment.ExperimentController import ExperimentController
+from ExperimentOrchestrator.Experiment.Coordination import CoordinatorClient
+from ConfigValidator.Config.Models.Shard import Shard
 
 def is_no_argument_given(args: List[str]): return (len(args) == 1)
 def is_config_file_given(args: List[str]): return (args[1][-3:] == '.py')
@@ -24,6 +27,18 @@ def load_and_get_config_file_as_module(args: List[str]):
     spec.loader.exec_module(config_file)
     return config_file
 
+def parse_run_options(args: List[str]) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(prog='python experiment-runner/ <path_to_config.py>')
+    distribution = parser.add_mutually_exclusive_group()
+    distribution.add_argument('--coordinator', metavar='ADDRESS',
+                              help="hand out the runs to workers connecting to tcp://host:port or unix:///path")
+    distribution.add_argument('--worker', metavar='ADDRESS',
+                              help="execute the runs handed out by the coordinator at tcp://host:port or unix:///path")
+    distribution.add_argument('--shard', metavar='INDEX/COUNT', type=Shard.parse,
+                              help="only execute shard INDEX (1-based) of COUNT disjoint parts of the run table, "
+                                   "combine the shards afterwards with the merge command")
+    return parser.parse_args(args[2:])
+
 def calc_ast_md5sum(src, name):
     tree = compile(src, name, 'exec', flags=ast.PyCF_ONLY_AST, optimize=0)
 
@@ -57,6 +72,7 @@ if __name__ == "__main__":
         elif is_config_file_given(sys.argv):                                # If the first argument ends with .py -> a config file is entered
             multiprocessing.set_start_method('fork')                        # Set "fork" as the default method for spawning new processes 
                                                                             # (in this way the new processes will have a shared context when running)                   
+            options = parse_run_options(sys.argv)
             config_file = load_and_get_config_file_as_module(sys.argv)
 
             if hasattr(config_file, 'RunnerConfig'):
@@ -66,7 +82,14 @@ if __name__ == "__main__":
                 )
 
                 ConfigValidator.validate_config(config)                     # Validate config as a valid RunnerConfig
-                ExperimentController(config, metadata).do_experiment()      # Instantiate controller with config and start experiment
+                if options.coordinator:                                     # Distributed: only own the run table, workers do the runs
+                    ExperimentController(config, metadata).coordinate(options.coordinator)
+                elif options.worker:                                        # Distributed: do the runs handed out by the coordinator
+                    coordinator = CoordinatorClient(options.worker, metadata.md5sum)
+                    ExperimentController(config, metadata, coordinator).do_experiment()
+                    coordinator.close()
+                else:
+                    ExperimentController(config, metadata, shard=options.shard).do_experiment()  # Instantiate controller with config and start experiment
             else:
                 raise ConfigInvalidClassNameError
         else:                                                               # Else, a utility command is entered
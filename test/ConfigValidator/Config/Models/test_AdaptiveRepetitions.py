@@ -0,0 +1,43 @@
+import unittest
+
+from ConfigValidator.Config.Models.AdaptiveRepetitions import AdaptiveRepetitions
+from ConfigValidator.Config.Models.FactorModel import FactorModel
+from ConfigValidator.Config.Models.RunTableModel import RunTableModel
+from ConfigValidator.CustomErrors.BaseError import BaseError
+
+
+class TestAdaptiveRepetitions(unittest.TestCase):
+
+    def test_t_critical_value(self):
+        # Two-sided critical values from a t-table
+        for confidence, df, expected in [(0.95, 1, 12.706), (0.95, 2, 4.303), (0.95, 9, 2.262),
+                                         (0.99, 5, 4.032), (0.90, 30, 1.697)]:
+            self.assertAlmostEqual(AdaptiveRepetitions.t_critical_value(confidence, df), expected, places=3)
+
+    def test_is_satisfied(self):
+        adaptive_repetitions = AdaptiveRepetitions('energy', relative_ci_half_width=0.05, min_repetitions=3)
+        self.assertFalse(adaptive_repetitions.is_satisfied([10.0, 10.0]))            # too few repetitions
+        self.assertTrue(adaptive_repetitions.is_satisfied([10.0, 10.1, 10.2]))
+        self.assertFalse(adaptive_repetitions.is_satisfied([1.0, 20.0, 1.0, 20.0]))
+        self.assertTrue(adaptive_repetitions.is_satisfied([0.0, 0.0, 0.0]))
+
+    def test_invalid(self):
+        with self.assertRaises(BaseError):
+            AdaptiveRepetitions('energy', min_repetitions=1)
+        with self.assertRaises(BaseError):
+            AdaptiveRepetitions('energy', confidence=1)
+
+        factor = FactorModel('example_factor1', ['a', 'b'])
+        with self.assertRaises(BaseError):  # fewer repetitions than the minimum
+            RunTableModel(factors=[factor], repetitions=2, data_columns=['energy'],
+                          adaptive_repetitions=AdaptiveRepetitions('energy'))
+
+    def test_run_table_column(self):
+        run_table_model = RunTableModel(factors=[FactorModel('example_factor1', ['a', 'b'])], repetitions=5,
+                                        data_columns=['energy'], adaptive_repetitions=AdaptiveRepetitions('energy'))
+        self.assertEqual(run_table_model.get_column_names(), ['__run_id', '__done', '__repetitions', 'example_factor1', 'energy'])
+        self.assertEqual(len(run_table_model.generate_experiment_run_table()), 10)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,75 @@
+import unittest
+
+import shutil
+import tempfile
+import threading
+from pathlib import Path
+
+from ConfigValidator.Config.Models.CooldownPolicy import CooldownPolicy
+
+
+class TestCooldownPolicy(unittest.TestCase):
+
+    def setUp(self) -> None:
+        self.sysfs_root = Path(tempfile.mkdtemp())
+        self.zone = self.sysfs_root / 'class' / 'thermal' / 'thermal_zone0'
+        self.zone.mkdir(parents=True)
+        self.package = self.sysfs_root / 'class' / 'powercap' / 'intel-rapl:0'
+        self.package.mkdir(parents=True)
+        (self.package / 'max_energy_range_uj').write_text('1000000000\n')
+        dram = self.sysfs_root / 'class' / 'powercap' / 'intel-rapl:0:0'  # not a package, ignored
+        dram.mkdir()
+        (dram / 'max_energy_range_uj').write_text('1000000000\n')
+        (dram / 'energy_uj').write_text('0\n')
+
+        self.set_temperature(40.0)
+        self.set_energy(999_000_000)
+
+        # The load of the machine running the tests is not under control, so it is never the limiting reading
+        self.policy = CooldownPolicy(load_tolerance=100, max_wait_in_ms=2000, poll_interval_in_ms=100,
+                                     baseline_duration_in_ms=100, sysfs_root=self.sysfs_root)
+
+    def tearDown(self) -> None:
+        shutil.rmtree(self.sysfs_root)
+
+    def set_temperature(self, celsius: float):
+        (self.zone / 'temp').write_text(f'{int(celsius * 1000)}\n')
+
+    def set_energy(self, energy_uj: int):
+        (self.package / 'energy_uj').write_text(f'{energy_uj}\n')
+
+    def test_measure(self):
+        threading.Timer(0.1, self.set_energy, [1_000_000]).start()  # wraps around during the measurement
+        readings = self.policy.measure(300)
+
+        self.assertEqual(readings['temperature'], 40.0)
+        self.assertAlmostEqual(readings['power'], 2 / 0.3, delta=0.5)
+        self.assertIn('load', readings)
+
+    def test_waits_until_cooled_down(self):
+        self.policy.take_baseline()
+        self.set_temperature(70.0)
+        threading.Timer(0.5, self.set_temperature, [41.0]).start()
+
+        waited = self.policy.cool_down()
+        self.assertGreaterEqual(waited, 0.5)
+        self.assertLess(waited, 1.5)
+
+    def test_max_wait(self):
+        self.policy.take_baseline()
+        self.set_temperature(70.0)
+
+        waited = self.policy.cool_down()
+        self.assertGreaterEqual(waited, 2.0)
+        self.assertLess(waited, 2.5)
+
+    def test_missing_readings_are_ignored(self):
+        policy = CooldownPolicy(load_tolerance=100, min_wait_in_ms=200, poll_interval_in_ms=100,
+                                baseline_duration_in_ms=100, sysfs_root=self.sysfs_root / 'nothing')
+        policy.take_baseline()
+        self.assertEqual(set(policy.baseline.keys()), {'load'})
+        self.assertLess(policy.cool_down(), 1.0)
+
+
+if __name__ == '__main__':
+    unittest.main()
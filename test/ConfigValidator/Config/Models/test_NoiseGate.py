@@ -0,0 +1,89 @@
+import unittest
+
+import os
+import shutil
+import tempfile
+import threading
+from pathlib import Path
+
+from ConfigValidator.Config.Models.NoiseGate import NoiseGate
+from ConfigValidator.Config.Models.NoiseGateAction import NoiseGateAction
+
+
+class TestNoiseGate(unittest.TestCase):
+    RUNNER_PID = 200
+
+    def setUp(self) -> None:
+        self.root = Path(tempfile.mkdtemp())
+        self.proc_root = self.root / 'proc'
+        self.sysfs_root = self.root / 'sys'
+        self.clock_ticks = os.sysconf('SC_CLK_TCK')
+
+        self.set_process(1, 'init', 0, 0)
+        self.set_process(100, 'cron job (x)', 1, 0)
+        self.set_process(self.RUNNER_PID, 'python', 1, 0)
+        self.set_process(201, 'target', self.RUNNER_PID, 0)
+        self.set_vmstat(0)
+        cpu = self.sysfs_root / 'devices' / 'system' / 'cpu' / 'cpu0'
+        (cpu / 'cpufreq').mkdir(parents=True)
+        (cpu / 'thermal_throttle').mkdir()
+        self.set_governor('performance')
+        self.set_throttle_count(0)
+
+    def tearDown(self) -> None:
+        shutil.rmtree(self.root)
+
+    def set_process(self, pid: int, name: str, ppid: int, cpu_ticks: int):
+        (self.proc_root / str(pid)).mkdir(parents=True, exist_ok=True)
+        (self.proc_root / str(pid) / 'stat').write_text(
+            f'{pid} ({name}) S {ppid} {pid} {pid} 0 -1 4194304 80 0 0 0 {cpu_ticks} 0 0 0 20 0 1 0 243339\n')
+
+    def set_vmstat(self, pswpout: int):
+        (self.proc_root / 'vmstat').write_text(f'nr_free_pages 1000\npswpin 0\npswpout {pswpout}\n')
+
+    def set_governor(self, governor: str):
+        (self.sysfs_root / 'devices/system/cpu/cpu0/cpufreq/scaling_governor').write_text(f'{governor}\n')
+
+    def set_throttle_count(self, count: int):
+        (self.sysfs_root / 'devices/system/cpu/cpu0/thermal_throttle/core_throttle_count').write_text(f'{count}\n')
+
+    def gate(self, **kwargs) -> NoiseGate:
+        return NoiseGate(sample_duration_in_ms=200, retry_interval_in_ms=100,
+                         proc_root=self.proc_root, sysfs_root=self.sysfs_root, **kwargs)
+
+    def test_quiet(self):
+        self.assertEqual(self.gate().check(self.RUNNER_PID), [])
+
+    def test_noisy(self):
+        def interfere():
+            self.set_process(100, 'cron job (x)', 1, self.clock_ticks)        # a full CPU during the whole window
+            self.set_process(201, 'target', self.RUNNER_PID, self.clock_ticks)  # the runner's own, ignored
+            self.set_vmstat(5)
+            self.set_throttle_count(1)
+        threading.Timer(0.05, interfere).start()
+        self.set_governor('powersave')
+
+        reasons = self.gate().check(self.RUNNER_PID)
+        self.assertEqual(len(reasons), 4)
+        self.assertTrue(reasons[0].startswith('cron job (x) (100) at '))
+        self.assertEqual(reasons[1:], ['CPU frequency governor powersave', 'swapping',
+                                       'thermal throttling (cpu0 core_throttle_count)'])
+
+    def test_checks_can_be_disabled(self):
+        self.set_governor('powersave')
+        threading.Timer(0.05, self.set_vmstat, [5]).start()
+        self.assertEqual(self.gate(governor=None, check_swap=False).check(self.RUNNER_PID), [])
+
+    def test_retry(self):
+        self.set_governor('powersave')
+        self.assertEqual(self.gate(action=NoiseGateAction.RETRY, max_retries=2).wait_until_quiet(),
+                         ['CPU frequency governor powersave'])
+
+    def test_block(self):
+        self.set_governor('powersave')
+        threading.Timer(0.5, self.set_governor, ['performance']).start()
+        self.assertEqual(self.gate(action=NoiseGateAction.BLOCK).wait_until_quiet(), [])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,31 @@
+import unittest
+
+from ConfigValidator.Config.Models.RetryPolicy import RetryPolicy
+from ConfigValidator.CustomErrors.BaseError import BaseError
+from ProgressManager.RunTable.Models.RunProgress import RunProgress
+
+
+class TestRetryPolicy(unittest.TestCase):
+
+    def test_should_retry(self):
+        retry_policy = RetryPolicy(max_attempts=3, retry_timeouts=False)
+        self.assertTrue(retry_policy.should_retry(RunProgress.FAILED, 1))
+        self.assertTrue(retry_policy.should_retry(RunProgress.FAILED, 2))
+        self.assertFalse(retry_policy.should_retry(RunProgress.FAILED, 3))
+        self.assertFalse(retry_policy.should_retry(RunProgress.TIMEOUT, 1))
+        self.assertFalse(retry_policy.should_retry(RunProgress.DONE, 1))
+        self.assertTrue(RetryPolicy().should_retry(RunProgress.TIMEOUT, 1))
+
+    def test_backoff(self):
+        retry_policy = RetryPolicy(max_attempts=10, backoff_in_ms=500, backoff_factor=2, max_backoff_in_ms=3000)
+        self.assertEqual([retry_policy.backoff(attempts) for attempts in range(1, 6)], [0.5, 1, 2, 3, 3])
+
+    def test_invalid(self):
+        with self.assertRaises(BaseError):
+            RetryPolicy(max_attempts=0)
+        with self.assertRaises(BaseError):
+            RetryPolicy(backoff_factor=0.5)
+
+
+if __name__ == '__main__':
+    unittest.main()
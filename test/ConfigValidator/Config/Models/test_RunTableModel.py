@@ -1,5 +1,6 @@
 import unittest
 import itertools
+import random
 
 from ConfigValidator.Config.Models.FactorModel import FactorModel
 from ConfigValidator.Config.Models.RunTableModel import RunTableModel
@@ -88,5 +89,76 @@ class TestRunTableModelExclusions(unittest.TestCase):
             ])
 
 
+class TestRunTableModelExclusionIndex(unittest.TestCase):
+    def test_matches_exhaustive_filtering(self):
+        rng = random.Random(42)
+        factors = [FactorModel(f"example_factor{i}", [j for j in range(4)]) for i in range(6)]
+        exclusions = []
+        for _ in range(20):
+            excluded_factors = rng.sample(factors, rng.randint(1, 4))
+            exclusions.append({factor: rng.sample(factor.treatments, rng.randint(1, 3)) for factor in excluded_factors})
+        runTableModel = RunTableModel(factors=factors, exclude_variations=exclusions)
+
+        expected = [combo for combo in itertools.product(*[factor.treatments for factor in factors])
+                    if not any(all(combo[factors.index(factor)] in treatments for factor, treatments in exclusion.items())
+                               for exclusion in exclusions)]
+        table = runTableModel.generate_experiment_run_table()
+        self.assertEqual([tuple(run[factor.factor_name] for factor in factors) for run in table], expected)
+        self.assertEqual(runTableModel.get_run_table_length(), len(expected))
+
+    def test_empty_exclusion_excludes_everything(self):
+        runTableModel = RunTableModel(factors=[FactorModel("example_factor1", [1, 2])], exclude_variations=[{}])
+        self.assertEqual(runTableModel.generate_experiment_run_table(), [])
+        self.assertEqual(runTableModel.get_run_table_length(), 0)
+
+    def test_unknown_factor(self):
+        with self.assertRaises(BaseError):
+            RunTableModel(
+                factors=[FactorModel("example_factor1", [1, 2])],
+                exclude_variations=[{FactorModel("example_factor2", [1, 2]): [1]}]
+            )
+
+
+class TestRunTableModelStreaming(unittest.TestCase):
+    def setUp(self):
+        factor1 = FactorModel("example_factor1", [i for i in range(6)])
+        factor2 = FactorModel("example_factor2", ['a', 'b', 'c'])
+        self.runTableModel = RunTableModel(
+            factors=[factor1, factor2],
+            exclude_variations=[
+                {factor1: [0, 1]},
+                {factor1: [3], factor2: ['b', 'c']},
+            ],
+            repetitions=3,
+            data_columns=['avg_cpu']
+        )
+
+    def test_iter_matches_generated_table(self):
+        rows = self.runTableModel.iter_experiment_run_table()
+        self.assertNotIsInstance(rows, list)
+        self.assertEqual(list(rows), self.runTableModel.generate_experiment_run_table())
+
+    def test_run_table_length(self):
+        self.assertEqual(self.runTableModel.get_run_table_length(), (6 * 3 - 2 * 3 - 2) * 3)
+        self.assertEqual(self.runTableModel.get_run_table_length(),
+                         len(self.runTableModel.generate_experiment_run_table()))
+
+    def test_stable_run_ids(self):
+        rows = list(self.runTableModel.iter_experiment_run_table())
+        self.assertEqual(rows[0]['__run_id'], 'run_0_repetition_0')
+        self.assertEqual(rows[-1]['__run_id'], 'run_9_repetition_2')
+        self.assertEqual(len(set(row['__run_id'] for row in rows)), len(rows))
+        self.assertEqual([row['__run_id'] for row in self.runTableModel.iter_experiment_run_table()],
+                         [row['__run_id'] for row in rows])
+
+    def test_lazy_generation(self):
+        factors = [FactorModel(f"example_factor{i}", [j for j in range(10)]) for i in range(8)]  # 10^8 cells
+        runTableModel = RunTableModel(factors=factors)
+        first_rows = list(itertools.islice(runTableModel.iter_experiment_run_table(), 3))
+        self.assertEqual([row['__run_id'] for row in first_rows],
+                         ['run_0_repetition_0', 'run_1_repetition_0', 'run_2_repetition_0'])
+        self.assertEqual(first_rows[2]['example_factor7'], 2)
+
+
 if __name__ == '__main__':
     unittest.main()
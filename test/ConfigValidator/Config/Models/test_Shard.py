@@ -0,0 +1,55 @@
+import unittest
+from pathlib import Path
+
+from ConfigValidator.Config.Models.FactorModel import FactorModel
+from ConfigValidator.Config.Models.RunTableModel import RunTableModel
+from ConfigValidator.Config.Models.Shard import Shard
+from ConfigValidator.CustomErrors.BaseError import BaseError
+
+
+class TestShard(unittest.TestCase):
+
+    def test_parse(self):
+        shard = Shard.parse('2/8')
+        self.assertEqual((shard.index, shard.count), (2, 8))
+        for text in ('0/8', '9/8', '2', '2/8/1'):
+            with self.assertRaises(BaseError):
+                Shard.parse(text)
+
+    def test_experiment_path(self):
+        self.assertEqual(Shard(2, 8).experiment_path(Path('/results/experiment')),
+                         Path('/results/experiment_shard_2_of_8'))
+        shard = Shard.of_experiment_path(Path('/results/my_shard_experiment_shard_2_of_8'))
+        self.assertEqual((shard.index, shard.count), (2, 8))
+        for name in ('experiment', 'experiment_shard_9_of_8', '_shard_2_of_8'):
+            with self.assertRaises(BaseError):
+                Shard.of_experiment_path(Path('/results') / name)
+
+    def test_run_ids(self):
+        run_table_model = RunTableModel(
+            factors=[FactorModel("example_factor1", ['a', 'b', 'c']), FactorModel("example_factor2", [True, False])],
+            repetitions=3,
+            shuffle=True
+        )
+        shards = [Shard(index, 4).run_ids(run_table_model) for index in range(1, 5)]
+
+        # Disjoint, complete and balanced
+        all_run_ids = {row['__run_id'] for row in run_table_model.iter_experiment_run_table()}
+        self.assertEqual(set().union(*shards), all_run_ids)
+        self.assertEqual(sum(len(shard) for shard in shards), len(all_run_ids))
+        self.assertEqual(sorted(len(shard) for shard in shards), [4, 4, 5, 5])
+
+        # Deterministic
+        self.assertEqual(Shard(3, 4).run_ids(run_table_model), shards[2])
+
+    def test_length(self):
+        run_table_model = RunTableModel(factors=[FactorModel("example_factor1", list(range(7)))], repetitions=2)
+        for index in range(1, 5):
+            shard = Shard(index, 4)
+            rows = list(shard.select(run_table_model.iter_experiment_run_table()))
+            self.assertEqual(shard.length(run_table_model), len(rows))
+            self.assertEqual({row['__run_id'] for row in rows}, shard.run_ids(run_table_model))
+
+
+if __name__ == '__main__':
+    unittest.main()
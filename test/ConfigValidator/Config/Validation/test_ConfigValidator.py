@@ -0,0 +1,57 @@
+import unittest
+import shutil
+import tempfile
+from pathlib import Path
+from unittest import mock
+
+from ConfigValidator.Config.Models.CooldownPolicy import CooldownPolicy
+from ConfigValidator.Config.RunnerConfig import RunnerConfig
+from ConfigValidator.Config.Validation.ConfigValidator import ConfigValidator
+from ConfigValidator.CustomErrors.ConfigErrors import ConfigInvalidError
+from EventManager.EventSubscriptionController import EventSubscriptionController
+
+
+class TestConfigValidator(unittest.TestCase):
+
+    def setUp(self):
+        self.tmpdir = Path(tempfile.mkdtemp())
+        self.config = RunnerConfig()
+        self.config.results_output_path = self.tmpdir
+
+    def tearDown(self):
+        shutil.rmtree(self.tmpdir)
+
+    def test_columnar_output_without_pyarrow(self):
+        self.config.columnar_output = True
+        with mock.patch('importlib.util.find_spec', return_value=None):  # pyarrow is not installed
+            with self.assertRaises(ConfigInvalidError):
+                ConfigValidator.validate_config(self.config)
+
+        # Valid again once the error is fixed
+        self.config.columnar_output = False
+        ConfigValidator.validate_config(self.config)
+
+    def test_cooldown_policy_with_parallel_runs(self):
+        self.config.cooldown_policy = CooldownPolicy()
+        self.config.max_parallel_runs = 2
+        with self.assertRaises(ConfigInvalidError):
+            ConfigValidator.validate_config(self.config)
+
+        self.config.max_parallel_runs = 1
+        ConfigValidator.validate_config(self.config)
+
+    def test_subscribes_plugins(self):
+        class OwnInitConfig(RunnerConfig):
+            def __init__(self):  # like the example configs, without calling RunnerConfig.__init__
+                self.run_table_model = None
+
+        subscribed = []
+        EventSubscriptionController.register_plugin(OwnInitConfig, subscribed.append)
+        config = OwnInitConfig()
+        config.results_output_path = self.tmpdir
+        ConfigValidator.validate_config(config)
+        self.assertEqual(subscribed, [config])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,141 @@
+import unittest
+import asyncio
+import threading
+import time
+
+from EventManager.EventSubscriptionController import EventSubscriptionController
+from EventManager.Models.RunnerEvents import RunnerEvents
+
+
+class TestEventSubscriptionController(unittest.TestCase):
+    EVENT = RunnerEvents.BEFORE_EXPERIMENT
+
+    def setUp(self):
+        self.names = []
+
+    def tearDown(self):
+        for name in self.names + [EventSubscriptionController.CONFIG]:
+            EventSubscriptionController.unsubscribe(self.EVENT, name)
+
+    def subscribe(self, callback, order: int = 0, name: str = EventSubscriptionController.CONFIG, group=None):
+        self.names.append(name)
+        EventSubscriptionController.subscribe_to_single_event(self.EVENT, callback, order=order, name=name, group=group)
+
+    def test_order(self):
+        calls = []
+        self.subscribe(lambda: calls.append('config'))
+        self.subscribe(lambda: calls.append('after'), order=1, name='after')
+        self.subscribe(lambda: calls.append('before'), order=-1, name='before')
+        self.subscribe(lambda: calls.append('also after'), order=1, name='also after')
+
+        EventSubscriptionController.raise_event(self.EVENT)
+        self.assertEqual(calls, ['before', 'config', 'after', 'also after'])
+
+    def test_replace(self):
+        self.subscribe(lambda: 'first')
+        self.subscribe(lambda: 'second')
+        self.assertEqual(EventSubscriptionController.raise_event(self.EVENT), 'second')
+        self.assertEqual(EventSubscriptionController.get_event_callback(self.EVENT)(), 'second')
+
+    def test_combine(self):
+        self.subscribe(lambda: {'a': 1, 'b': 1})
+        self.subscribe(lambda: None, order=1, name='nothing')
+        self.subscribe(lambda: {'b': 2}, order=2, name='more')
+        self.assertEqual(EventSubscriptionController.raise_event(self.EVENT), {'a': 1, 'b': 2})
+
+    def test_group(self):
+        started = []
+
+        def profiler():
+            started.append(time.monotonic())
+            time.sleep(0.1)
+            return threading.current_thread() is not threading.main_thread()
+
+        for i in range(3):
+            self.subscribe(profiler, order=-1, name=f'profiler{i}', group='profilers')
+        start = time.monotonic()
+        self.assertTrue(EventSubscriptionController.raise_event(self.EVENT))
+
+        self.assertLess(time.monotonic() - start, 0.25)  # not one after another
+        self.assertLess(max(started) - min(started), 0.05)
+
+    def test_group_error(self):
+        def failing():
+            raise ValueError('failed to start')
+
+        self.subscribe(failing, name='failing', group='profilers')
+        self.subscribe(lambda: time.sleep(0.01), name='profiler', group='profilers')
+        with self.assertRaises(ValueError):
+            EventSubscriptionController.raise_event(self.EVENT)
+
+    def test_async(self):
+        async def hook():
+            await asyncio.sleep(0.01)
+            return {'a': 1}
+
+        self.subscribe(hook)
+        self.subscribe(lambda: {'b': 2}, order=1, name='sync')
+        self.assertTrue(EventSubscriptionController.is_async(self.EVENT))
+        self.assertEqual(EventSubscriptionController.raise_event(self.EVENT), {'a': 1, 'b': 2})  # on a loop of its own
+        self.assertEqual(asyncio.run(EventSubscriptionController.raise_event_async(self.EVENT)), {'a': 1, 'b': 2})
+
+    def test_async_group(self):
+        started = []
+
+        async def profiler():
+            started.append(time.monotonic())
+            await asyncio.sleep(0.1)
+            return {'async': True}
+
+        def sync_profiler():
+            started.append(time.monotonic())
+            time.sleep(0.1)
+            return {'sync': True}
+
+        self.subscribe(profiler, name='profiler0', group='profilers')
+        self.subscribe(sync_profiler, name='profiler1', group='profilers')
+        self.subscribe(profiler, name='profiler2', group='profilers')
+        start = time.monotonic()
+        self.assertEqual(asyncio.run(EventSubscriptionController.raise_event_async(self.EVENT)), {'async': True, 'sync': True})
+
+        self.assertLess(time.monotonic() - start, 0.25)
+        self.assertLess(max(started) - min(started), 0.05)
+
+    def test_async_group_error(self):
+        started = []
+
+        async def profiler():
+            started.append('async')
+
+        def failing():
+            raise ValueError('failed to start')
+
+        self.subscribe(profiler, name='profiler', group='profilers')
+        self.subscribe(failing, name='failing', group='profilers')
+        with self.assertRaises(ValueError):
+            asyncio.run(EventSubscriptionController.raise_event_async(self.EVENT))
+        self.assertEqual(started, [])  # behind the same barrier as the sync subscriber that failed
+
+    def test_plugins(self):
+        class Config:
+            pass
+
+        class DerivedConfig(Config):
+            pass
+
+        def plugin(name: str):
+            def subscribe(config):
+                self.subscribe(lambda: calls.append((name, type(config).__name__)), order=len(self.names), name=name)
+            return subscribe
+
+        calls = []
+        EventSubscriptionController.register_plugin(DerivedConfig, plugin('derived'))
+        EventSubscriptionController.register_plugin(Config, plugin('base'))
+        EventSubscriptionController.subscribe_plugins(DerivedConfig())
+
+        EventSubscriptionController.raise_event(self.EVENT)
+        self.assertEqual(calls, [('base', 'DerivedConfig'), ('derived', 'DerivedConfig')])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,53 @@
+import unittest
+import csv
+import os
+import shutil
+import tempfile
+import time
+from pathlib import Path
+
+from ConfigValidator.Config.Models.RunnerContext import RunnerContext
+from EventManager.EventSubscriptionController import EventSubscriptionController
+from EventManager.EventTimingRecorder import EventTimingRecorder
+from EventManager.Models.RunnerEvents import RunnerEvents
+
+
+class TestEventTimingRecorder(unittest.TestCase):
+    def setUp(self):
+        self.tmpdir = Path(tempfile.mkdtemp())
+        EventTimingRecorder.open(self.tmpdir)
+
+    def tearDown(self):
+        shutil.rmtree(self.tmpdir)
+
+    def read_timings(self):
+        with open(self.tmpdir / EventTimingRecorder.FILE_NAME, newline='') as csvfile:
+            return list(csv.DictReader(csvfile))
+
+    def test_raise_event_is_timed(self):
+        EventSubscriptionController.subscribe_to_single_event(RunnerEvents.INTERACT, lambda context: time.sleep(0.02))
+        context = RunnerContext({'__run_id': 'run_0_repetition_0'}, 1, self.tmpdir)
+        EventSubscriptionController.raise_event(RunnerEvents.INTERACT, context)
+        self.assertEqual(self.read_timings(), [])  # buffered until flushed
+
+        EventTimingRecorder.flush()
+        timing, = self.read_timings()
+        self.assertEqual(timing['event'], 'INTERACT')
+        self.assertEqual(timing['__run_id'], 'run_0_repetition_0')
+        self.assertEqual(int(timing['pid']), os.getpid())
+        self.assertGreaterEqual(int(timing['duration_ns']), 20_000_000)
+
+    def test_summary(self):
+        for duration_in_ms in range(1, 101):
+            EventTimingRecorder.record(RunnerEvents.START_RUN, 'run_0_repetition_0', 0, duration_in_ms * 1_000_000)
+        EventTimingRecorder.record(RunnerEvents.STOP_RUN, 'run_0_repetition_0', 0, 5_000_000)
+        EventTimingRecorder.flush()
+
+        self.assertEqual(EventTimingRecorder.summary(self.tmpdir / EventTimingRecorder.FILE_NAME), [
+            {'event': 'START_RUN', 'count': 100, 'p50_ms': 50.0, 'p95_ms': 95.0, 'max_ms': 100.0},
+            {'event': 'STOP_RUN', 'count': 1, 'p50_ms': 5.0, 'p95_ms': 5.0, 'max_ms': 5.0},
+        ])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,64 @@
+import unittest
+import shutil
+import tempfile
+from pathlib import Path
+
+from ConfigValidator.CustomErrors.BaseError import BaseError
+from ExperimentOrchestrator.Experiment.CPUSlotScheduler import CPUSlotScheduler
+
+
+class TestCPUSlotScheduler(unittest.TestCase):
+    def setUp(self):
+        # Fake sysfs tree with two NUMA nodes of 4 CPUs each
+        self.sysfs_root = Path(tempfile.mkdtemp())
+        for node, cpulist in [(0, '0-3'), (1, '4,5-7')]:
+            node_dir = self.sysfs_root / 'devices' / 'system' / 'node' / f'node{node}'
+            node_dir.mkdir(parents=True)
+            (node_dir / 'cpulist').write_text(cpulist + '\n')
+        self.cpus = set(range(8))
+
+    def tearDown(self):
+        shutil.rmtree(self.sysfs_root)
+
+    def scheduler(self, nr_slots, cpus_per_slot=None, cpus=None):
+        return CPUSlotScheduler(nr_slots, cpus_per_slot, self.cpus if cpus is None else cpus, self.sysfs_root)
+
+    def test_parse_cpu_list(self):
+        self.assertEqual(CPUSlotScheduler.parse_cpu_list('0-2,5,7-8\n'), {0, 1, 2, 5, 7, 8})
+
+    def test_read_numa_nodes(self):
+        self.assertEqual(CPUSlotScheduler.read_numa_nodes(self.sysfs_root), [{0, 1, 2, 3}, {4, 5, 6, 7}])
+
+    def test_even_split(self):
+        self.assertEqual(self.scheduler(4).slots, [{0, 1}, {2, 3}, {4, 5}, {6, 7}])
+
+    def test_slots_stay_within_node(self):
+        self.assertEqual(self.scheduler(2, cpus_per_slot=3).slots, [{0, 1, 2}, {4, 5, 6}])
+        self.assertEqual(self.scheduler(3).slots, [{0, 1}, {2, 3}, {4, 5}])
+
+    def test_pack_onto_one_node(self):
+        self.assertEqual(self.scheduler(2, cpus_per_slot=2).slots, [{0, 1}, {2, 3}])
+
+    def test_straddle_nodes_when_needed(self):
+        self.assertEqual(self.scheduler(1, cpus_per_slot=6).slots, [{0, 1, 2, 3, 4, 5}])
+
+    def test_only_usable_cpus(self):
+        self.assertEqual(self.scheduler(2, cpus={1, 2, 5, 6}).slots, [{1, 2}, {5, 6}])
+
+    def test_too_many_slots(self):
+        with self.assertRaises(BaseError):
+            self.scheduler(9)
+        with self.assertRaises(BaseError):
+            self.scheduler(3, cpus_per_slot=3)
+
+    def test_acquire_release(self):
+        scheduler = self.scheduler(3)
+        self.assertEqual(scheduler.acquire(), (0, {0, 1}))
+        self.assertEqual(scheduler.acquire(), (1, {2, 3}))
+        scheduler.release(0)
+        self.assertEqual(scheduler.acquire(), (0, {0, 1}))
+        self.assertEqual(scheduler.acquire(), (2, {4, 5}))
+
+
+if __name__ == '__main__':
+    unittest.main()
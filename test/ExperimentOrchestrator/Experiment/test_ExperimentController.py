@@ -0,0 +1,660 @@
+import os
+import csv
+import json
+import asyncio
+import unittest
+from unittest import mock
+import multiprocessing
+import shutil
+import tempfile
+import subprocess
+import threading
+import time
+from pathlib import Path
+from typing import Dict, Optional
+
+import psutil
+
+from ConfigValidator.Config.Models.AdaptiveRepetitions import AdaptiveRepetitions
+from ConfigValidator.Config.Models.FactorModel import FactorModel
+from ConfigValidator.Config.Models.MeasurementOutput import MeasurementOutput
+from ConfigValidator.Config.Models.Metadata import Metadata
+from ConfigValidator.Config.Models.NoiseGate import NoiseGate
+from ConfigValidator.Config.Models.RetryPolicy import RetryPolicy
+from ConfigValidator.Config.Models.RunTableModel import RunTableModel
+from ConfigValidator.Config.Models.Shard import Shard
+from ConfigValidator.Config.Models.RunnerContext import RunnerContext
+from ConfigValidator.Config.Models.RunTableStore import RunTableStore
+from ConfigValidator.Config.RunnerConfig import RunnerConfig
+from ConfigValidator.Config.Validation.ConfigValidator import ConfigValidator
+from ConfigValidator.CustomErrors.BaseError import BaseError
+from EventManager.EventTimingRecorder import EventTimingRecorder
+from EventManager.Models.RunnerEvents import RunnerEvents
+from ExperimentOrchestrator.Experiment.Coordination import CoordinatorClient, parse_address
+from ExperimentOrchestrator.Experiment.ExperimentController import ExperimentController
+from ExperimentOrchestrator.Experiment.Run.RunController import RunController
+from ExperimentOrchestrator.Experiment.RunnerOverhead import RunnerOverhead
+from ExtendedTyping.Typing import SupportsStr
+from Plugins.Profilers import Profiler
+from ProgressManager.Output.CSVOutputManager import CSVOutputManager
+from ProgressManager.Output.OutputProcedure import OutputProcedure
+from ProgressManager.Output.ShardMerger import ShardMerger
+from ProgressManager.Output.SQLiteOutputManager import SQLiteOutputManager
+from ProgressManager.RunTable.Models.RunProgress import RunProgress
+
+# Timing tests that depend on the machine they run on are opt-in
+BENCHMARKS_ENV_VAR = 'EXPERIMENT_RUNNER_BENCHMARKS'
+
+
+class ExperimentControllerTestCase(unittest.TestCase):
+    """Each test gets a results folder of its own, and `self.config`, a validated config of `config_cls` (if set)."""
+
+    config_cls: Optional[type] = None
+
+    def setUp(self):
+        self.tmpdir = Path(tempfile.mkdtemp())
+        if self.config_cls is not None:
+            self.config = self.make_config(self.config_cls)
+
+    def tearDown(self):
+        shutil.rmtree(self.tmpdir)
+
+    def make_config(self, config_cls: type, **options) -> RunnerConfig:
+        """A validated config of `config_cls` with the given attributes, that stores its results in the test's folder."""
+        config = config_cls()
+        config.results_output_path = self.tmpdir
+        for name, value in options.items():
+            setattr(config, name, value)
+        ConfigValidator.validate_config(config)
+        return config
+
+
+class TestExperimentControllerParallel(ExperimentControllerTestCase):
+
+    class ParallelConfig(RunnerConfig):
+        time_between_runs_in_ms: int = 0
+        max_parallel_runs:       int = 3
+
+        def create_run_table_model(self) -> RunTableModel:
+            self.run_table_model = RunTableModel(
+                factors=[FactorModel("example_factor1", [i for i in range(6)])],
+                data_columns=['start', 'end']
+            )
+            return self.run_table_model
+
+        def start_run(self, context: RunnerContext) -> None:
+            self.start = time.time()
+
+        def interact(self, context: RunnerContext) -> None:
+            time.sleep(0.2)
+
+        def populate_run_data(self, context: RunnerContext) -> Optional[Dict[str, SupportsStr]]:
+            return {'start': self.start, 'end': time.time()}
+
+    config_cls = ParallelConfig
+
+    def test_parallel_runs(self):
+        ExperimentController(self.config, Metadata(b'')).do_experiment()
+
+        run_table = CSVOutputManager(self.config.experiment_path).read_run_table()
+        self.assertEqual(len(run_table), 6)
+        for row in run_table:
+            self.assertEqual(row['__done'], RunProgress.DONE)
+            self.assertTrue((self.config.experiment_path / row['__run_id']).is_dir())
+
+        # At least two runs were in flight at the same time
+        intervals = sorted((float(row['start']), float(row['end'])) for row in run_table)
+        self.assertTrue(any(nxt[0] < cur[1] for cur, nxt in zip(intervals, intervals[1:])))
+
+    def test_time_between_runs(self):
+        self.config.time_between_runs_in_ms = 300
+        ExperimentController(self.config, Metadata(b'')).do_experiment()
+
+        # The slot of a finished run waits before it is reused, the runs in the other slots still run at the same time
+        intervals = sorted((float(row['start']), float(row['end']))
+                           for row in CSVOutputManager(self.config.experiment_path).read_run_table())
+        first_end = min(end for _, end in intervals[:3])
+        for start, _ in intervals[3:]:
+            self.assertGreaterEqual(start - first_end, 0.3)
+        self.assertLess(intervals[4][0], intervals[3][1])
+
+    def test_event_timings(self):
+        ExperimentController(self.config, Metadata(b'')).do_experiment()
+
+        with open(self.config.experiment_path / EventTimingRecorder.FILE_NAME, newline='') as csvfile:
+            timings = list(csv.DictReader(csvfile))
+        run_ids = {row['__run_id'] for row in CSVOutputManager(self.config.experiment_path).read_run_table()}
+        for run_id in run_ids:
+            run_timings = {timing['event']: timing for timing in timings if timing['__run_id'] == run_id}
+            self.assertEqual(set(run_timings.keys()), {'BEFORE_RUN', 'START_RUN', 'START_MEASUREMENT', 'INTERACT',
+                                                       'STOP_MEASUREMENT', 'STOP_RUN', 'POPULATE_RUN_DATA'})
+            self.assertEqual(int(run_timings['BEFORE_RUN']['pid']), os.getpid())
+            self.assertNotEqual(int(run_timings['INTERACT']['pid']), os.getpid())  # in the run's own process
+            self.assertGreaterEqual(int(run_timings['INTERACT']['duration_ns']), 200_000_000)
+        self.assertEqual([timing['event'] for timing in timings if timing['__run_id'] == ''],
+                         ['BEFORE_EXPERIMENT', 'AFTER_EXPERIMENT'])
+
+
+class TestExperimentControllerResume(ExperimentControllerTestCase):
+
+    class ShuffledConfig(RunnerConfig):
+        time_between_runs_in_ms: int = 0
+
+        def create_run_table_model(self) -> RunTableModel:
+            self.run_table_model = RunTableModel(
+                factors=[FactorModel("example_factor1", [i for i in range(10)])],
+                data_columns=['avg_cpu'],
+                shuffle=True
+            )
+            return self.run_table_model
+
+        def populate_run_data(self, context: RunnerContext) -> Optional[Dict[str, SupportsStr]]:
+            return {'avg_cpu': context.run_nr}
+
+    def run_experiment(self, run_table_store: RunTableStore):
+        config = self.make_config(self.__class__.ShuffledConfig, run_table_store=run_table_store)
+        ExperimentController(config, Metadata(b'')).do_experiment()
+        return config.experiment_path
+
+    def resume(self, run_table_store: RunTableStore, data_manager_cls, dropped_columns=()):
+        data_manager = data_manager_cls(self.run_experiment(run_table_store))
+        run_table = data_manager.read_run_table()
+
+        # Simulate a crash that left two runs unfinished
+        for row in run_table[3:5]:
+            row['__done'] = RunProgress.TODO
+            row['avg_cpu'] = 0
+        for row in run_table:  # e.g. a run table stored by an older version
+            for column in dropped_columns:
+                del row[column]
+        data_manager.write_run_table(run_table)
+
+        self.run_experiment(run_table_store)
+        resumed_run_table = data_manager.read_run_table()
+        self.assertEqual([row['__run_id'] for row in resumed_run_table], [row['__run_id'] for row in run_table])
+        for position, row in enumerate(resumed_run_table):
+            self.assertEqual(row['__done'], RunProgress.DONE)
+            self.assertEqual(row['avg_cpu'], position + 1)
+        return resumed_run_table
+
+    def test_resume_keeps_order(self):
+        self.resume(RunTableStore.CSV, CSVOutputManager)
+
+    def test_resume_sqlite(self):
+        run_table = self.resume(RunTableStore.SQLITE, SQLiteOutputManager)
+        exported = CSVOutputManager(self.tmpdir / RunnerConfig.name).read_run_table()
+        self.assertEqual(exported, run_table)
+
+    def test_resume_without_controller_columns(self):
+        for run_table_store, data_manager_cls in ((RunTableStore.CSV, CSVOutputManager),
+                                                  (RunTableStore.SQLITE, SQLiteOutputManager)):
+            with self.subTest(run_table_store=run_table_store):
+                run_table = self.resume(run_table_store, data_manager_cls, dropped_columns=['__attempts', '__error'])
+                self.assertEqual([int(row['__attempts']) for row in run_table], [0] * 3 + [1] * 2 + [0] * 5)
+                shutil.rmtree(self.tmpdir / RunnerConfig.name)
+
+
+class EnergyProfiler(Profiler.Profiler):
+    data_columns = ['energy']
+
+    def collect(self, context):
+        return {'energy': 10.0}
+
+
+class TestExperimentControllerAdaptiveRepetitions(ExperimentControllerTestCase):
+    MAX_REPETITIONS = 8
+
+    class AdaptiveConfig(RunnerConfig):
+        time_between_runs_in_ms: int = 0
+
+        def create_run_table_model(self) -> RunTableModel:
+            self.run_table_model = RunTableModel(
+                factors=[FactorModel("workload", ['stable', 'noisy'])],
+                repetitions=TestExperimentControllerAdaptiveRepetitions.MAX_REPETITIONS,
+                data_columns=['energy'],
+                adaptive_repetitions=AdaptiveRepetitions('energy', relative_ci_half_width=0.05, min_repetitions=3)
+            )
+            return self.run_table_model
+
+        def populate_run_data(self, context: RunnerContext) -> Optional[Dict[str, SupportsStr]]:
+            repetition = int(context.run_variation['__run_id'].rsplit('_', 1)[1])
+            if context.run_variation['workload'] == 'stable':
+                return {'energy': 10 + 0.01 * repetition}
+            return {'energy': 1 if repetition % 2 else 20}
+
+    config_cls = AdaptiveConfig
+
+    def test_stops_when_confident(self):
+        with mock.patch.object(CSVOutputManager, 'update_row_data', autospec=True,
+                               side_effect=CSVOutputManager.update_row_data) as update_row_data:
+            ExperimentController(self.config, Metadata(b'')).do_experiment()
+        repetitions_written = [updated_row['__run_id'] for (_, updated_row), _ in update_row_data.call_args_list
+                               if updated_row.keys() == {'__run_id', '__repetitions'}]
+        self.assertEqual(len(repetitions_written), 2 * self.MAX_REPETITIONS)  # once per row
+        self.assertEqual(len(set(repetitions_written)), 2 * self.MAX_REPETITIONS)
+
+        run_table = CSVOutputManager(self.config.experiment_path).read_run_table()
+        self.assertEqual(len(run_table), 2 * self.MAX_REPETITIONS)
+
+        stable = [row for row in run_table if row['workload'] == 'stable']
+        self.assertEqual([row['__done'] for row in stable],
+                         [RunProgress.DONE] * 3 + [RunProgress.SKIPPED] * (self.MAX_REPETITIONS - 3))
+        self.assertTrue(all(row['__repetitions'] == 3 for row in stable))
+
+        noisy = [row for row in run_table if row['workload'] == 'noisy']
+        self.assertTrue(all(row['__done'] == RunProgress.DONE for row in noisy))
+        self.assertTrue(all(row['__repetitions'] == self.MAX_REPETITIONS for row in noisy))
+
+        # Nothing left to do on a restart
+        with self.assertRaises(BaseError):
+            ExperimentController(self.config, Metadata(b''))
+
+    def test_target_metric_not_a_data_column(self):
+        class NoTargetConfig(RunnerConfig):
+            def create_run_table_model(self) -> RunTableModel:
+                self.run_table_model = RunTableModel(factors=[FactorModel("workload", ['stable'])], repetitions=3,
+                                                     adaptive_repetitions=AdaptiveRepetitions('energy'))
+                return self.run_table_model
+
+        config = self.make_config(NoTargetConfig)
+        with self.assertRaises(BaseError):
+            ExperimentController(config, Metadata(b''))
+
+    def test_profiler_target_metric(self):
+        @Profiler.profilers(EnergyProfiler())
+        class ProfiledConfig(RunnerConfig):
+            time_between_runs_in_ms: int = 0
+
+            def create_run_table_model(self) -> RunTableModel:
+                self.run_table_model = RunTableModel(
+                    factors=[FactorModel("workload", ['stable'])],
+                    repetitions=TestExperimentControllerAdaptiveRepetitions.MAX_REPETITIONS,
+                    data_columns=['energy'],  # also added by the profiler
+                    adaptive_repetitions=AdaptiveRepetitions('energy', relative_ci_half_width=0.05, min_repetitions=3)
+                )
+                return self.run_table_model
+
+        config = self.make_config(ProfiledConfig, name='profiled')
+        ExperimentController(config, Metadata(b'')).do_experiment()
+        self.assertEqual(config.run_table_model.get_data_columns(), ['energy'])
+
+        run_table = CSVOutputManager(config.experiment_path).read_run_table()
+        self.assertEqual([row['__done'] for row in run_table],
+                         [RunProgress.DONE] * 3 + [RunProgress.SKIPPED] * (self.MAX_REPETITIONS - 3))
+        self.assertEqual([float(row['energy']) for row in run_table[:3]], [10.0] * 3)
+
+
+class TestExperimentControllerNoiseGate(ExperimentControllerTestCase):
+
+    class GatedConfig(RunnerConfig):
+        time_between_runs_in_ms: int = 0
+
+        def create_run_table_model(self) -> RunTableModel:
+            self.run_table_model = RunTableModel(factors=[FactorModel("example_factor1", [1, 2])])
+            return self.run_table_model
+
+    def setUp(self):
+        super().setUp()
+        governor = self.tmpdir / 'sys' / 'devices' / 'system' / 'cpu' / 'cpu0' / 'cpufreq' / 'scaling_governor'
+        governor.parent.mkdir(parents=True)
+        governor.write_text('powersave\n')
+
+        self.config = self.make_config(self.__class__.GatedConfig, noise_gate=NoiseGate(
+            sample_duration_in_ms=10, proc_root=self.tmpdir / 'proc', sysfs_root=self.tmpdir / 'sys'))
+
+    def test_marks_suspect_runs(self):
+        ExperimentController(self.config, Metadata(b'')).do_experiment()
+
+        run_table = CSVOutputManager(self.config.experiment_path).read_run_table()
+        self.assertEqual([row['__done'] for row in run_table], [RunProgress.DONE] * 2)
+        self.assertEqual([row[NoiseGate.SUSPECT_COLUMN] for row in run_table], ['CPU frequency governor powersave'] * 2)
+
+
+class TestExperimentControllerPhaseTimeouts(ExperimentControllerTestCase):
+
+    class HangingConfig(RunnerConfig):
+        time_between_runs_in_ms: int = 0
+        phase_timeouts_in_ms = {RunnerEvents.INTERACT: 500}
+
+        def create_run_table_model(self) -> RunTableModel:
+            self.run_table_model = RunTableModel(factors=[FactorModel("example_factor1", [1, 2, 3])])
+            return self.run_table_model
+
+        def interact(self, context: RunnerContext) -> None:
+            if context.run_variation['example_factor1'] == 2:  # a target that deadlocked
+                target = subprocess.Popen(['sleep', '60'])
+                (context.run_dir / 'target.pid').write_text(str(target.pid))
+                target.wait()
+
+    config_cls = HangingConfig
+
+    def test_kills_hanging_run(self):
+        start = time.monotonic()
+        ExperimentController(self.config, Metadata(b'')).do_experiment()
+        self.assertLess(time.monotonic() - start, 10)
+
+        run_table = CSVOutputManager(self.config.experiment_path).read_run_table()
+        self.assertEqual([row['__done'] for row in run_table], [RunProgress.DONE, RunProgress.TIMEOUT, RunProgress.DONE])
+
+        # The process started by the run was killed along with it
+        target_pid = int((self.config.experiment_path / run_table[1]['__run_id'] / 'target.pid').read_text())
+        try:
+            self.assertEqual(psutil.Process(target_pid).status(), psutil.STATUS_ZOMBIE)
+        except psutil.NoSuchProcess:
+            pass
+
+
+class TestExperimentControllerRetryPolicy(ExperimentControllerTestCase):
+
+    class FlakyConfig(RunnerConfig):
+        time_between_runs_in_ms: int = 0
+        retry_policy = RetryPolicy(max_attempts=3, backoff_in_ms=50)
+
+        def create_run_table_model(self) -> RunTableModel:
+            self.run_table_model = RunTableModel(factors=[FactorModel("outcome", ['ok', 'flaky', 'broken', 'crash'])])
+            return self.run_table_model
+
+        def interact(self, context: RunnerContext) -> None:
+            outcome = context.run_variation['outcome']
+            first_attempt = context.run_dir / 'first_attempt'
+            if outcome == 'flaky' and not first_attempt.exists():
+                first_attempt.touch()
+                raise RuntimeError("transient failure")
+            if outcome == 'broken':
+                raise RuntimeError("permanent failure")
+            if outcome == 'crash':
+                os._exit(3)
+
+    config_cls = FlakyConfig
+
+    def test_retries_failed_runs(self):
+        ExperimentController(self.config, Metadata(b'')).do_experiment()
+
+        run_table = CSVOutputManager(self.config.experiment_path).read_run_table()
+        self.assertEqual([row['__done'] for row in run_table],
+                         [RunProgress.DONE, RunProgress.DONE, RunProgress.FAILED, RunProgress.FAILED])
+        self.assertEqual([int(row['__attempts']) for row in run_table], [1, 2, 3, 3])
+        self.assertEqual([row['__error'] for row in run_table],
+                         ['', '', 'RuntimeError: permanent failure', 'Worker process exited with code 3'])
+
+    def test_resume_retries_failed_runs(self):
+        self.config.retry_policy = RetryPolicy(max_attempts=1)
+        ExperimentController(self.config, Metadata(b'')).do_experiment()
+        with self.assertRaises(BaseError):  # no attempts left
+            ExperimentController(self.config, Metadata(b''))
+
+        # Resumed with more attempts, the failed runs get the ones they have left
+        self.config.retry_policy = RetryPolicy(max_attempts=3, backoff_in_ms=50)
+        ExperimentController(self.config, Metadata(b'')).do_experiment()
+
+        run_table = CSVOutputManager(self.config.experiment_path).read_run_table()
+        self.assertEqual([row['__done'] for row in run_table],
+                         [RunProgress.DONE, RunProgress.DONE, RunProgress.FAILED, RunProgress.FAILED])
+        self.assertEqual([int(row['__attempts']) for row in run_table], [1, 2, 3, 3])
+
+
+class TestExperimentControllerDistributed(ExperimentControllerTestCase):
+
+    class DistributedConfig(RunnerConfig):
+        time_between_runs_in_ms: int = 0
+
+        def create_run_table_model(self) -> RunTableModel:
+            self.run_table_model = RunTableModel(
+                factors=[FactorModel("example_factor1", [i for i in range(6)])],
+                data_columns=['worker']
+            )
+            return self.run_table_model
+
+        def interact(self, context: RunnerContext) -> None:
+            time.sleep(0.1)
+
+        def populate_run_data(self, context: RunnerContext) -> Optional[Dict[str, SupportsStr]]:
+            return {'worker': os.getppid()}  # the worker that forked this run
+
+    config_cls = DistributedConfig
+
+    @staticmethod
+    def work(config: RunnerConfig, metadata: Metadata, address: str, connect=None):
+        if connect is not None:
+            connect.wait()
+        coordinator = CoordinatorClient(address, metadata.md5sum)
+        ExperimentController(config, metadata, coordinator).do_experiment()
+        coordinator.close()
+
+    def test_parse_address(self):
+        self.assertEqual(parse_address('tcp://lab1:7000'), (('lab1', 7000), 'AF_INET'))
+        self.assertEqual(parse_address('unix:///tmp/experiment.sock'), ('/tmp/experiment.sock', 'AF_UNIX'))
+        with self.assertRaises(BaseError):
+            parse_address('lab1:7000')
+
+    def test_workers(self):
+        address = f"unix://{self.tmpdir / 'coordinator.sock'}"
+        metadata = Metadata(b'0123456789abcdef')
+        coordinator = threading.Thread(target=ExperimentController(self.config, metadata).coordinate, args=[address])
+        coordinator.start()
+        while not (self.tmpdir / 'coordinator.sock').exists():
+            time.sleep(0.01)
+
+        workers = [multiprocessing.Process(target=self.work, args=[self.config, metadata, address]) for _ in range(2)]
+        for worker in workers:
+            worker.start()
+        for worker in workers:
+            worker.join(30)
+            self.assertEqual(worker.exitcode, 0)
+        coordinator.join(30)
+        self.assertFalse(coordinator.is_alive())
+
+        run_table = CSVOutputManager(self.config.experiment_path).read_run_table()
+        self.assertEqual([row['__done'] for row in run_table], [RunProgress.DONE] * 6)
+        self.assertTrue({int(row['worker']) for row in run_table} <= {worker.pid for worker in workers})
+
+    def test_last_busy_worker_lost(self):
+        address = f"unix://{self.tmpdir / 'coordinator.sock'}"
+        metadata = Metadata(b'0123456789abcdef')
+        coordinator = threading.Thread(target=ExperimentController(self.config, metadata).coordinate, args=[address])
+        coordinator.start()
+        while not (self.tmpdir / 'coordinator.sock').exists():
+            time.sleep(0.01)
+
+        # A worker that takes the first run, and is lost once the other worker did all others and is idle.
+        # The other worker is forked first, so it does not inherit (and keep open) the connection of the lost one.
+        connect = multiprocessing.Event()
+        worker = multiprocessing.Process(target=self.work, args=[self.config, metadata, address, connect])
+        worker.start()
+        lost_worker = CoordinatorClient(address, metadata.md5sum)
+        lost_run_id = lost_worker.next_run()['__run_id']
+        connect.set()
+        data_manager = CSVOutputManager(self.config.experiment_path)
+        while [row['__done'] for row in data_manager.read_run_table()].count(RunProgress.DONE) < 5:
+            time.sleep(0.05)
+        time.sleep(0.2)  # for the worker to ask for the next run
+        self.assertTrue(worker.is_alive())
+        lost_worker.close()
+
+        worker.join(30)
+        self.assertEqual(worker.exitcode, 0)
+        coordinator.join(30)
+        self.assertFalse(coordinator.is_alive())
+
+        run_table = data_manager.read_run_table()
+        self.assertEqual([row['__done'] for row in run_table], [RunProgress.DONE] * 6)
+        self.assertEqual({int(row['worker']) for row in run_table}, {worker.pid})
+        self.assertEqual(run_table[0]['__run_id'], lost_run_id)
+
+
+class TestExperimentControllerShards(ExperimentControllerTestCase):
+
+    class ShardedConfig(RunnerConfig):
+        time_between_runs_in_ms: int = 0
+
+        def create_run_table_model(self) -> RunTableModel:
+            self.run_table_model = RunTableModel(
+                factors=[FactorModel("example_factor1", [i for i in range(5)])],
+                data_columns=['avg_cpu'],
+                shuffle=True
+            )
+            return self.run_table_model
+
+        def populate_run_data(self, context: RunnerContext) -> Optional[Dict[str, SupportsStr]]:
+            return {'avg_cpu': context.run_variation['example_factor1']}
+
+    def test_shards(self):
+        shard_paths = []
+        for index in (1, 2):
+            config = self.make_config(self.__class__.ShardedConfig)  # a separate invocation per shard
+            ExperimentController(config, Metadata(b'md5sum'), shard=Shard(index, 2)).do_experiment()
+            shard_paths.append(config.experiment_path)
+
+        self.assertEqual([path.name for path in shard_paths],
+                         ['new_runner_experiment_shard_1_of_2', 'new_runner_experiment_shard_2_of_2'])
+        self.assertEqual([len(CSVOutputManager(path).read_run_table()) for path in shard_paths], [3, 2])
+
+        run_table = ShardMerger(self.tmpdir / 'merged').merge(shard_paths)
+        self.assertEqual([row['avg_cpu'] for row in run_table], [0, 1, 2, 3, 4])
+        self.assertTrue(all(row['__done'] == RunProgress.DONE for row in run_table))
+
+
+class TestExperimentControllerQuietMeasurement(ExperimentControllerTestCase):
+
+    class QuietConfig(RunnerConfig):
+        time_between_runs_in_ms: int = 0
+        measurement_output:      MeasurementOutput = MeasurementOutput.DROP
+
+        def create_run_table_model(self) -> RunTableModel:
+            self.run_table_model = RunTableModel(factors=[FactorModel("example_factor1", [1, 2])])
+            return self.run_table_model
+
+        def interact(self, context: RunnerContext) -> None:
+            OutputProcedure.console_log_OK(f"Interacting with {context.run_variation['example_factor1']}")
+
+    config_cls = QuietConfig
+
+    def test_run_log(self):
+        ExperimentController(self.config, Metadata(b'')).do_experiment()
+
+        for row in CSVOutputManager(self.config.experiment_path).read_run_table():
+            with open(self.config.experiment_path / row['__run_id'] / OutputProcedure.RUN_LOG_FILE_NAME) as log_file:
+                records = [json.loads(line) for line in log_file]
+            self.assertIn({'level': 'OK', 'message': f"Interacting with {row['example_factor1']}"},
+                          [{'level': record['level'], 'message': record['message']} for record in records])
+            self.assertTrue(all(record['pid'] != os.getpid() for record in records))  # logged by the run's own process
+
+
+class TestExperimentControllerRunnerOverhead(ExperimentControllerTestCase):
+
+    class MeasuredConfig(RunnerConfig):
+        time_between_runs_in_ms: int = 0
+        measure_runner_overhead: bool = True
+
+        def create_run_table_model(self) -> RunTableModel:
+            self.run_table_model = RunTableModel(factors=[FactorModel("example_factor1", [1, 2])])
+            return self.run_table_model
+
+    config_cls = MeasuredConfig
+
+    def test_overhead_table(self):
+        ExperimentController(self.config, Metadata(b'')).do_experiment()
+
+        with open(self.config.experiment_path / RunnerOverhead.FILE_NAME, newline='') as csvfile:
+            rows = list(csv.DictReader(csvfile))
+        for row in CSVOutputManager(self.config.experiment_path).read_run_table():
+            phases = [(overhead['process'], overhead['phase']) for overhead in rows if overhead['__run_id'] == row['__run_id']]
+            self.assertEqual(sorted(phases), sorted(
+                [('controller', 'BEFORE_RUN'), ('controller', 'FINISH_RUN')] +
+                [('run', phase.name) for phase in RunController.PHASES]))
+
+        # Waiting for the active runs is stored once, not for each of them
+        self.assertTrue(all((overhead['process'], overhead['phase']) == ('controller', RunnerOverhead.ACTIVE_RUNS)
+                            for overhead in rows if overhead['__run_id'] == ''))
+        self.assertTrue(any(overhead['__run_id'] == '' for overhead in rows))
+
+
+class TestExperimentControllerAsyncHooks(ExperimentControllerTestCase):
+    NR_OF_REQUESTS = 500
+
+    class AsyncConfig(RunnerConfig):
+        time_between_runs_in_ms: int = 0
+
+        def create_run_table_model(self) -> RunTableModel:
+            self.run_table_model = RunTableModel(
+                factors=[FactorModel("example_factor1", [1, 2])],
+                data_columns=['nr_responses', 'duration']
+            )
+            return self.run_table_model
+
+        async def start_run(self, context: RunnerContext) -> None:
+            async def echo(reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+                writer.write(await reader.readline())
+                await writer.drain()
+                writer.close()
+
+            self.server = await asyncio.start_unix_server(echo, path=str(context.run_dir / 'target.sock'))
+
+        async def interact(self, context: RunnerContext) -> None:
+            async def request(i: int) -> bool:
+                reader, writer = await asyncio.open_unix_connection(str(context.run_dir / 'target.sock'))
+                writer.write(f'{i}\n'.encode())
+                response = await reader.readline()
+                writer.close()
+                return response == f'{i}\n'.encode()
+
+            start = time.monotonic()
+            # Bursts of concurrent requests, within the limits of the listen backlog
+            self.responses = []
+            for burst in range(0, TestExperimentControllerAsyncHooks.NR_OF_REQUESTS, 100):
+                self.responses += await asyncio.gather(*(request(i) for i in range(burst, burst + 100)))
+            self.duration = time.monotonic() - start
+
+        async def stop_run(self, context: RunnerContext) -> None:
+            self.server.close()  # started on the same loop, in start_run
+            await self.server.wait_closed()
+
+        def populate_run_data(self, context: RunnerContext) -> Optional[Dict[str, SupportsStr]]:
+            return {'nr_responses': sum(self.responses), 'duration': self.duration}
+
+    config_cls = AsyncConfig
+
+    def test_async_hooks(self):
+        ExperimentController(self.config, Metadata(b'')).do_experiment()
+
+        run_table = CSVOutputManager(self.config.experiment_path).read_run_table()
+        self.assertEqual([row['__done'] for row in run_table], [RunProgress.DONE] * 2)
+        self.assertEqual([int(row['nr_responses']) for row in run_table], [self.NR_OF_REQUESTS] * 2)
+
+
+class TestExperimentControllerOverhead(ExperimentControllerTestCase):
+    RUN_OVERHEAD_BUDGET_IN_MS = 25
+    NR_OF_RUNS = 50
+
+    class NoOpConfig(RunnerConfig):
+        time_between_runs_in_ms: int = 0
+
+        def create_run_table_model(self) -> RunTableModel:
+            self.run_table_model = RunTableModel(
+                factors=[FactorModel("example_factor1", [i for i in range(TestExperimentControllerOverhead.NR_OF_RUNS)])]
+            )
+            return self.run_table_model
+
+    config_cls = NoOpConfig
+
+    def test_one_fork_and_two_writes_per_run(self):
+        with mock.patch('os.fork', wraps=os.fork) as fork, \
+                mock.patch.object(CSVOutputManager, 'update_row_data', autospec=True,
+                                  side_effect=CSVOutputManager.update_row_data) as update_row_data:
+            ExperimentController(self.config, Metadata(b'')).do_experiment()
+
+        self.assertEqual(fork.call_count, self.NR_OF_RUNS)
+        self.assertEqual(update_row_data.call_count, 2 * self.NR_OF_RUNS)  # RUNNING, and the result
+
+    @unittest.skipUnless(os.environ.get(BENCHMARKS_ENV_VAR), f"benchmark, set {BENCHMARKS_ENV_VAR}=1 to run it")
+    def test_run_overhead_budget(self):
+        controller = ExperimentController(self.config, Metadata(b''))
+        start = time.perf_counter()
+        controller.do_experiment()
+        per_run_in_ms = (time.perf_counter() - start) * 1000 / self.NR_OF_RUNS
+
+        self.assertLess(per_run_in_ms, self.RUN_OVERHEAD_BUDGET_IN_MS)
+
+
+if __name__ == '__main__':
+    unittest.main()
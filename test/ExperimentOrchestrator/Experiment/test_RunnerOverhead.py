@@ -0,0 +1,74 @@
+import csv
+import shutil
+import tempfile
+import threading
+import time
+import unittest
+from pathlib import Path
+
+from ExperimentOrchestrator.Experiment.RunnerOverhead import RunnerOverhead
+
+
+class TestRunnerOverhead(unittest.TestCase):
+    def setUp(self):
+        self.tmpdir = Path(tempfile.mkdtemp())
+        self.sysfs_root = self.tmpdir / 'sys'
+        self.package = self.sysfs_root / 'class' / 'powercap' / 'intel-rapl:0'
+        self.package.mkdir(parents=True)
+        (self.package / 'max_energy_range_uj').write_text('1000000\n')
+        self.set_energy(900000)
+        RunnerOverhead.create_table(self.tmpdir)
+
+    def tearDown(self):
+        shutil.rmtree(self.tmpdir)
+
+    def set_energy(self, energy_uj: int):
+        (self.package / 'energy_uj').write_text(f'{energy_uj}\n')
+
+    @staticmethod
+    def spin(duration: float):
+        end = time.thread_time() + duration
+        while time.thread_time() < end:
+            pass
+
+    def read_table(self):
+        with open(self.tmpdir / RunnerOverhead.FILE_NAME, newline='') as csvfile:
+            return list(csv.DictReader(csvfile))
+
+    def test_phases(self):
+        overhead = RunnerOverhead(self.tmpdir, 'run_0_repetition_0', RunnerOverhead.RUN, sysfs_root=self.sysfs_root)
+        overhead.enter('INTERACT')
+        self.spin(0.05)
+        overhead.enter('STOP_MEASUREMENT')
+        profiler = threading.Thread(target=self.spin, args=(0.05,))
+        profiler.start()
+        profiler.join()
+        self.set_energy(100000)  # wrapped around, 200000 uJ later
+        overhead.flush()
+
+        interact, stop_measurement = self.read_table()
+        self.assertEqual((interact['__run_id'], interact['process'], interact['phase']),
+                         ('run_0_repetition_0', 'run', 'INTERACT'))
+        self.assertGreaterEqual(float(interact['cpu_ms']), 50)
+        self.assertLess(float(interact['profiler_cpu_ms']), 10)
+        self.assertGreater(float(interact['rss_mb']), 0)
+        self.assertEqual(float(interact['energy_j']), 0)
+
+        self.assertEqual(stop_measurement['phase'], 'STOP_MEASUREMENT')
+        self.assertGreaterEqual(float(stop_measurement['profiler_cpu_ms']), 50)
+        self.assertGreaterEqual(float(stop_measurement['wall_ms']), 50)
+        self.assertTrue(0 < float(stop_measurement['energy_j']) <= 0.2)
+
+    def test_without_rapl(self):
+        overhead = RunnerOverhead(self.tmpdir, 'run_0_repetition_0', RunnerOverhead.CONTROLLER, sysfs_root=self.tmpdir / 'none')
+        overhead.enter('BEFORE_RUN')
+        overhead.flush()
+        overhead.flush()  # nothing left to write
+
+        rows = self.read_table()
+        self.assertEqual(len(rows), 1)
+        self.assertEqual(rows[0]['energy_j'], '')
+
+
+if __name__ == '__main__':
+    unittest.main()
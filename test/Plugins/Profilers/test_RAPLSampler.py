@@ -0,0 +1,132 @@
+import unittest
+
+import shutil
+import tempfile
+import time
+from pathlib import Path
+
+from ConfigValidator.Config.Models.RunnerContext import RunnerContext
+from ConfigValidator.Config.RunnerConfig import RunnerConfig
+from ConfigValidator.CustomErrors.BaseError import BaseError
+
+from Plugins.Profilers import RAPLSampler
+from Plugins.Profilers.SamplingEngine import SamplingEngine
+from Plugins.Profilers.RAPLSampler import DataColumns as RAPLDataCols
+
+
+def make_domain(powercap: Path, directory: str, name: str, energy_uj: int, max_energy_range_uj: int = 1_000_000_000):
+    path = powercap / directory
+    path.mkdir(parents=True)
+    (path / 'name').write_text(f'{name}\n')
+    (path / 'energy_uj').write_text(f'{energy_uj:<20}\n')
+    (path / 'max_energy_range_uj').write_text(f'{max_energy_range_uj}\n')
+    return path
+
+
+def set_energy(path: Path, energy_uj: int):
+    # Overwrite in place with a fixed width: the sampler keeps the file open and may read it concurrently
+    with open(path / 'energy_uj', 'r+') as f:
+        f.write(f'{energy_uj:<20}\n')
+
+
+class TestRAPLSampler(unittest.TestCase):
+
+    def setUp(self) -> None:
+        self.sysfs_root = Path(tempfile.mkdtemp())
+        powercap = self.sysfs_root / 'class' / 'powercap'
+        (powercap / 'intel-rapl').mkdir(parents=True)  # the control type itself, not a domain
+        self.package0 = make_domain(powercap, 'intel-rapl:0', 'package-0', 5_000_000)
+        self.dram0 = make_domain(powercap, 'intel-rapl:0:0', 'dram', 100)
+        self.package1 = make_domain(powercap, 'intel-rapl:1', 'package-1', 990_000_000)
+
+    def tearDown(self) -> None:
+        shutil.rmtree(self.sysfs_root)
+
+    def test_discover_domains(self):
+        domains = RAPLSampler.RAPLSampler.discover_domains(self.sysfs_root)
+        self.assertEqual([domain.name for domain in domains], ['package-0', 'dram', 'package-1'])
+        self.assertEqual([domain.kind for domain in domains], ['package', 'dram', 'package'])
+
+    def test_no_domains(self):
+        with self.assertRaises(BaseError):
+            RAPLSampler.RAPLSampler(sysfs_root=self.sysfs_root / 'nothing').start(None)
+
+    def test_wraparound(self):
+        sampler = RAPLSampler.RAPLSampler(sysfs_root=self.sysfs_root)
+        engine = SamplingEngine([sampler], frequency=1)  # 1 Hz, so the test drives all samples itself
+        engine.start()
+
+        set_energy(self.package0, 6_000_000)
+        set_energy(self.dram0, 500_100)
+        set_energy(self.package1, 999_000_000)
+        engine.tick()
+
+        set_energy(self.package1, 1_000_000)  # wrapped at max_energy_range_uj
+        engine.tick()
+
+        engine.stop()
+
+        energy = sampler.energy()
+        self.assertAlmostEqual(energy['package'], 1 + 11)
+        self.assertAlmostEqual(energy['dram'], 0.5)
+        self.assertEqual(len(sampler.timestamps), 4)
+
+    def test_samples_in_background(self):
+        sampler = RAPLSampler.RAPLSampler(sysfs_root=self.sysfs_root)
+        engine = SamplingEngine([sampler], frequency=1000)
+        engine.start()
+        time.sleep(0.2)
+        engine.stop()
+
+        self.assertGreater(len(sampler.timestamps), 20)
+        self.assertEqual(sampler.energy(), {'package': 0, 'dram': 0})
+
+        samples_file = self.sysfs_root / 'rapl.csv'
+        sampler.write_samples(samples_file)
+        lines = samples_file.read_text().splitlines()
+        self.assertEqual(lines[0], 'timestamp,package-0,dram,package-1')
+        self.assertEqual(len(lines), len(sampler.timestamps))
+
+
+class TestRAPLSamplerCombined(unittest.TestCase):
+    sysfs_root = Path(tempfile.mkdtemp())
+    package0 = make_domain(sysfs_root / 'class' / 'powercap', 'intel-rapl:0', 'package-0', 0)
+
+    @RAPLSampler.rapl_sampler(
+        data_columns=[RAPLDataCols.PACKAGE_ENERGY, RAPLDataCols.PACKAGE_POWER, RAPLDataCols.DRAM_ENERGY],
+        frequency=1000,
+        sysfs_root=sysfs_root
+    )
+    class RAPLSamplerConfig(RunnerConfig):
+        def interact(self, context: RunnerContext):
+            set_energy(TestRAPLSamplerCombined.package0, 2_000_000)
+
+        def populate_run_data(self, context: RunnerContext):
+            return {'avg_cpu': 52.3}
+
+    def setUp(self) -> None:
+        self.runner_config = self.__class__.RAPLSamplerConfig()
+        self.run_table = self.runner_config.create_run_table_model().generate_experiment_run_table()
+        self.run_dir = Path(tempfile.mkdtemp())
+
+    def tearDown(self) -> None:
+        shutil.rmtree(self.run_dir)
+        shutil.rmtree(self.__class__.sysfs_root)
+
+    def test_config(self):
+        context = RunnerContext(self.run_table[0], 1, self.run_dir)
+        self.runner_config.start_measurement(context)
+        self.runner_config.interact(context)
+        self.runner_config.stop_measurement(context)
+        run_data = self.runner_config.populate_run_data(context)
+
+        self.assertEqual(run_data[RAPLDataCols.PACKAGE_ENERGY.name], 2.0)
+        self.assertGreater(run_data[RAPLDataCols.PACKAGE_POWER.name], 0)
+        self.assertNotIn(RAPLDataCols.DRAM_ENERGY.name, run_data)  # no DRAM domain on this "machine"
+        self.assertEqual(run_data['avg_cpu'], 52.3)
+        self.assertTrue((self.run_dir / 'rapl.csv').is_file())
+        self.assertIn(RAPLDataCols.PACKAGE_ENERGY.name, self.run_table[0])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,250 @@
+import unittest
+
+import shutil
+import tempfile
+import threading
+import time
+from pathlib import Path
+
+from ConfigValidator.Config.Models.RunnerContext import RunnerContext
+from ConfigValidator.Config.RunnerConfig import RunnerConfig
+from ConfigValidator.Config.Validation.ConfigValidator import ConfigValidator
+from ConfigValidator.CustomErrors.BaseError import BaseError
+from EventManager.EventSubscriptionController import EventSubscriptionController
+from EventManager.Models.RunnerEvents import RunnerEvents
+
+from Plugins.Profilers import Profiler
+from Plugins.Profilers.Profiler import BaselineCorrection, IdleBaseline, SampledProfiler
+from Plugins.Profilers.SamplingEngine import SamplingEngine
+
+
+class CounterProfiler(SampledProfiler):
+    """Counts its own reads, on `nr_channels` identical channels."""
+
+    def __init__(self, column: str, nr_channels: int = 1):
+        self.data_columns = [column]
+        self.nr_channels = nr_channels
+        self.calls = []
+        self.reads = 0
+
+    @property
+    def channels(self):
+        return [f'channel{i}' for i in range(self.nr_channels)]
+
+    def read(self):
+        self.reads += 1
+        return [self.reads] * self.nr_channels
+
+    def start(self, context):
+        self.calls.append('start')
+        self.reads = 0
+
+    def stop(self, context):
+        self.calls.append('stop')
+
+    def collect(self, context):
+        self.calls.append('collect')
+        return {self.data_columns[0]: len(self.timestamps)}
+
+
+class ConstantProfiler(Profiler.Profiler):
+    data_columns = ['constant']
+
+    def collect(self, context):
+        return {'constant': 42, 'not_a_data_column': 0}
+
+
+class TestSamplingEngine(unittest.TestCase):
+
+    def test_frequency_bounds(self):
+        for frequency in (0, 1001):
+            with self.assertRaises(BaseError):
+                SamplingEngine([], frequency)
+
+    def test_aligned_samples(self):
+        first, second = CounterProfiler('first'), CounterProfiler('second', nr_channels=3)
+        engine = SamplingEngine([first, second], frequency=1)  # 1 Hz, so the test drives all samples itself
+        engine.start()
+        for _ in range(10):
+            engine.tick()
+        engine.stop()
+
+        self.assertEqual(engine.nr_samples, 12)  # plus the samples taken at start and stop
+        self.assertIs(first.timestamps.base, second.timestamps.base)  # one shared clock
+        self.assertTrue((first.samples[:, 0] == range(1, 13)).all())
+        self.assertEqual(second.samples.shape, (12, 3))
+        self.assertEqual(first.calls, ['start', 'stop'])
+
+    def test_buffers_grow(self):
+        profiler = CounterProfiler('counter')
+        engine = SamplingEngine([profiler], frequency=1, initial_duration=2)
+        engine.start()
+        for _ in range(20):
+            engine.tick()
+        engine.stop()
+
+        self.assertTrue((profiler.samples[:, 0] == range(1, 23)).all())
+        self.assertTrue((profiler.timestamps[1:] >= profiler.timestamps[:-1]).all())
+
+    def test_single_thread(self):
+        profilers = [CounterProfiler(f'counter{i}') for i in range(3)]
+        engine = SamplingEngine(profilers, frequency=1000)
+        nr_threads = threading.active_count()
+        engine.start()
+        self.assertEqual(threading.active_count(), nr_threads + 1)
+        time.sleep(0.1)
+        engine.stop()
+        self.assertEqual(threading.active_count(), nr_threads)
+
+        self.assertGreater(engine.nr_samples, 10)
+        self.assertTrue(all(profiler.reads == engine.nr_samples for profiler in profilers))
+
+    def test_no_sampled_profilers(self):
+        engine = SamplingEngine([ConstantProfiler()])
+        nr_threads = threading.active_count()
+        engine.start()
+        self.assertEqual(threading.active_count(), nr_threads)
+        engine.stop()
+        self.assertEqual(engine.collect()['constant'], 42)
+
+
+class TestProfilersDecorator(unittest.TestCase):
+    counter = CounterProfiler('counter')
+
+    @Profiler.profilers(counter, ConstantProfiler(), frequency=1000)
+    class ProfiledConfig(RunnerConfig):
+        def interact(self, context: RunnerContext):
+            time.sleep(0.05)
+
+        def populate_run_data(self, context: RunnerContext):
+            return {'avg_cpu': 52.3}
+
+    def setUp(self) -> None:
+        self.runner_config = self.__class__.ProfiledConfig()
+        self.run_table = self.runner_config.create_run_table_model().generate_experiment_run_table()
+
+    def test_config(self):
+        self.runner_config.start_measurement(None)
+        self.runner_config.interact(None)
+        self.runner_config.stop_measurement(None)
+        run_data = self.runner_config.populate_run_data(None)
+
+        self.assertIn('counter', self.run_table[0])
+        self.assertIn('constant', self.run_table[0])
+        self.assertGreater(run_data['counter'], 5)
+        self.assertEqual(run_data['constant'], 42)
+        self.assertNotIn('not_a_data_column', run_data)
+        self.assertEqual(run_data['avg_cpu'], 52.3)
+        self.assertEqual(self.__class__.counter.calls, ['start', 'stop', 'collect'])
+
+
+class TestProfilersDecoratorStartGroup(unittest.TestCase):
+    counter = CounterProfiler('counter')
+
+    @Profiler.profilers(counter, frequency=1000, start_group='profilers')
+    class GroupedConfig(RunnerConfig):
+        def start_measurement(self, context: RunnerContext):
+            self.engine_started = self.__sampling_engine__.nr_samples > 0  # the profilers are started first
+
+        def populate_run_data(self, context: RunnerContext):
+            return {'avg_cpu': 52.3}
+
+    def setUp(self) -> None:
+        self.tmpdir = Path(tempfile.mkdtemp())
+        self.runner_config = self.__class__.GroupedConfig()
+        self.runner_config.results_output_path = self.tmpdir
+        ConfigValidator.validate_config(self.runner_config)  # subscribes the profilers
+        self.runner_config.create_run_table_model()
+        self.context = RunnerContext({'__run_id': 'run_0_repetition_0'}, 1, self.tmpdir)
+
+    def tearDown(self):
+        for event in (RunnerEvents.START_MEASUREMENT, RunnerEvents.STOP_MEASUREMENT):
+            EventSubscriptionController.unsubscribe(event, f'{self.__class__.GroupedConfig.__qualname__}.profilers')
+        shutil.rmtree(self.tmpdir)
+
+    def test_subscribed(self):
+        EventSubscriptionController.raise_event(RunnerEvents.START_MEASUREMENT, self.context)
+        time.sleep(0.05)
+        EventSubscriptionController.raise_event(RunnerEvents.STOP_MEASUREMENT, self.context)
+        run_data = EventSubscriptionController.raise_event(RunnerEvents.POPULATE_RUN_DATA, self.context)
+
+        self.assertTrue(self.runner_config.engine_started)
+        self.assertGreater(run_data['counter'], 5)
+        self.assertEqual(run_data['avg_cpu'], 52.3)
+        self.assertEqual(self.__class__.counter.calls, ['start', 'stop', 'collect'])
+
+
+class FakeEnergyMeter(SampledProfiler):
+    """A cumulative energy counter that rises at the power set with `set_power`, in W."""
+    power = 10.0
+    energy = 0.0
+    changed_at = time.monotonic()
+    lock = threading.Lock()
+    data_columns = ['energy', 'avg_power', 'peak']
+    baseline_corrections = {'energy': BaselineCorrection.CUMULATIVE, 'avg_power': BaselineCorrection.LEVEL}
+    channels = ['energy']
+
+    @staticmethod
+    def set_power(power: float):
+        with FakeEnergyMeter.lock:
+            now = time.monotonic()
+            FakeEnergyMeter.energy += (now - FakeEnergyMeter.changed_at) * FakeEnergyMeter.power
+            FakeEnergyMeter.changed_at = now
+            FakeEnergyMeter.power = power
+
+    def read(self):
+        with FakeEnergyMeter.lock:
+            return [FakeEnergyMeter.energy + (time.monotonic() - FakeEnergyMeter.changed_at) * FakeEnergyMeter.power]
+
+    def collect(self, context):
+        energy = self.samples[-1, 0] - self.samples[0, 0]
+        duration = self.timestamps[-1] - self.timestamps[0]
+        return {'energy': energy, 'avg_power': energy / duration, 'peak': FakeEnergyMeter.power}
+
+
+class TestIdleBaseline(unittest.TestCase):
+    tmpdir = Path(tempfile.mkdtemp())
+
+    @Profiler.profilers(FakeEnergyMeter(), frequency=100, idle_baseline=IdleBaseline(duration_in_ms=200, every_n_runs=2))
+    class BaselineConfig(RunnerConfig):
+        # Right after the first and the last sample, so the whole measurement is at the same power
+        def start_measurement(self, context: RunnerContext):
+            FakeEnergyMeter.set_power(30.0)
+
+        def interact(self, context: RunnerContext):
+            time.sleep(0.3)
+
+        def populate_run_data(self, context: RunnerContext):
+            FakeEnergyMeter.set_power(10.0)  # back to idle
+
+    def setUp(self) -> None:
+        self.runner_config = self.__class__.BaselineConfig()
+        self.runner_config.experiment_path = self.__class__.tmpdir
+        self.run_table = self.runner_config.create_run_table_model().generate_experiment_run_table()
+
+    def tearDown(self) -> None:
+        shutil.rmtree(self.__class__.tmpdir)
+
+    def test_corrected_columns(self):
+        self.assertEqual(self.runner_config.run_table_model.get_data_columns(),
+                         ['avg_cpu', 'avg_mem', 'energy', 'energy_corrected', 'avg_power', 'avg_power_corrected', 'peak'])
+
+        self.runner_config.before_experiment()
+        for _ in range(3):
+            self.runner_config.before_run()
+            self.runner_config.start_measurement(None)
+            self.runner_config.interact(None)
+            self.runner_config.stop_measurement(None)
+            run_data = self.runner_config.populate_run_data(None)
+
+            self.assertAlmostEqual(run_data['avg_power'], 30, delta=0.5)
+            self.assertAlmostEqual(run_data['avg_power_corrected'], 20, delta=0.5)
+            self.assertAlmostEqual(run_data['energy_corrected'], run_data['energy'] * 2 / 3, delta=0.2)
+            self.assertNotIn('peak_corrected', run_data)
+
+        # Measured before the experiment and again before the third run
+        self.assertEqual(len((self.__class__.tmpdir / IdleBaseline.FILE_NAME).read_text().splitlines()), 1 + 2)
+
+
+if __name__ == '__main__':
+    unittest.main()
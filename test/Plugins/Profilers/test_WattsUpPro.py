@@ -1,9 +1,13 @@
 import os
+import pty
+import time
 import unittest
 import shutil
 import tempfile
+from pathlib import Path
 
-from Plugins.Profilers.WattsUpPro import WattsUpPro
+from ConfigValidator.Config.Models.RunnerContext import RunnerContext
+from Plugins.Profilers.WattsUpPro import WattsUpPro, DataColumns as WUPDataCols
 
 
 class TestWattsUpPro(unittest.TestCase):
@@ -22,5 +26,72 @@ class TestWattsUpPro(unittest.TestCase):
         shutil.rmtree(tmpdir)
 
 
+class TestWattsUpProFakeDevice(unittest.TestCase):
+    """Plays the meter on the master side of a pseudo-terminal."""
+
+    def setUp(self) -> None:
+        self.master, self.slave = pty.openpty()
+        self.port = os.ttyname(self.slave)
+
+    def tearDown(self) -> None:
+        os.close(self.master)
+        os.close(self.slave)
+
+    def send(self, *lines: str):
+        os.write(self.master, ''.join(f'{line}\r\n' for line in lines).encode())
+
+    def wait_for(self, meter: WattsUpPro, nr_samples: int):
+        deadline = time.monotonic() + 5
+        while meter.nr_samples < nr_samples and time.monotonic() < deadline:
+            time.sleep(0.01)
+
+    def test_ring_buffer(self):
+        meter = WattsUpPro(self.port, 1.0, capacity=4)
+        meter.start()
+        self.assertEqual(os.read(self.master, 1024), b'#L,W,3,E,,1;')
+
+        # '#d,-,18,<W * 10>,<V * 10>,<A * 1000>,...', interleaved with other frames and a split frame
+        self.send('#d,-,18,1000,2300,435,0,0,0,0', '#h,-,3,x,y,z', 'garbage')
+        for i in range(1, 5):
+            self.send(f'#d,-,18,{1000 + i * 10},2300,435,0,0,0,0')
+        os.write(self.master, b'#d,-,18,2000,23')
+        self.wait_for(meter, 5)
+        os.write(self.master, b'00,870,0,0,0,0\r\n')
+        self.wait_for(meter, 6)
+        meter.stop()
+
+        self.assertEqual(meter.nr_samples, 6)
+        samples = meter.samples
+        self.assertEqual(samples.shape, (4, 4))                       # only the last `capacity` samples are kept
+        self.assertEqual(list(samples[:, 1]), [102.0, 103.0, 104.0, 200.0])
+        self.assertTrue((samples[1:, 0] >= samples[:-1, 0]).all())
+
+        summary = meter.summary()
+        self.assertAlmostEqual(summary['avg_power'], (100 + 101 + 102 + 103 + 104 + 200) / 6)
+        self.assertEqual(summary['max_power'], 200.0)
+        self.assertAlmostEqual(summary['avg_voltage'], 230.0)
+        self.assertGreater(meter.energy(), 0)
+
+    def test_run_lifecycle(self):
+        run_dir = Path(tempfile.mkdtemp())
+        context = RunnerContext({}, 1, run_dir)
+        meter = WattsUpPro(self.port, 1.0, data_columns=[WUPDataCols.ENERGY, WUPDataCols.MAX_POWER])
+        self.assertEqual(meter.data_columns, ['wattsuppro__energy', 'wattsuppro__max_power'])
+
+        meter.start(context)
+        self.send('#d,-,18,500,2300,435,0,0,0,0')
+        self.wait_for(meter, 1)
+        time.sleep(0.2)
+        self.send('#d,-,18,500,2300,435,0,0,0,0')
+        self.wait_for(meter, 2)
+        meter.stop(context)
+
+        run_data = meter.collect(context)
+        self.assertAlmostEqual(run_data['wattsuppro__energy'], 50 * (meter.samples[1, 0] - meter.samples[0, 0]), delta=0.001)
+        self.assertEqual(run_data['wattsuppro__max_power'], 50.0)
+        self.assertEqual(len((run_dir / 'wattsuppro.csv').read_text().splitlines()), 3)
+        shutil.rmtree(run_dir)
+
+
 if __name__ == '__main__':
     unittest.main()
@@ -4,14 +4,17 @@ import shutil
 import tempfile
 import re
 from pathlib import Path
+from types import SimpleNamespace
 from typing import AnyStr
+from unittest import mock
 
 from ConfigValidator.Config.Models.RunnerContext import RunnerContext
 from ConfigValidator.Config.RunnerConfig import RunnerConfig
 from ProgressManager.Output.OutputProcedure import OutputProcedure as output
 
 from Plugins.Profilers import CodecarbonWrapper
-from Plugins.Profilers.CodecarbonWrapper import DataColumns as CCDataCols
+from Plugins.Profilers.CodecarbonWrapper import CodecarbonProfiler, DataColumns as CCDataCols
+from Plugins.Profilers.SamplingEngine import SamplingEngine
 
 
 class TestEmissionTrackerIndividual(unittest.TestCase):
@@ -115,5 +118,67 @@ class TestEmissionTrackerCombined(unittest.TestCase):
         print(run_data)
 
 
+class FakeEmissionsTracker:
+    """Stands in for codecarbon's trackers, which measure the actual machine."""
+
+    def __init__(self, **kwargs):
+        self.kwargs = kwargs
+        self.final_emissions_data = None
+
+    def start(self):
+        pass
+
+    def stop(self):
+        self.final_emissions_data = SimpleNamespace(emissions=0.5, emissions_rate=0.1, cpu_energy=1.0, gpu_energy=0.0,
+                                                    ram_energy=0.25, energy_consumed=1.25)
+
+
+@mock.patch('codecarbon.OfflineEmissionsTracker', FakeEmissionsTracker)
+class TestCodecarbonProfiler(unittest.TestCase):
+
+    def setUp(self) -> None:
+        self.tmpdir = Path(tempfile.mkdtemp())
+        self.context = RunnerContext({'__run_id': 'run_0_repetition_0'}, 1, self.tmpdir / 'experiment' / 'run_0_repetition_0')
+
+    def tearDown(self):
+        shutil.rmtree(self.tmpdir)
+
+    def test_profiler(self):
+        profiler = CodecarbonProfiler([CCDataCols.EMISSIONS, CCDataCols.ENERGY_CONSUMED], country_iso_code="NLD")
+        self.assertEqual(profiler.data_columns, ['codecarbon__emissions', 'codecarbon__energy_consumed'])
+
+        engine = SamplingEngine([profiler])
+        engine.start(self.context)
+        engine.stop(self.context)
+        data = engine.collect(self.context)
+
+        self.assertEqual(profiler.tracker.kwargs, {'country_iso_code': "NLD", 'project_name': 'experiment',
+                                                   'output_dir': str(self.context.run_dir.resolve())})
+        self.assertEqual(data['codecarbon__emissions'], 0.5)
+        self.assertEqual(data['codecarbon__energy_consumed'], 1.25)
+
+        # Without a run, e.g. for an idle baseline, nothing is written
+        engine.start()
+        engine.stop()
+        self.assertEqual(profiler.tracker.kwargs, {'country_iso_code': "NLD", 'save_to_file': False})
+
+    def test_emission_tracker(self):
+        @CodecarbonWrapper.emission_tracker(data_columns=[CCDataCols.EMISSIONS, CCDataCols.CPU_ENERGY])
+        class EmissionsConfig(RunnerConfig):
+            pass
+
+        config = EmissionsConfig()
+        run_table = config.create_run_table_model().generate_experiment_run_table()
+        config.start_measurement(self.context)
+        config.stop_measurement(self.context)
+        run_data = config.populate_run_data(self.context)
+
+        self.assertIn('codecarbon__emissions', run_table[0])
+        self.assertEqual(run_data['codecarbon__emissions'], 0.5)
+        self.assertEqual(run_data['codecarbon__cpu_energy'], 1.0)
+        self.assertNotIn('codecarbon__ram_energy', run_data)
+
+
+
 if __name__ == '__main__':
     unittest.main()
@@ -0,0 +1,100 @@
+import unittest
+import shutil
+import tempfile
+from pathlib import Path
+
+from ConfigValidator.Config.Models.FactorModel import FactorModel
+from ConfigValidator.Config.Models.RunTableModel import RunTableModel
+from ProgressManager.Output.CSVOutputManager import CSVOutputManager
+from ProgressManager.RunTable.Models.RunProgress import RunProgress
+
+
+class TestCSVOutputManagerJournal(unittest.TestCase):
+    def setUp(self):
+        self.tmpdir = Path(tempfile.mkdtemp())
+        self.run_table = RunTableModel(
+            factors=[
+                FactorModel("example_factor1", ['example_treatment1', 'example_treatment2', 'example_treatment3']),
+                FactorModel("example_factor2", [True, False]),
+            ],
+            data_columns=['avg_cpu', 'avg_mem']
+        ).generate_experiment_run_table()
+        self.manager = CSVOutputManager(self.tmpdir, compaction_interval=4)
+        self.manager.write_run_table(self.run_table)
+
+    def tearDown(self):
+        shutil.rmtree(self.tmpdir)
+
+    def finish_run(self, manager: CSVOutputManager, idx: int):
+        row = {**self.run_table[idx], 'avg_cpu': idx, 'avg_mem': 18.1}
+        row['__done'] = RunProgress.DONE
+        manager.update_row_data(row)
+
+    def test_update_is_journaled_and_replayed(self):
+        self.finish_run(self.manager, 1)
+        self.assertTrue(self.manager.journal_path.exists())
+
+        with open(self.manager.run_table_path) as f:
+            self.assertNotIn('DONE', f.read())
+
+        # A fresh manager (e.g. on resume after a crash) sees the journaled update
+        run_table = CSVOutputManager(self.tmpdir).read_run_table()
+        self.assertEqual(run_table[1]['__done'], RunProgress.DONE)
+        self.assertEqual(run_table[1]['avg_cpu'], 1)
+        self.assertEqual(run_table[1]['avg_mem'], '18.1')
+        self.assertEqual(run_table[0]['__done'], RunProgress.TODO)
+
+    def test_compaction_interval(self):
+        for idx in range(4):
+            self.finish_run(CSVOutputManager(self.tmpdir, compaction_interval=4), idx)
+        self.assertFalse(self.manager.journal_path.exists())
+
+        with open(self.manager.run_table_path) as f:
+            self.assertEqual(f.read().count('DONE'), 4)
+
+    def test_compaction_interval_same_manager(self):
+        for idx in range(3):
+            self.finish_run(self.manager, idx)
+        self.assertTrue(self.manager.journal_path.exists())
+        self.finish_run(self.manager, 3)
+        self.assertFalse(self.manager.journal_path.exists())
+
+        # The count starts again after compaction
+        for idx in range(3):
+            self.finish_run(self.manager, idx)
+        self.assertTrue(self.manager.journal_path.exists())
+
+    def test_compact_journal(self):
+        self.finish_run(self.manager, 0)
+        self.finish_run(self.manager, 2)
+        expected = self.manager.read_run_table()
+
+        self.manager.compact_journal()
+        self.assertFalse(self.manager.journal_path.exists())
+        self.assertEqual(self.manager.read_run_table(), expected)
+
+    def test_torn_journal_record(self):
+        self.finish_run(self.manager, 0)
+        with open(self.manager.journal_path, 'a') as journal:
+            journal.write('{"__run_id": "run_1_repe')  # crash mid-append
+        self.finish_run(self.manager, 2)
+
+        run_table = self.manager.read_run_table()
+        self.assertEqual([row['__done'] for row in run_table].count(RunProgress.DONE), 2)
+        self.assertEqual(run_table[1]['__done'], RunProgress.TODO)
+
+    def test_write_run_table_discards_journal(self):
+        self.finish_run(self.manager, 0)
+        self.manager.write_run_table(self.run_table)
+        self.assertFalse(self.manager.journal_path.exists())
+        self.assertEqual(self.manager.read_run_table()[0]['__done'], RunProgress.TODO)
+
+
+    def test_write_streamed_run_table(self):
+        self.manager.write_run_table(row for row in self.run_table)
+        self.assertEqual([row['__run_id'] for row in self.manager.read_run_table()],
+                         [row['__run_id'] for row in self.run_table])
+
+
+if __name__ == '__main__':
+    unittest.main()
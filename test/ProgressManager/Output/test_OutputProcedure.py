@@ -0,0 +1,62 @@
+import io
+import json
+import shutil
+import tempfile
+import unittest
+from contextlib import redirect_stdout
+from pathlib import Path
+
+from ProgressManager.Output.OutputProcedure import OutputProcedure
+
+
+class TestOutputProcedure(unittest.TestCase):
+    def log(self, *lines: str) -> str:
+        stdout = io.StringIO()
+        with redirect_stdout(stdout):
+            for line in lines:
+                OutputProcedure.console_log_WARNING(line)
+        return stdout.getvalue()
+
+    def test_hold(self):
+        OutputProcedure.hold()
+        try:
+            self.assertEqual(self.log('first', 'second'), '')
+        finally:
+            stdout = io.StringIO()
+            with redirect_stdout(stdout):
+                OutputProcedure.release()
+        self.assertEqual(stdout.getvalue(), self.log('first', 'second'))
+        self.assertIn('second', stdout.getvalue())
+
+    def test_drop(self):
+        OutputProcedure.hold(drop=True)
+        try:
+            self.assertEqual(self.log('first', 'second'), '')
+        finally:
+            stdout = io.StringIO()
+            with redirect_stdout(stdout):
+                OutputProcedure.release()
+        self.assertNotIn('first', stdout.getvalue())
+        self.assertIn('2 lines', stdout.getvalue())
+
+    def test_run_log(self):
+        tmpdir = Path(tempfile.mkdtemp())
+        try:
+            OutputProcedure.open_run_log()
+            self.log('first')
+            OutputProcedure.hold(drop=True)
+            self.log('second')
+            OutputProcedure.release()
+            OutputProcedure.write_run_log(tmpdir)
+            self.log('third')  # no longer collected
+
+            with open(tmpdir / OutputProcedure.RUN_LOG_FILE_NAME) as log_file:
+                records = [json.loads(line) for line in log_file]
+            self.assertEqual([(record['level'], record['message']) for record in records],
+                             [('WARNING', 'first'), ('WARNING', 'second')])
+        finally:
+            shutil.rmtree(tmpdir)
+
+
+if __name__ == '__main__':
+    unittest.main()
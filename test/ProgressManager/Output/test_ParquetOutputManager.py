@@ -0,0 +1,67 @@
+import unittest
+import shutil
+import tempfile
+from pathlib import Path
+
+from ConfigValidator.Config.Models.FactorModel import FactorModel
+from ConfigValidator.Config.Models.RunTableModel import RunTableModel
+from ConfigValidator.Config.Models.RunnerContext import RunnerContext
+from ProgressManager.RunTable.Models.RunProgress import RunProgress
+
+try:
+    import pyarrow as pa
+    import pyarrow.dataset as ds
+    from ProgressManager.Output.ParquetOutputManager import ParquetOutputManager
+except ImportError:
+    pa = None
+
+
+@unittest.skipIf(pa is None, "pyarrow is not installed")
+class TestParquetOutputManager(unittest.TestCase):
+    def setUp(self):
+        self.tmpdir = Path(tempfile.mkdtemp())
+        self.run_table = RunTableModel(
+            factors=[
+                FactorModel("example_factor1", ['example_treatment1', 'example_treatment2']),
+                FactorModel("example_factor2", [True, False]),
+            ],
+            data_columns=['avg_cpu', 'count']
+        ).generate_experiment_run_table()
+        self.manager = ParquetOutputManager(self.tmpdir)
+
+    def tearDown(self):
+        shutil.rmtree(self.tmpdir)
+
+    def test_typed_run_table(self):
+        # Mix of fresh results and values as read back from run_table.csv
+        self.run_table[0].update({'__done': RunProgress.DONE, 'avg_cpu': 52.3, 'count': 3})
+        self.run_table[1].update({'__done': RunProgress.DONE, 'avg_cpu': '18.1', 'count': 4})
+        self.manager.write_run_table(self.run_table)
+
+        table = ds.dataset(str(self.manager.run_table_path)).to_table()
+        self.assertEqual(table.schema.field('avg_cpu').type, pa.float64())
+        self.assertEqual(table.schema.field('count').type, pa.int64())
+        self.assertEqual(table.schema.field('example_factor2').type, pa.bool_())
+        self.assertEqual(table.schema.field('example_factor1').type, pa.string())
+
+        rows = self.manager.read_run_table()
+        self.assertEqual([row['__done'] for row in rows], ['DONE', 'DONE', 'TODO', 'TODO'])
+        self.assertEqual([row['avg_cpu'] for row in rows], [52.3, 18.1, None, None])
+
+    def test_samples_dataset(self):
+        for idx, row in enumerate(self.run_table):
+            run_dir = self.tmpdir / row['__run_id']
+            run_dir.mkdir()
+            context = RunnerContext(row, idx + 1, run_dir)
+            self.manager.write_samples(context, {'timestamp': [0.0, 0.5, 1.0], 'power': [idx, idx + 1, idx + 2]})
+        self.manager.write_run_table(self.run_table)
+
+        dataset = self.manager.open_samples_dataset()
+        self.assertEqual(dataset.count_rows(), 3 * len(self.run_table))
+
+        table = dataset.to_table(columns=['power'], filter=ds.field('__run_id') == 'run_2_repetition_0')
+        self.assertEqual(table.column('power').to_pylist(), [2, 3, 4])
+
+
+if __name__ == '__main__':
+    unittest.main()
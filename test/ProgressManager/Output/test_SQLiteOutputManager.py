@@ -0,0 +1,101 @@
+import unittest
+import shutil
+import sqlite3
+import tempfile
+from unittest import mock
+from pathlib import Path
+
+from ConfigValidator.Config.Models.FactorModel import FactorModel
+from ConfigValidator.Config.Models.Metadata import Metadata
+from ConfigValidator.Config.Models.RunTableModel import RunTableModel
+from ConfigValidator.CustomErrors.ExperimentOutputErrors import ExperimentOutputFileDoesNotExistError
+from ProgressManager.Output.CSVOutputManager import CSVOutputManager
+from ProgressManager.Output.SQLiteOutputManager import SQLiteOutputManager
+from ProgressManager.RunTable.Models.RunProgress import RunProgress
+
+
+class TestSQLiteOutputManager(unittest.TestCase):
+    def setUp(self):
+        self.tmpdir = Path(tempfile.mkdtemp())
+        self.run_table = RunTableModel(
+            factors=[
+                FactorModel("example_factor1", ['example_treatment1', 'example_treatment2', 'example_treatment3']),
+                FactorModel("example_factor2", [True, False]),
+            ],
+            data_columns=['avg_cpu', 'avg "mem"'],
+            shuffle=True
+        ).generate_experiment_run_table()
+        self.manager = SQLiteOutputManager(self.tmpdir)
+        self.manager.write_run_table(self.run_table)
+
+    def tearDown(self):
+        shutil.rmtree(self.tmpdir)
+
+    def test_round_trip(self):
+        run_table = self.manager.read_run_table()
+        self.assertEqual([row['__run_id'] for row in run_table], [row['__run_id'] for row in self.run_table])
+        for row, generated in zip(run_table, self.run_table):
+            self.assertEqual(row['__done'], RunProgress.TODO)
+            self.assertEqual(row['example_factor1'], generated['example_factor1'])
+            self.assertEqual(row['example_factor2'], str(generated['example_factor2']))
+
+    def test_update_row_data(self):
+        row = {**self.run_table[2], 'avg_cpu': 52.3, 'avg "mem"': 18, 'unknown_column': 1}
+        row['__done'] = RunProgress.DONE
+        self.manager.update_row_data(row)
+
+        run_table = self.manager.read_run_table()
+        self.assertEqual(run_table[2]['__done'], RunProgress.DONE)
+        self.assertEqual(run_table[2]['avg_cpu'], 52.3)
+        self.assertEqual(run_table[2]['avg "mem"'], 18)
+        self.assertNotIn('unknown_column', run_table[2])
+        self.assertEqual([row['__done'] for row in run_table].count(RunProgress.DONE), 1)
+
+    def test_update_row_data_without_stored_columns(self):
+        self.manager.update_row_data({'__run_id': self.run_table[0]['__run_id'], 'unknown_column': 1})
+        self.assertEqual(self.manager.read_run_table()[0]['__done'], RunProgress.TODO)
+
+    def test_columns_are_cached(self):
+        statements = []
+        connect = sqlite3.connect
+
+        def traced_connect(*args, **kwargs):
+            connection = connect(*args, **kwargs)
+            connection.set_trace_callback(statements.append)
+            return connection
+
+        manager = SQLiteOutputManager(self.tmpdir)
+        with mock.patch('sqlite3.connect', side_effect=traced_connect):
+            for row in self.run_table[:3]:
+                manager.update_row_data({**row, 'avg_cpu': 1})
+        self.assertEqual(sum('table_info' in statement for statement in statements), 1)
+        self.assertEqual([row['avg_cpu'] for row in manager.read_run_table()[:3]], [1] * 3)
+
+    def test_read_run_table_written_by_another_manager(self):
+        SQLiteOutputManager(self.tmpdir).write_run_table({**row, 'avg_gpu': 1} for row in self.run_table)
+        self.assertEqual([row['avg_gpu'] for row in self.manager.read_run_table()], [1] * len(self.run_table))
+
+    def test_wal_and_indexes(self):
+        with sqlite3.connect(self.manager.database_path) as connection:
+            self.assertEqual(connection.execute('PRAGMA journal_mode').fetchone()[0], 'wal')
+            indexed_columns = set()
+            for index in connection.execute('PRAGMA index_list(run_table)').fetchall():
+                indexed_columns.update(info[2] for info in connection.execute(f'PRAGMA index_info("{index[1]}")'))
+            self.assertTrue({'__run_id', '__done'} <= indexed_columns)
+
+    def test_metadata(self):
+        self.manager.write_metadata(Metadata(b'\x01\x02'))
+        self.assertEqual(self.manager.read_metadata().md5sum, b'\x01\x02')
+
+    def test_export_csv(self):
+        self.manager.export_csv()
+        run_table = CSVOutputManager(self.tmpdir).read_run_table()
+        self.assertEqual(run_table, [{**row, 'example_factor2': str(row['example_factor2'])} for row in self.manager.read_run_table()])
+
+    def test_missing_database(self):
+        with self.assertRaises(ExperimentOutputFileDoesNotExistError):
+            SQLiteOutputManager(self.tmpdir / 'missing').read_run_table()
+
+
+if __name__ == '__main__':
+    unittest.main()
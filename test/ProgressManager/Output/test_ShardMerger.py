@@ -0,0 +1,88 @@
+import unittest
+import shutil
+import tempfile
+from pathlib import Path
+
+from ConfigValidator.Config.Models.FactorModel import FactorModel
+from ConfigValidator.Config.Models.Metadata import Metadata
+from ConfigValidator.Config.Models.RunTableModel import RunTableModel
+from ConfigValidator.Config.Models.Shard import Shard
+from ConfigValidator.CustomErrors.BaseError import BaseError
+from ProgressManager.Output.CSVOutputManager import CSVOutputManager
+from ProgressManager.Output.JSONOutputManager import JSONOutputManager
+from ProgressManager.Output.SQLiteOutputManager import SQLiteOutputManager
+from ProgressManager.Output.ShardMerger import ShardMerger
+from ProgressManager.RunTable.Models.RunProgress import RunProgress
+
+
+class TestShardMerger(unittest.TestCase):
+    def setUp(self):
+        self.tmpdir = Path(tempfile.mkdtemp())
+        self.run_table_model = RunTableModel(
+            factors=[FactorModel("example_factor1", ['a', 'b', 'c']), FactorModel("example_factor2", [True, False])],
+            data_columns=['avg_cpu'],
+            repetitions=2
+        )
+
+    def tearDown(self):
+        shutil.rmtree(self.tmpdir)
+
+    def write_shard(self, shard: Shard, md5sum: bytes = b'md5sum', sqlite: bool = False) -> Path:
+        shard_path = shard.experiment_path(self.tmpdir / 'experiment')
+        shard_path.mkdir()
+        run_ids = shard.run_ids(self.run_table_model)
+        run_table = [row for row in self.run_table_model.generate_experiment_run_table() if row['__run_id'] in run_ids]
+        for row in run_table:
+            row.update({'__done': RunProgress.DONE, 'avg_cpu': 12.5})
+            (shard_path / row['__run_id']).mkdir()
+            (shard_path / row['__run_id'] / 'samples.csv').write_text(row['__run_id'])
+
+        if sqlite:
+            SQLiteOutputManager(shard_path).write_run_table(run_table)
+            SQLiteOutputManager(shard_path).write_metadata(Metadata(md5sum))
+        else:
+            CSVOutputManager(shard_path).write_run_table(run_table)
+            JSONOutputManager(shard_path).write_metadata(Metadata(md5sum))
+        return shard_path
+
+    def test_merge(self):
+        shard_paths = [self.write_shard(Shard(1, 2)), self.write_shard(Shard(2, 2), sqlite=True)]
+        destination = self.tmpdir / 'experiment'
+        ShardMerger(destination).merge(shard_paths)
+
+        run_table = CSVOutputManager(destination).read_run_table()
+        self.assertEqual([row['__run_id'] for row in run_table],
+                         [row['__run_id'] for row in self.run_table_model.iter_experiment_run_table()])
+        self.assertTrue(all(row['__done'] == RunProgress.DONE for row in run_table))
+        self.assertEqual(JSONOutputManager(destination).read_metadata().md5sum, b'md5sum')
+        self.assertEqual((destination / 'run_1_repetition_1' / 'samples.csv').read_text(), 'run_1_repetition_1')
+
+    def test_md5sum_mismatch(self):
+        shard_paths = [self.write_shard(Shard(1, 2)), self.write_shard(Shard(2, 2), md5sum=b'changed')]
+        with self.assertRaises(BaseError):
+            ShardMerger(self.tmpdir / 'experiment').merge(shard_paths)
+
+    def test_overlapping_shards(self):
+        shard_path = self.write_shard(Shard(1, 2))
+        copied_path = shutil.copytree(shard_path, Shard(2, 2).experiment_path(self.tmpdir / 'experiment'))
+        with self.assertRaises(BaseError):
+            ShardMerger(self.tmpdir / 'experiment').merge([shard_path, copied_path])
+
+    def test_missing_shards(self):
+        shard_paths = [self.write_shard(Shard(2, 4))]
+        with self.assertRaisesRegex(BaseError, r'1/4, 3/4, 4/4'):
+            ShardMerger(self.tmpdir / 'experiment').merge(shard_paths)
+        self.assertFalse((self.tmpdir / 'experiment').exists())
+
+        # Of an experiment that was split differently
+        shard_paths.append(self.write_shard(Shard(1, 2)))
+        with self.assertRaises(BaseError):
+            ShardMerger(self.tmpdir / 'experiment').merge(shard_paths)
+
+    def test_not_a_shard(self):
+        with self.assertRaises(BaseError):
+            ShardMerger(self.tmpdir / 'experiment').merge([self.tmpdir])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,33 @@
+import unittest
+
+from ConfigValidator.Config.Models.FactorModel import FactorModel
+from ConfigValidator.Config.Models.RunTableModel import RunTableModel
+from ConfigValidator.CustomErrors.BaseError import BaseError
+from ProgressManager.RunTable.RunTableIndex import RunTableIndex
+
+
+class TestRunTableIndex(unittest.TestCase):
+    def setUp(self):
+        self.run_table = RunTableModel(
+            factors=[
+                FactorModel("example_factor1", ['example_treatment1', 'example_treatment2', 'example_treatment3']),
+                FactorModel("example_factor2", [True, False]),
+            ],
+            repetitions=2,
+            shuffle=True
+        ).generate_experiment_run_table()
+        self.index = RunTableIndex(self.run_table)
+
+    def test_lookup(self):
+        for row in self.run_table:
+            self.assertIn(row['__run_id'], self.index)
+            self.assertIs(self.index.row(row['__run_id']), row)
+        self.assertNotIn('run_6_repetition_0', self.index)
+
+    def test_duplicate_run_id(self):
+        with self.assertRaises(BaseError):
+            RunTableIndex(self.run_table + [dict(self.run_table[0])])
+
+
+if __name__ == '__main__':
+    unittest.main()